@@ -0,0 +1 @@
+"""Benchmark suite for the renault_api package."""
@@ -0,0 +1,71 @@
+"""Benchmark configuration."""
+
+import asyncio
+from collections.abc import Awaitable
+from collections.abc import Callable
+from collections.abc import Generator
+from typing import Any
+
+import aiohttp
+import pytest
+
+from tests.const import TEST_ACCOUNT_ID
+from tests.const import TEST_LOCALE
+from tests.const import TEST_PASSWORD
+from tests.const import TEST_USERNAME
+
+from renault_api.renault_account import RenaultAccount
+from renault_api.renault_client import RenaultClient
+from renault_api.testing.fake_server import FakeRenaultServer
+
+Runner = Callable[[Callable[[], Awaitable[Any]]], Any]
+
+
+@pytest.fixture
+def event_loop() -> Generator[asyncio.AbstractEventLoop, None, None]:
+    """Fixture for a dedicated event loop, driven by the benchmarks."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture
+def run(event_loop: asyncio.AbstractEventLoop) -> Runner:
+    """Fixture for running a coroutine function to completion."""
+
+    def _run(func: Callable[[], Awaitable[Any]]) -> Any:
+        return event_loop.run_until_complete(func())
+
+    return _run
+
+
+@pytest.fixture
+def fake_server(
+    event_loop: asyncio.AbstractEventLoop,
+) -> Generator[FakeRenaultServer, None, None]:
+    """Fixture for a local fake Gigya/Kamereon server."""
+    server = FakeRenaultServer()
+    event_loop.run_until_complete(server.start())
+    yield server
+    event_loop.run_until_complete(server.close())
+
+
+@pytest.fixture
+def account(
+    event_loop: asyncio.AbstractEventLoop, fake_server: FakeRenaultServer
+) -> Generator[RenaultAccount, None, None]:
+    """Fixture for a logged in account, connected to the fake server."""
+
+    async def _login() -> tuple[aiohttp.ClientSession, RenaultAccount]:
+        websession = aiohttp.ClientSession()
+        client = RenaultClient(
+            websession=websession,
+            locale=TEST_LOCALE,
+            locale_details=fake_server.locale_details,
+        )
+        await client.session.login(TEST_USERNAME, TEST_PASSWORD)
+        return websession, await client.get_api_account(TEST_ACCOUNT_ID)
+
+    websession, account = event_loop.run_until_complete(_login())
+    yield account
+    event_loop.run_until_complete(websession.close())
@@ -0,0 +1,83 @@
+"""Benchmark kamereon.request on large `charges` payloads."""
+
+import json
+from pathlib import Path
+from typing import cast
+
+import aiohttp
+import pytest
+from aiohttp import web
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from benchmarks.conftest import Runner
+
+from renault_api import kamereon
+from renault_api.kamereon import models
+from renault_api.kamereon import schemas
+
+FIXTURE = (
+    Path(__file__).parent.parent
+    / "tests/fixtures/kamereon/vehicle_data/charges-zoe_50.json"
+)
+
+
+def build_payload(charges: int) -> bytes:
+    """Build a charges payload with the requested number of entries."""
+    content = json.loads(FIXTURE.read_text())
+    sample = content["data"]["attributes"]["charges"]
+    content["data"]["attributes"]["charges"] = [
+        sample[index % len(sample)] for index in range(charges)
+    ]
+    return json.dumps(content).encode()
+
+
+@pytest.mark.parametrize("charges", [100, 5000])
+def test_charges_request(
+    benchmark: BenchmarkFixture, run: Runner, charges: int
+) -> None:
+    """Benchmark request and parsing of a large charges payload."""
+    payload = build_payload(charges)
+
+    async def handler(request: web.Request) -> web.Response:
+        return web.Response(body=payload, content_type="application/json")
+
+    app = web.Application()
+    app.router.add_get("/charges", handler)
+    runner = web.AppRunner(app)
+
+    async def _start() -> str:
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", 0).start()
+        return f"http://127.0.0.1:{runner.addresses[0][1]}/charges"
+
+    async def _create_websession() -> aiohttp.ClientSession:
+        return aiohttp.ClientSession()
+
+    url = run(_start)
+    websession = run(_create_websession)
+
+    async def _request() -> models.KamereonVehicleChargesData:
+        response = cast(
+            models.KamereonVehicleDataResponse,
+            await kamereon.request(
+                websession,
+                "GET",
+                url,
+                "api-key",
+                "jwt",
+                params={},
+                schema=schemas.KamereonVehicleDataResponseSchema,
+            ),
+        )
+        return cast(
+            models.KamereonVehicleChargesData,
+            response.get_attributes(schemas.KamereonVehicleChargesDataSchema),
+        )
+
+    try:
+        data = benchmark(run, _request)
+        assert len(data.raw_data["charges"]) == charges
+    finally:
+        run(websession.close)
+        run(runner.cleanup)
+    benchmark.extra_info["payload_bytes"] = len(payload)
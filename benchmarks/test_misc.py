@@ -0,0 +1,42 @@
+"""Benchmark credential lookups and import time."""
+
+import subprocess
+import sys
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from tests.fixtures import get_jwt
+
+from renault_api.credential import Credential
+from renault_api.credential import JWTCredential
+from renault_api.credential_store import CredentialStore
+from renault_api.gigya import GIGYA_JWT
+from renault_api.gigya import GIGYA_LOGIN_TOKEN
+
+
+def test_credential_store_get(benchmark: BenchmarkFixture) -> None:
+    """Benchmark credential lookup, including JWT expiry check."""
+    credential_store = CredentialStore()
+    credential_store[GIGYA_LOGIN_TOKEN] = Credential("login-token")
+    credential_store[GIGYA_JWT] = JWTCredential(get_jwt())
+
+    def _lookup() -> str | None:
+        credential_store.get_value(GIGYA_LOGIN_TOKEN)
+        return credential_store.get_value(GIGYA_JWT)
+
+    assert benchmark(_lookup)
+
+
+@pytest.mark.parametrize(
+    "module", ["renault_api.renault_client", "renault_api.cli.__main__"]
+)
+def test_import_time(benchmark: BenchmarkFixture, module: str) -> None:
+    """Benchmark module import time, in a fresh interpreter."""
+
+    def _import() -> int:
+        return subprocess.run(
+            [sys.executable, "-c", f"import {module}"], check=True
+        ).returncode
+
+    assert benchmark(_import) == 0
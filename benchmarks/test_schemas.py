@@ -0,0 +1,61 @@
+"""Benchmark schema loading of the vehicle data fixtures."""
+
+import json
+from pathlib import Path
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from renault_api.kamereon import models
+from renault_api.kamereon import schemas
+
+FIXTURE_PATH = Path(__file__).parent.parent / "tests/fixtures/kamereon/vehicle_data"
+
+# Attribute schema per endpoint, matched on the fixture name
+ATTRIBUTE_SCHEMAS = {
+    "battery-status": "KamereonVehicleBatteryStatusDataSchema",
+    "charge-history": "KamereonVehicleChargeHistoryDataSchema",
+    "charge-mode": "KamereonVehicleChargeModeDataSchema",
+    "charges": "KamereonVehicleChargesDataSchema",
+    "charging-settings": "KamereonVehicleChargingSettingsDataSchema",
+    "cockpit": "KamereonVehicleCockpitDataSchema",
+    "hvac-history": "KamereonVehicleHvacHistoryDataSchema",
+    "hvac-sessions": "KamereonVehicleHvacSessionsDataSchema",
+    "hvac-settings": "KamereonVehicleHvacSettingsDataSchema",
+    "hvac-status": "KamereonVehicleHvacStatusDataSchema",
+    "location": "KamereonVehicleLocationDataSchema",
+    "lock-status": "KamereonVehicleLockStatusDataSchema",
+    "notification-settings": "KamereonVehicleNotificationSettingsDataSchema",
+    "pressure": "KamereonVehicleTyrePressureDataSchema",
+    "res-state": "KamereonVehicleResStateDataSchema",
+}
+
+
+def _get_endpoint(filename: str) -> str | None:
+    """Get the endpoint from the fixture name, eg. `charges-zoe_50.json`."""
+    for endpoint in ATTRIBUTE_SCHEMAS:
+        if filename.startswith((f"{endpoint}.", f"{endpoint}-")):
+            return endpoint
+    return None
+
+
+@pytest.mark.parametrize(
+    "filename",
+    sorted(
+        path.name for path in FIXTURE_PATH.glob("*.json") if _get_endpoint(path.name)
+    ),
+)
+def test_schema_load(benchmark: BenchmarkFixture, filename: str) -> None:
+    """Benchmark loading a vehicle data response and its attributes."""
+    content = json.loads((FIXTURE_PATH / filename).read_bytes())
+    endpoint = _get_endpoint(filename)
+    assert endpoint
+    attribute_schema = getattr(schemas, ATTRIBUTE_SCHEMAS[endpoint])
+
+    def _load() -> models.KamereonVehicleDataAttributes | None:
+        response: models.KamereonVehicleDataResponse = (
+            schemas.KamereonVehicleDataResponseSchema.load(content)
+        )
+        return response.get_attributes(attribute_schema)
+
+    assert benchmark(_load)
@@ -0,0 +1,63 @@
+"""Benchmark RenaultVehicle requests against the fake server."""
+
+import asyncio
+from typing import Any
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from benchmarks.conftest import Runner
+from tests.const import TEST_VIN
+
+from renault_api.renault_account import RenaultAccount
+from renault_api.renault_vehicle import RenaultVehicle
+
+FLEET_SIZE = 50
+
+
+@pytest.mark.parametrize(
+    "method",
+    [
+        "get_battery_status",
+        "get_cockpit",
+        "get_hvac_status",
+        "get_charge_mode",
+    ],
+)
+def test_vehicle_get(
+    benchmark: BenchmarkFixture, run: Runner, account: RenaultAccount, method: str
+) -> None:
+    """Benchmark end-to-end latency of RenaultVehicle getters."""
+    vehicle: RenaultVehicle = run(lambda: account.get_api_vehicle(TEST_VIN))
+    # Warm up vehicle details and endpoint resolution
+    run(getattr(vehicle, method))
+
+    assert benchmark(run, getattr(vehicle, method))
+
+
+def test_fleet_throughput(
+    benchmark: BenchmarkFixture, run: Runner, account: RenaultAccount
+) -> None:
+    """Benchmark concurrent battery status requests for a fleet of vehicles."""
+
+    async def _get_vehicles() -> list[RenaultVehicle]:
+        return [
+            await account.get_api_vehicle(f"VF1AAAAA555{index:06d}")
+            for index in range(FLEET_SIZE)
+        ]
+
+    vehicles: list[RenaultVehicle] = run(_get_vehicles)
+
+    async def _fleet() -> list[Any]:
+        return await asyncio.gather(
+            *(vehicle.get_battery_status() for vehicle in vehicles)
+        )
+
+    # Warm up vehicle details and connection pool
+    run(_fleet)
+
+    assert len(benchmark(run, _fleet)) == FLEET_SIZE
+    if benchmark.stats:
+        benchmark.extra_info["requests_per_second"] = (
+            FLEET_SIZE / benchmark.stats.stats.median
+        )
@@ -125,6 +125,7 @@ def mypy(session: Session) -> None:
         "pytest-asyncio",
         "aiointercept",
         "syrupy",
+        "opentelemetry-sdk",
     )
     session.run("mypy", *args)
     if not session.posargs:
@@ -143,6 +144,7 @@ def tests(session: Session) -> None:
         "aiointercept",
         "syrupy",
         "typeguard",
+        "opentelemetry-sdk",
     )
     try:
         session.run("coverage", "run", "--parallel", "-m", "pytest", *session.posargs)
@@ -151,6 +153,27 @@ def tests(session: Session) -> None:
             session.notify("coverage", posargs=[])
 
 
+@session(python=python_versions[0])
+def benchmarks(session: Session) -> None:
+    """Run the benchmark suite, comparing with the previous saved run.
+
+    Results are saved in .benchmarks, and the session fails if the median
+    of a benchmark regresses by more than 20%.
+    """
+    session.install(".[cli]")
+    session.install(
+        "pytest",
+        "pytest-asyncio",
+        "pytest-benchmark",
+        "aiointercept",
+        "syrupy",
+    )
+    args = session.posargs or ["--benchmark-autosave"]
+    if not session.posargs and any(Path(".benchmarks").glob("*/*.json")):
+        args += ["--benchmark-compare", "--benchmark-compare-fail=median:20%"]
+    session.run("pytest", "benchmarks", *args)
+
+
 @session
 def coverage(session: Session) -> None:
     """Produce the coverage report."""
@@ -169,7 +192,13 @@ def typeguard(session: Session) -> None:
     """Runtime type checking using Typeguard."""
     session.install(".[cli]")
     session.install(
-        "pytest", "typeguard", "pygments", "pytest-asyncio", "aiointercept", "syrupy"
+        "pytest",
+        "typeguard",
+        "pygments",
+        "pytest-asyncio",
+        "aiointercept",
+        "syrupy",
+        "opentelemetry-sdk",
     )
     session.run("pytest", f"--typeguard-packages={package}", *session.posargs)
 
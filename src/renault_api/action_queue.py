@@ -0,0 +1,124 @@
+"""Per-vehicle queue for Kamereon actions."""
+
+import asyncio
+import logging
+from collections import deque
+from collections.abc import Awaitable
+from collections.abc import Callable
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+
+from .exceptions import ActionSuperseded
+from .kamereon.exceptions import ChargeModeInProgressException
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_RETRY_DELAY = 10.0
+DEFAULT_MAX_RETRIES = 3
+
+# Actions of the same kind supersede each other, as only the last one matters
+ACTION_KINDS = {
+    "actions/charge-set-mode": "charge-mode",
+    "actions/charge-set-schedule": "charge-schedule",
+    "actions/charge-start": "charge",
+    "actions/charge-stop": "charge",
+    "actions/hvac-set-schedule": "hvac-schedule",
+    "actions/hvac-start": "hvac",
+    "actions/hvac-stop": "hvac",
+    "soc-levels": "soc-levels",
+}
+
+
+@dataclass
+class _QueuedAction:
+    """Action waiting in the queue."""
+
+    kind: str | None
+    action: Callable[[], Awaitable[Any]]
+    future: asyncio.Future[Any] = field(
+        default_factory=lambda: asyncio.get_running_loop().create_future()
+    )
+
+
+class ActionQueue:
+    """Ordered queue of actions, per VIN.
+
+    Actions for the same VIN are sent one at a time, in order. An action still
+    waiting in the queue is superseded by a newer action of the same kind (eg.
+    `set_ac_start` followed by `set_ac_stop`): only the newer action is sent,
+    and the caller of the superseded action gets `ActionSuperseded`. Actions
+    rejected with `ChargeModeInProgressException` (409001) are retried after a
+    delay.
+    """
+
+    def __init__(
+        self,
+        *,
+        retry_delay: float = DEFAULT_RETRY_DELAY,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+    ) -> None:
+        """Initialise the action queue."""
+        self._retry_delay = retry_delay
+        self._max_retries = max_retries
+        self._queues: dict[str, deque[_QueuedAction]] = {}
+        self._workers: dict[str, asyncio.Task[None]] = {}
+        self.superseded = 0
+        self.retried = 0
+
+    def get_kind(self, endpoint: str) -> str | None:
+        """Get the kind of action for the endpoint, if it can be superseded."""
+        return ACTION_KINDS.get(endpoint)
+
+    async def submit(
+        self, vin: str, kind: str | None, action: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Queue the action for the vin, and wait for its response."""
+        queue = self._queues.setdefault(vin, deque())
+        queued = _QueuedAction(kind, action)
+        if kind is not None:
+            for previous in queue:
+                if previous.kind == kind:
+                    _LOGGER.debug("Superseding %s action on %s", kind, vin)
+                    queue.remove(previous)
+                    if not previous.future.done():
+                        previous.future.set_exception(ActionSuperseded(kind))
+                    self.superseded += 1
+                    break
+        queue.append(queued)
+
+        worker = self._workers.get(vin)
+        if worker is None or worker.done():
+            self._workers[vin] = asyncio.create_task(self._run(vin))
+        return await queued.future
+
+    async def _run(self, vin: str) -> None:
+        """Send the queued actions for the vin, one at a time."""
+        queue = self._queues[vin]
+        while queue:
+            queued = queue.popleft()
+            try:
+                result = await self._send(queued.action)
+            except Exception as exc:
+                if not queued.future.done():
+                    queued.future.set_exception(exc)
+            else:
+                if not queued.future.done():
+                    queued.future.set_result(result)
+        # Drop the queue of the vin until its next action
+        del self._queues[vin]
+        del self._workers[vin]
+
+    async def _send(self, action: Callable[[], Awaitable[Any]]) -> Any:
+        """Send the action, retrying while another charge mode is in progress."""
+        retries = 0
+        while True:
+            try:
+                return await action()
+            except ChargeModeInProgressException:
+                if retries >= self._max_retries:
+                    raise
+                _LOGGER.debug("Action in progress, retrying in %ss", self._retry_delay)
+                retries += 1
+                self.retried += 1
+                await asyncio.sleep(self._retry_delay)
@@ -0,0 +1,141 @@
+"""Circuit breaker, to fail fast while the Renault servers are degraded."""
+
+import asyncio
+import logging
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass
+from http import HTTPStatus
+
+import aiohttp
+
+from .exceptions import CircuitOpenError
+from .kamereon.exceptions import FailedForwardException
+from .kamereon.exceptions import InvalidUpstreamException
+
+_LOGGER = logging.getLogger(__name__)
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half-open"
+
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RESET_TIMEOUT = 60.0  # seconds
+
+# Errors showing that the upstream is degraded, rather than a rejected request
+_UPSTREAM_EXCEPTIONS = (
+    FailedForwardException,
+    InvalidUpstreamException,
+    aiohttp.ClientConnectionError,
+    asyncio.TimeoutError,
+)
+
+
+def is_upstream_failure(error: BaseException) -> bool:
+    """Check if the error shows that the upstream is degraded."""
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status >= HTTPStatus.INTERNAL_SERVER_ERROR
+    return isinstance(error, _UPSTREAM_EXCEPTIONS)
+
+
+@dataclass
+class _Circuit:
+    """State of a single circuit."""
+
+    state: str = CIRCUIT_CLOSED
+    failures: int = 0
+    opened_at: float = 0.0
+    probing: bool = False
+
+
+class CircuitBreaker:
+    """Circuit breakers, keyed by host and by endpoint.
+
+    A circuit opens after `failure_threshold` consecutive upstream failures,
+    and requests then fail fast with `CircuitOpenError`. After `reset_timeout`
+    the circuit is half-open: a single probe request is let through, which
+    closes the circuit on success or re-opens it on failure.
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        reset_timeout: float = DEFAULT_RESET_TIMEOUT,
+    ) -> None:
+        """Initialise the circuit breaker."""
+        if failure_threshold < 1:
+            raise ValueError("`failure_threshold` must be positive")
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._circuits: dict[str, _Circuit] = {}
+
+    def get_state(self, key: str) -> str:
+        """Get the state of the circuit (closed, open or half-open)."""
+        circuit = self._circuits.get(key)
+        if circuit is None:
+            return CIRCUIT_CLOSED
+        if (
+            circuit.state == CIRCUIT_OPEN
+            and time.monotonic() >= circuit.opened_at + self._reset_timeout
+        ):
+            return CIRCUIT_HALF_OPEN
+        return circuit.state
+
+    def acquire(self, keys: Sequence[str]) -> None:
+        """Check that the request may go through all the circuits.
+
+        Raises:
+            CircuitOpenError: if one of the circuits is open, or half-open with
+                a probe request already in flight.
+        """
+        circuits = {key: self._circuits[key] for key in keys if key in self._circuits}
+        for key, circuit in circuits.items():
+            state = self.get_state(key)
+            if state == CIRCUIT_OPEN or (
+                state == CIRCUIT_HALF_OPEN and circuit.probing
+            ):
+                retry_after = circuit.opened_at + self._reset_timeout - time.monotonic()
+                raise CircuitOpenError(key, max(retry_after, 0.0))
+        for key, circuit in circuits.items():
+            if self.get_state(key) == CIRCUIT_HALF_OPEN:
+                circuit.state = CIRCUIT_HALF_OPEN
+                circuit.probing = True
+
+    def release(self, keys: Sequence[str], error: BaseException | None) -> None:
+        """Record the outcome of a request acquired on the circuits."""
+        if isinstance(error, asyncio.CancelledError):
+            # Inconclusive: let another request probe the circuits
+            for key in keys:
+                if key in self._circuits:
+                    self._circuits[key].probing = False
+            return
+        if error is None or not is_upstream_failure(error):
+            # The upstream responded, even if the request was rejected
+            for key in keys:
+                if key in self._circuits and self._circuits[key].state != CIRCUIT_OPEN:
+                    del self._circuits[key]
+            return
+        for key in keys:
+            circuit = self._circuits.setdefault(key, _Circuit())
+            if circuit.state == CIRCUIT_OPEN:
+                # Request sent before the circuit opened
+                continue
+            circuit.failures += 1
+            circuit.probing = False
+            if (
+                circuit.state == CIRCUIT_HALF_OPEN
+                or circuit.failures >= self._failure_threshold
+            ):
+                _LOGGER.warning(
+                    "Circuit %s opened after %s failures: %s",
+                    key,
+                    circuit.failures,
+                    error,
+                )
+                circuit.state = CIRCUIT_OPEN
+                circuit.opened_at = time.monotonic()
+
+    def reset(self) -> None:
+        """Close all the circuits."""
+        self._circuits.clear()
@@ -1,25 +1,26 @@
 """Command-line interface."""
 
+# Subcommand modules (and with them aiohttp, tabulate and the schemas) are
+# imported on use, to keep the CLI startup fast.
+from __future__ import annotations
+
 import errno
 import json
 import logging
 import os
 from datetime import datetime
 from io import TextIOWrapper
+from typing import TYPE_CHECKING
 from typing import Any
 
-import aiohttp
 import click
 from click.core import Context
 
 from . import helpers
-from . import renault_account
-from . import renault_client
-from . import renault_settings
-from . import renault_vehicle
-from .charge import commands as charge_commands
-from .hvac import commands as hvac_commands
-from renault_api.credential_store import FileCredentialStore
+from .lazy_group import LazyGroup
+
+if TYPE_CHECKING:
+    import aiohttp
 
 _WARNING_DEBUG_ENABLED = (
     "Debug output enabled. Logs may contain personally identifiable "
@@ -61,7 +62,15 @@ def _check_for_debug(debug: bool, log: bool) -> None:
         renault_log.warning(_WARNING_DEBUG_ENABLED)
 
 
-@click.group()
+@click.group(
+    cls=LazyGroup,
+    lazy_subcommands={
+        "bench": ("renault_api.cli.bench:bench", "Fleet load generator."),
+        "bulk": ("renault_api.cli.bulk:bulk", "Bulk actions across vehicles."),
+        "charge": ("renault_api.cli.charge.commands:charge", "Charge functionality."),
+        "hvac": ("renault_api.cli.hvac.commands:hvac", "HVAC functionality."),
+    },
+)
 @click.version_option()
 @click.option("--debug", is_flag=True, help="Display debug traces.")
 @click.option("--log", is_flag=True, help="Log debug traces to file.")
@@ -85,6 +94,9 @@ def main(
     vin: str | None = None,
 ) -> None:
     """Main entry point for the Renault CLI."""
+    from . import renault_settings
+    from renault_api.credential_store import FileCredentialStore
+
     ctx.ensure_object(dict)
     ctx.obj["credential_store"] = FileCredentialStore(
         os.path.expanduser(renault_settings.CREDENTIAL_PATH)
@@ -99,10 +111,6 @@ def main(
         ctx.obj["vin"] = vin
 
 
-main.add_command(charge_commands.charge)
-main.add_command(hvac_commands.hvac)
-
-
 @main.command()
 @click.pass_obj
 @helpers.coro_with_websession
@@ -112,6 +120,8 @@ async def accounts(
     websession: aiohttp.ClientSession,
 ) -> None:
     """Display list of accounts."""
+    from . import renault_client
+
     await renault_client.display_accounts(websession, ctx_data)
 
 
@@ -128,12 +138,16 @@ async def login(
     websession: aiohttp.ClientSession,
 ) -> None:
     """Login to Renault."""
+    from . import renault_client
+
     await renault_client.login(websession, ctx_data, user, password)
 
 
 @main.command()
 def reset() -> None:
     """Clear all credentials/settings from the credential store."""
+    from . import renault_settings
+
     renault_settings.reset()
 
 
@@ -154,6 +168,8 @@ async def set(
     websession: aiohttp.ClientSession,
 ) -> None:
     """Store specified settings into credential store."""
+    from . import renault_settings
+
     await renault_settings.set_options(websession, ctx_data, locale, account, vin)
 
 
@@ -161,6 +177,8 @@ async def set(
 @click.pass_obj
 def settings(ctx_data: dict[str, Any]) -> None:
     """Display the current configuration keys."""
+    from . import renault_settings
+
     renault_settings.display_settings(ctx_data)
 
 
@@ -173,6 +191,8 @@ async def status(
     websession: aiohttp.ClientSession,
 ) -> None:
     """Display vehicle status."""
+    from . import renault_vehicle
+
     await renault_vehicle.display_status(websession, ctx_data)
 
 
@@ -185,6 +205,8 @@ async def vehicles(
     websession: aiohttp.ClientSession,
 ) -> None:
     """Display list of vehicles."""
+    from . import renault_account
+
     await renault_account.display_vehicles(websession, ctx_data)
 
 
@@ -197,6 +219,8 @@ async def vehicle(
     websession: aiohttp.ClientSession,
 ) -> None:
     """Display vehicle details."""
+    from . import renault_vehicle
+
     await renault_vehicle.display_vehicle(websession, ctx_data)
 
 
@@ -209,6 +233,8 @@ async def contracts(
     websession: aiohttp.ClientSession,
 ) -> None:
     """Display vehicle contracts."""
+    from . import renault_vehicle
+
     await renault_vehicle.display_contracts(websession, ctx_data)
 
 
@@ -220,6 +246,8 @@ async def horn(
     websession: aiohttp.ClientSession,
 ) -> None:
     """Start horn."""
+    from . import renault_vehicle
+
     vehicle = await renault_vehicle.get_vehicle(
         websession=websession, ctx_data=ctx_data
     )
@@ -246,6 +274,8 @@ async def http_get(
     websession: aiohttp.ClientSession,
 ) -> None:
     """Process HTTP GET request on endpoint."""
+    from . import renault_client
+
     await renault_client.http_request(websession, ctx_data, "GET", endpoint)
 
 
@@ -262,6 +292,8 @@ async def http_post_file(
     websession: aiohttp.ClientSession,
 ) -> None:
     """Process HTTP POST request on endpoint."""
+    from . import renault_client
+
     await renault_client.http_request(
         websession, ctx_data, "POST", endpoint, json.load(json_body)
     )
@@ -280,6 +312,8 @@ async def http_post(
     websession: aiohttp.ClientSession,
 ) -> None:
     """Process HTTP POST request on endpoint."""
+    from . import renault_client
+
     await renault_client.http_request(
         websession, ctx_data, "POST", endpoint, json.loads(json_body)
     )
@@ -293,6 +327,8 @@ async def lights(
     websession: aiohttp.ClientSession,
 ) -> None:
     """Start lights."""
+    from . import renault_vehicle
+
     vehicle = await renault_vehicle.get_vehicle(
         websession=websession, ctx_data=ctx_data
     )
@@ -0,0 +1,303 @@
+"""CLI fleet load generator."""
+
+import asyncio
+import json
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+
+import aiohttp
+import click
+from tabulate import tabulate
+
+from . import helpers
+from renault_api.const import AVAILABLE_LOCALES
+from renault_api.const import CONF_GIGYA_URL
+from renault_api.const import CONF_KAMEREON_URL
+from renault_api.kamereon.exceptions import KamereonResponseException
+from renault_api.renault_client import RenaultClient
+from renault_api.renault_vehicle import RenaultVehicle
+
+DEFAULT_ENDPOINT_MIX = "battery-status=4,cockpit=2,hvac-status=1,charge-mode=1"
+PERCENTILES = (50, 90, 99)
+# Vehicle getters requested on each call, without arguments
+BENCH_ENDPOINTS = (
+    "battery-soc",
+    "battery-status",
+    "charge-mode",
+    "charge-schedule",
+    "charging-settings",
+    "cockpit",
+    "hvac-settings",
+    "hvac-status",
+    "location",
+    "lock-status",
+    "notification-settings",
+    "res-state",
+    "tyre-pressure",
+)
+
+
+def parse_endpoint_mix(endpoint_mix: str) -> dict[str, int]:
+    """Parse an endpoint mix, eg. `battery-status=4,cockpit=1`."""
+    weights: dict[str, int] = {}
+    for item in endpoint_mix.split(","):
+        endpoint, _, weight = item.strip().partition("=")
+        if endpoint not in BENCH_ENDPOINTS:
+            raise click.BadParameter(
+                f"Unknown endpoint `{endpoint}`, "
+                f"expected one of: {', '.join(BENCH_ENDPOINTS)}.",
+                param_hint="--endpoint-mix",
+            )
+        try:
+            weights[endpoint] = int(weight or 1)
+        except ValueError as exc:
+            raise click.BadParameter(
+                f"Invalid weight `{weight}` for `{endpoint}`.",
+                param_hint="--endpoint-mix",
+            ) from exc
+        if weights[endpoint] < 1:
+            raise click.BadParameter(
+                f"Invalid weight `{weight}` for `{endpoint}`, expected at least 1.",
+                param_hint="--endpoint-mix",
+            )
+    return weights
+
+
+def _percentile(sorted_values: list[float], percentile: float) -> float:
+    """Get the percentile from sorted values (nearest rank)."""
+    if not sorted_values:
+        return 0.0
+    index = round(percentile / 100 * (len(sorted_values) - 1))
+    return sorted_values[index]
+
+
+@dataclass
+class BenchReport:
+    """Results of a load generator run."""
+
+    duration: float = 0.0
+    latencies: dict[str, list[float]] = field(default_factory=dict)
+    errors: Counter[str] = field(default_factory=Counter)
+
+    @property
+    def requests(self) -> int:
+        """Total number of requests."""
+        return sum(len(values) for values in self.latencies.values())
+
+    @property
+    def throughput(self) -> float:
+        """Requests per second."""
+        return self.requests / self.duration if self.duration else 0.0
+
+    def record(self, endpoint: str, latency: float, error: str | None) -> None:
+        """Record the outcome of a request."""
+        self.latencies.setdefault(endpoint, []).append(latency)
+        if error:
+            self.errors[error] += 1
+
+    def get_latency_stats(self) -> dict[str, dict[str, float]]:
+        """Get latency percentiles (in milliseconds), per endpoint and overall."""
+        stats: dict[str, dict[str, float]] = {}
+        all_values: list[float] = []
+        for endpoint, values in sorted(self.latencies.items()):
+            all_values.extend(values)
+            stats[endpoint] = self._get_stats(sorted(values))
+        stats["all"] = self._get_stats(sorted(all_values))
+        return stats
+
+    @staticmethod
+    def _get_stats(sorted_values: list[float]) -> dict[str, float]:
+        """Get the stats of sorted latencies."""
+        stats = {"requests": float(len(sorted_values))}
+        for percentile in PERCENTILES:
+            stats[f"p{percentile}"] = _percentile(sorted_values, percentile) * 1000
+        stats["max"] = (sorted_values[-1] if sorted_values else 0.0) * 1000
+        return stats
+
+    def as_dict(self) -> dict[str, Any]:
+        """Get the report as a JSON serialisable dict."""
+        return {
+            "requests": self.requests,
+            "duration": self.duration,
+            "throughput": self.throughput,
+            "latency_ms": self.get_latency_stats(),
+            "errors": dict(self.errors),
+        }
+
+
+def _get_error_key(exc: Exception) -> str:
+    """Get the error breakdown key, including Kamereon error codes."""
+    if isinstance(exc, KamereonResponseException):
+        return f"{type(exc).__name__} ({exc.error_code})"
+    if isinstance(exc, aiohttp.ClientResponseError):
+        return f"{type(exc).__name__} ({exc.status})"
+    return type(exc).__name__
+
+
+async def run_bench(
+    websession: aiohttp.ClientSession,
+    *,
+    base_url: str,
+    locale: str,
+    user: str,
+    password: str,
+    accounts: int,
+    vehicles: int,
+    concurrency: int,
+    requests: int,
+    endpoint_mix: dict[str, int],
+    seed: int | None = None,
+) -> BenchReport:
+    """Drive simulated vehicles across accounts, and report the outcome."""
+    locale_details = {
+        **AVAILABLE_LOCALES[locale],
+        CONF_GIGYA_URL: f"{base_url}/gigya",
+        CONF_KAMEREON_URL: f"{base_url}/kamereon",
+    }
+    fleet: list[RenaultVehicle] = []
+    for account_index in range(accounts):
+        client = RenaultClient(
+            websession=websession, locale=locale, locale_details=locale_details
+        )
+        await client.session.login(user, password)
+        # Simulated vins are not listed, so skip the vehicle registry
+        fleet.extend(
+            RenaultVehicle(
+                account_id=f"bench-account-{account_index}",
+                vin=f"VF1BENCH{vehicle_index:09d}",
+                session=client.session,
+            )
+            for vehicle_index in range(account_index, vehicles, accounts)
+        )
+
+    rng = random.Random(seed)
+    plan = [
+        (
+            rng.choice(fleet),
+            rng.choices(list(endpoint_mix), weights=list(endpoint_mix.values()))[0],
+        )
+        for _ in range(requests)
+    ]
+
+    report = BenchReport()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _request(vehicle: RenaultVehicle, endpoint: str) -> None:
+        async with semaphore:
+            method = getattr(vehicle, f"get_{endpoint.replace('-', '_')}")
+            start = time.perf_counter()
+            error: str | None = None
+            try:
+                await method()
+            except Exception as exc:
+                error = _get_error_key(exc)
+            report.record(endpoint, time.perf_counter() - start, error)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(_request(vehicle, endpoint) for vehicle, endpoint in plan))
+    report.duration = time.perf_counter() - start
+    return report
+
+
+def display_report(report: BenchReport, ctx_data: dict[str, Any]) -> None:
+    """Display the load generator report."""
+    if ctx_data["json"]:
+        click.echo(json.dumps(report.as_dict()))
+        return
+
+    click.echo(
+        f"{report.requests} requests in {report.duration:.2f}s "
+        f"({report.throughput:.1f} req/s)"
+    )
+    headers = [
+        "Endpoint",
+        "Requests",
+        *(f"p{p} (ms)" for p in PERCENTILES),
+        "Max (ms)",
+    ]
+    rows = [
+        [
+            endpoint,
+            int(stats["requests"]),
+            *(f"{stats[f'p{p}']:.1f}" for p in PERCENTILES),
+            f"{stats['max']:.1f}",
+        ]
+        for endpoint, stats in report.get_latency_stats().items()
+    ]
+    click.echo(tabulate(rows, headers=headers))
+    if report.errors:
+        click.echo("")
+        click.echo(tabulate(report.errors.most_common(), headers=["Error", "Count"]))
+
+
+@click.command()
+@click.option(
+    "--base-url",
+    required=True,
+    help="Base URL of the server (eg. the local fake server).",
+)
+@click.option("--user", default="bench@example.com", help="Login to use.")
+@click.option("--password", default="bench", help="Password to use.")
+@click.option(
+    "--accounts", default=1, type=click.IntRange(min=1), help="Number of accounts."
+)
+@click.option(
+    "--vehicles",
+    default=10,
+    type=click.IntRange(min=1),
+    help="Number of vehicles, spread across the accounts.",
+)
+@click.option(
+    "--concurrency",
+    default=10,
+    type=click.IntRange(min=1),
+    help="Maximum number of requests in flight.",
+)
+@click.option(
+    "--requests",
+    default=1000,
+    type=click.IntRange(min=1),
+    help="Total number of requests.",
+)
+@click.option(
+    "--endpoint-mix",
+    default=DEFAULT_ENDPOINT_MIX,
+    show_default=True,
+    help="Weighted endpoints to request.",
+)
+@click.option("--seed", default=None, type=int, help="Seed for the request plan.")
+@click.pass_obj
+@helpers.coro_with_websession
+async def bench(
+    ctx_data: dict[str, Any],
+    *,
+    base_url: str,
+    user: str,
+    password: str,
+    accounts: int,
+    vehicles: int,
+    concurrency: int,
+    requests: int,
+    endpoint_mix: str,
+    seed: int | None,
+    websession: aiohttp.ClientSession,
+) -> None:
+    """Fleet load generator."""
+    report = await run_bench(
+        websession,
+        base_url=base_url.rstrip("/"),
+        locale=ctx_data.get("locale", "fr_FR"),
+        user=user,
+        password=password,
+        accounts=accounts,
+        vehicles=vehicles,
+        concurrency=concurrency,
+        requests=requests,
+        endpoint_mix=parse_endpoint_mix(endpoint_mix),
+        seed=seed,
+    )
+    display_report(report, ctx_data)
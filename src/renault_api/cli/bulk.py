@@ -0,0 +1,193 @@
+"""CLI bulk actions across vehicles."""
+
+import json
+from collections.abc import Callable
+from typing import Any
+from typing import cast
+
+import aiohttp
+import click
+from tabulate import tabulate
+
+from . import helpers
+from renault_api.cli import renault_client
+from renault_api.fleet import DEFAULT_ACCOUNT_CONCURRENCY
+from renault_api.fleet import DEFAULT_CONCURRENCY
+from renault_api.fleet import BulkActionReport
+from renault_api.fleet import VehicleAction
+from renault_api.fleet import run_bulk_action
+from renault_api.kamereon.models import KamereonVehicleChargingSettingsData
+from renault_api.kamereon.schemas import KamereonVehicleChargingSettingsDataSchema
+from renault_api.renault_vehicle import RenaultVehicle
+
+
+def bulk_options(func: Callable[..., Any]) -> Callable[..., Any]:
+    """Add the vehicle selection and concurrency options."""
+    func = click.option(
+        "--rate",
+        default=None,
+        type=click.FloatRange(min=0, min_open=True),
+        help="Maximum number of actions started per second.",
+    )(func)
+    func = click.option(
+        "--account-concurrency",
+        default=DEFAULT_ACCOUNT_CONCURRENCY,
+        show_default=True,
+        type=click.IntRange(min=1),
+        help="Maximum number of actions in flight per account.",
+    )(func)
+    func = click.option(
+        "--concurrency",
+        default=DEFAULT_CONCURRENCY,
+        show_default=True,
+        type=click.IntRange(min=1),
+        help="Maximum number of actions in flight.",
+    )(func)
+    func = click.option(
+        "--vins",
+        "vins",
+        multiple=True,
+        help="Vehicle VIN to include (repeat for several, defaults to all).",
+    )(func)
+    return func
+
+
+def display_report(report: BulkActionReport, ctx_data: dict[str, Any]) -> None:
+    """Display the bulk action report."""
+    if ctx_data["json"]:
+        click.echo(json.dumps(report.as_dict()))
+        return
+
+    click.echo(
+        tabulate(
+            [
+                [
+                    result.target,
+                    "OK" if result.success else "FAILED",
+                    result.error or "",
+                    f"{result.duration:.1f}",
+                ]
+                for result in report.results
+            ],
+            headers=["Vin", "Status", "Error", "Duration (s)"],
+        )
+    )
+    click.echo("")
+    click.echo(
+        f"{len(report.succeeded)} succeeded, {len(report.failed)} failed "
+        f"in {report.duration:.1f}s"
+    )
+
+
+async def _run_bulk_action(
+    websession: aiohttp.ClientSession,
+    ctx_data: dict[str, Any],
+    action: VehicleAction,
+    *,
+    vins: tuple[str, ...],
+    concurrency: int,
+    account_concurrency: int,
+    rate: float | None,
+) -> None:
+    """Run the bulk action, and display the report."""
+    client = await renault_client.get_logged_in_client(
+        websession=websession, ctx_data=ctx_data
+    )
+    report = await run_bulk_action(
+        client,
+        action,
+        selector=vins or None,
+        concurrency=concurrency,
+        account_concurrency=account_concurrency,
+        rate=rate,
+    )
+    display_report(report, ctx_data)
+    if report.failed:
+        raise click.exceptions.Exit(1)
+
+
+@click.group()
+def bulk() -> None:
+    """Bulk actions across vehicles."""
+    pass
+
+
+@bulk.command(name="charge-mode")
+@click.argument("charge_mode")
+@bulk_options
+@click.pass_obj
+@helpers.coro_with_websession
+async def charge_mode(
+    ctx_data: dict[str, Any],
+    *,
+    charge_mode: str,
+    websession: aiohttp.ClientSession,
+    **kwargs: Any,
+) -> None:
+    """Set charge mode (schedule_mode/always/always_charging)."""
+
+    async def _action(vehicle: RenaultVehicle) -> Any:
+        return await vehicle.set_charge_mode(charge_mode)
+
+    await _run_bulk_action(websession, ctx_data, _action, **kwargs)
+
+
+@bulk.command(name="charge-schedules")
+@click.argument("schedules_file", type=click.File())
+@bulk_options
+@click.pass_obj
+@helpers.coro_with_websession
+async def charge_schedules(
+    ctx_data: dict[str, Any],
+    *,
+    schedules_file: Any,
+    websession: aiohttp.ClientSession,
+    **kwargs: Any,
+) -> None:
+    """Set charge schedules, from a JSON file in charging-settings format."""
+    settings = cast(
+        KamereonVehicleChargingSettingsData,
+        KamereonVehicleChargingSettingsDataSchema.load(json.load(schedules_file)),
+    )
+    schedules = settings.schedules or []
+
+    async def _action(vehicle: RenaultVehicle) -> Any:
+        return await vehicle.set_charge_schedules(schedules)
+
+    await _run_bulk_action(websession, ctx_data, _action, **kwargs)
+
+
+@bulk.command(name="charge-start")
+@bulk_options
+@click.pass_obj
+@helpers.coro_with_websession
+async def charge_start(
+    ctx_data: dict[str, Any],
+    *,
+    websession: aiohttp.ClientSession,
+    **kwargs: Any,
+) -> None:
+    """Start charge."""
+
+    async def _action(vehicle: RenaultVehicle) -> Any:
+        return await vehicle.set_charge_start()
+
+    await _run_bulk_action(websession, ctx_data, _action, **kwargs)
+
+
+@bulk.command(name="charge-stop")
+@bulk_options
+@click.pass_obj
+@helpers.coro_with_websession
+async def charge_stop(
+    ctx_data: dict[str, Any],
+    *,
+    websession: aiohttp.ClientSession,
+    **kwargs: Any,
+) -> None:
+    """Stop charge."""
+
+    async def _action(vehicle: RenaultVehicle) -> Any:
+        return await vehicle.set_charge_stop()
+
+    await _run_bulk_action(websession, ctx_data, _action, **kwargs)
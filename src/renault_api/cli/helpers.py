@@ -1,19 +1,23 @@
 """Helpers for Renault API."""
 
+# Heavy modules (aiohttp, dateparser, tzlocal, kamereon) are imported on use,
+# to keep the CLI startup fast.
+from __future__ import annotations
+
 import asyncio
 import functools
 from collections.abc import Callable
 from datetime import datetime
 from datetime import timedelta
+from typing import TYPE_CHECKING
 from typing import Any
 
-import aiohttp
 import click
-import dateparser
-import tzlocal
 
 from renault_api.exceptions import RenaultException
-from renault_api.kamereon.helpers import DAYS_OF_WEEK
+
+if TYPE_CHECKING:
+    import aiohttp
 
 _DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
 
@@ -22,6 +26,8 @@ def coro_with_websession(func: Callable[..., Any]) -> Callable[..., Any]:
     """Ensure the routine runs on an event loop with a websession."""
 
     async def run_command(func: Callable[..., Any], *args: Any, **kwargs: Any) -> None:
+        import aiohttp
+
         async with aiohttp.ClientSession() as websession:
             try:
                 kwargs["websession"] = websession
@@ -42,6 +48,8 @@ def coro_with_websession(func: Callable[..., Any]) -> Callable[..., Any]:
 def days_of_week_option(helptext: str) -> Callable[..., Any]:
     """Add day of week string options."""
 
+    from renault_api.kamereon.helpers import DAYS_OF_WEEK
+
     def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
         for day in reversed(DAYS_OF_WEEK):
             func = click.option(
@@ -137,6 +145,8 @@ def create_aiohttp_closed_event(
 
 def parse_dates(start: str, end: str) -> tuple[datetime, datetime]:
     """Convert start/end string arguments into datetime arguments."""
+    import dateparser
+
     parsed_start = dateparser.parse(start)
     parsed_end = dateparser.parse(end)
 
@@ -150,6 +160,8 @@ def parse_dates(start: str, end: str) -> tuple[datetime, datetime]:
 
 def _timezone_offset() -> int:
     """Return UTC offset in minutes."""
+    import tzlocal
+
     utcoffset = tzlocal.get_localzone().utcoffset(datetime.now())
     if utcoffset:
         return int(utcoffset.total_seconds() / 60)
@@ -157,6 +169,8 @@ def _timezone_offset() -> int:
 
 
 def _format_tzdatetime(date_string: str) -> str:
+    import tzlocal
+
     date = datetime.fromisoformat(date_string.replace("Z", "+00:00"))
     return str(date.astimezone(tzlocal.get_localzone()).strftime(_DATETIME_FORMAT))
 
@@ -97,7 +97,11 @@ async def get_vehicle(
     """Get RenaultVehicle for use by CLI."""
     account = await renault_account.get_account(websession, ctx_data)
     vin = await _get_vin(ctx_data, account)
-    return await account.get_api_vehicle(vin)
+    # The CLI runs a single command, so loading the vehicle registry would only
+    # add a request
+    return RenaultVehicle(
+        account_id=account.account_id, vin=vin, session=account.session
+    )
 
 
 async def display_vehicle(
@@ -0,0 +1,177 @@
+"""Cache for slow-changing Renault API data."""
+
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import time
+from collections.abc import Awaitable
+from collections.abc import Callable
+from typing import Any
+
+from marshmallow.schema import Schema
+
+from .models import BaseModel
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_CACHE_VERSION = 1
+DEFAULT_DATA_CACHE_TTL = 7 * 24 * 3600  # one week
+
+
+class DataCache:
+    """Data cache, for raw responses that rarely change (eg. vehicle details)."""
+
+    def __init__(self, ttl: float = DEFAULT_DATA_CACHE_TTL) -> None:
+        """Initialise the data cache."""
+        self._ttl = ttl
+        self._store: dict[str, dict[str, Any]] = {}
+        self._refresh_times: dict[str, float] = {}
+        self._refresh_tasks: set[asyncio.Task[None]] = set()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Any | None:
+        """Get data from the data cache, or None if missing or expired."""
+        data = self._lookup(key)
+        if data is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return data
+
+    def _lookup(self, key: str) -> Any | None:
+        """Get data from the data cache, without updating the statistics."""
+        entry = self._store.get(key)
+        if entry is None or entry["expiry"] < time.time():
+            return None
+        return entry["data"]
+
+    def __setitem__(self, key: str, data: Any) -> None:
+        """Add data to the data cache."""
+        if not isinstance(key, str):
+            raise TypeError("`key` must be a string")
+
+        self._store[key] = {"expiry": time.time() + self._ttl, "data": data}
+        self._write()
+
+    def __delitem__(self, key: str) -> None:
+        """Remove data from the data cache."""
+        del self._store[key]
+        self._write()
+
+    def __contains__(self, key: str) -> bool:
+        """Check if data is in the data cache."""
+        return self._lookup(key) is not None
+
+    def _write(self) -> None:
+        """Writes the content to fixed storage."""
+        pass
+
+    def clear(self) -> None:
+        """Remove all data from the data cache."""
+        self._store.clear()
+        self._write()
+
+    async def get_response(
+        self,
+        key: str,
+        schema: Schema,
+        request: Callable[[], Awaitable[BaseModel]],
+        *,
+        refresh_interval: float | None = None,
+    ) -> Any:
+        """Get a response from the data cache, or from the request.
+
+        A cached response is returned immediately, and refreshed in the
+        background so that it stays up to date: once per process, or again
+        every `refresh_interval` seconds if set.
+        """
+        cached_data = self.get(key)
+        if cached_data is None:
+            response = await request()
+            self[key] = response.raw_data
+            self._refresh_times[key] = time.monotonic()
+            return response
+
+        last_refresh = self._refresh_times.get(key)
+        if last_refresh is None or (
+            refresh_interval is not None
+            and time.monotonic() - last_refresh >= refresh_interval
+        ):
+            self._refresh_times[key] = time.monotonic()
+            task = asyncio.create_task(self._refresh(key, request))
+            self._refresh_tasks.add(task)
+            task.add_done_callback(self._refresh_tasks.discard)
+        return schema.load(cached_data)
+
+    async def _refresh(
+        self, key: str, request: Callable[[], Awaitable[BaseModel]]
+    ) -> None:
+        """Refresh the data cache in the background."""
+        try:
+            response = await request()
+        except Exception as exc:
+            _LOGGER.debug("Unable to refresh %s in data cache: %s", key, exc)
+            self._refresh_times.pop(key, None)
+        else:
+            self[key] = response.raw_data
+
+
+class FileDataCache(DataCache):
+    """Data cache with items stored in a file."""
+
+    def __init__(
+        self, store_location: str, ttl: float = DEFAULT_DATA_CACHE_TTL
+    ) -> None:
+        """Initialise the data cache."""
+        super().__init__(ttl)
+        self._store_location = store_location
+        self._read()
+
+    def _read(self) -> None:
+        """Read data from store location."""
+        if not os.path.exists(self._store_location):
+            return
+        with open(self._store_location) as json_file:
+            try:
+                content = json.load(json_file)
+            except json.JSONDecodeError:
+                return
+        # Discard content written by an incompatible version
+        if content.get("version") != DATA_CACHE_VERSION:
+            return
+        now = time.time()
+        self._store = {
+            key: entry
+            for key, entry in content.get("entries", {}).items()
+            if entry["expiry"] >= now
+        }
+
+    def _write(self) -> None:
+        """Write data to store location.
+
+        The data is written to a temporary file in the same directory, which
+        then replaces the store, so that an interrupted write (or a concurrent
+        read) never sees a truncated file.
+        """
+        dirname = os.path.dirname(self._store_location)
+        if dirname and not os.path.isdir(dirname):
+            os.makedirs(dirname)
+        with tempfile.NamedTemporaryFile(
+            "w",
+            dir=dirname or ".",
+            prefix=f"{os.path.basename(self._store_location)}.",
+            suffix=".tmp",
+            delete=False,
+        ) as json_file:
+            try:
+                json.dump(
+                    {"version": DATA_CACHE_VERSION, "entries": self._store}, json_file
+                )
+            except BaseException:
+                json_file.close()
+                os.remove(json_file.name)
+                raise
+        os.replace(json_file.name, self._store_location)
@@ -0,0 +1,72 @@
+"""Expected effects of asynchronous vehicle actions.
+
+Kamereon accepts an action as soon as it is posted, but the vehicle applies it
+later. An `Effect` describes the state to wait for, and is passed to
+`RenaultVehicle.await_effect` to poll the relevant status endpoint.
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from .kamereon import enums
+
+DEFAULT_EFFECT_TIMEOUT = 300.0
+DEFAULT_EFFECT_INTERVAL = 5.0
+DEFAULT_EFFECT_MAX_INTERVAL = 60.0
+DEFAULT_EFFECT_BACKOFF = 2.0
+
+
+@dataclass(frozen=True)
+class Effect:
+    """Expected state on a status endpoint (eg. `hvac-status`)."""
+
+    endpoint: str
+    predicate: Callable[[Any], bool]
+    description: str
+
+    def __str__(self) -> str:
+        return self.description
+
+
+def hvac_status(status: str) -> Effect:
+    """Expect hvac status, eg. `on` after `set_ac_start`."""
+    return Effect(
+        "hvac-status",
+        lambda data: data.hvacStatus == status,
+        f"hvac-status hvacStatus={status}",
+    )
+
+
+def charge_mode(mode: str) -> Effect:
+    """Expect charge mode, eg. `always` after `set_charge_mode`."""
+    return Effect(
+        "charge-mode",
+        lambda data: data.chargeMode == mode,
+        f"charge-mode chargeMode={mode}",
+    )
+
+
+def charging_status(*states: enums.ChargeState) -> Effect:
+    """Expect one of the charging states, eg. after `set_charge_start`."""
+    return Effect(
+        "battery-status",
+        lambda data: data.get_charging_status() in states,
+        "battery-status chargingStatus in " + ",".join(state.name for state in states),
+    )
+
+
+def charging_started() -> Effect:
+    """Expect charge to be in progress."""
+    return charging_status(enums.ChargeState.CHARGE_IN_PROGRESS)
+
+
+def charging_stopped() -> Effect:
+    """Expect charge to be no longer in progress."""
+    return charging_status(
+        *(
+            state
+            for state in enums.ChargeState
+            if state != enums.ChargeState.CHARGE_IN_PROGRESS
+        )
+    )
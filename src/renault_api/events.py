@@ -0,0 +1,45 @@
+"""Session events for instrumentation of Renault API requests."""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+
+EVENT_BEFORE_REQUEST = "before_request"
+EVENT_AFTER_RESPONSE = "after_response"
+EVENT_ON_ERROR = "on_error"
+EVENT_AUTH_REFRESH = "auth_refresh"
+
+EVENT_TYPES = [
+    EVENT_BEFORE_REQUEST,
+    EVENT_AFTER_RESPONSE,
+    EVENT_ON_ERROR,
+    EVENT_AUTH_REFRESH,
+]
+
+
+@dataclass
+class SessionEvent:
+    """Event dispatched by RenaultSession around each request.
+
+    `endpoint` is the endpoint name when known (eg. `battery-status`), or the
+    request path otherwise. `duration` (in seconds) is only set once the
+    request has completed, and `error` only if it failed.
+    """
+
+    event_type: str
+    method: str
+    endpoint: str
+    vin: str | None = None
+    duration: float | None = None
+    error: Exception | None = None
+
+    @property
+    def outcome(self) -> str:
+        """Return `success`, the error class name, or `pending`."""
+        if self.error is not None:
+            return type(self.error).__name__
+        if self.duration is None:
+            return "pending"
+        return "success"
+
+
+SessionEventListener = Callable[[SessionEvent], None]
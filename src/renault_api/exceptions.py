@@ -1,5 +1,7 @@
 """Exceptions for Renault API."""
 
+from typing import Any
+
 
 class RenaultException(Exception):  # noqa: N818
     """Base exception for Renault API errors."""
@@ -28,3 +30,35 @@ class InvalidInputError(RenaultException):
     """The input for the service call is invalid."""
 
     pass
+
+
+class EffectTimeoutError(RenaultException):
+    """The expected effect of an action did not appear before the deadline."""
+
+    def __init__(self, effect: str, last_data: Any) -> None:
+        self.effect = effect
+        self.last_data = last_data
+
+    def __str__(self) -> str:
+        return f"Timed out waiting for '{self.effect}'"
+
+
+class CircuitOpenError(RenaultException):
+    """The request was not sent, as the upstream is currently failing."""
+
+    def __init__(self, circuit: str, retry_after: float) -> None:
+        self.circuit = circuit
+        self.retry_after = retry_after
+
+    def __str__(self) -> str:
+        return f"Circuit '{self.circuit}' is open, retry in {self.retry_after:.0f}s"
+
+
+class ActionSuperseded(RenaultException):  # noqa: N818
+    """The queued action was replaced by a newer action of the same kind."""
+
+    def __init__(self, kind: str) -> None:
+        self.kind = kind
+
+    def __str__(self) -> str:
+        return f"Superseded by a newer '{self.kind}' action"
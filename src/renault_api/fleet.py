@@ -0,0 +1,217 @@
+"""Bulk actions across the vehicles of a Renault profile."""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable
+from collections.abc import Callable
+from collections.abc import Collection
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+
+from .exceptions import RenaultException
+from .renault_client import RenaultClient
+from .renault_vehicle import RenaultVehicle
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 20
+DEFAULT_ACCOUNT_CONCURRENCY = 5
+
+VehicleAction = Callable[[RenaultVehicle], Awaitable[Any]]
+VehicleSelector = Collection[str] | Callable[[RenaultVehicle], bool] | None
+
+
+class RateLimiter:
+    """Limit the rate at which actions are started."""
+
+    def __init__(self, rate: float) -> None:
+        """Initialise the rate limiter, with the maximum actions per second."""
+        if rate <= 0:
+            raise ValueError("`rate` must be positive")
+        self._interval = 1 / rate
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait for the next available slot."""
+        async with self._lock:
+            now = time.monotonic()
+            if self._next_slot > now:
+                await asyncio.sleep(self._next_slot - now)
+                now = self._next_slot
+            self._next_slot = now + self._interval
+
+
+@dataclass
+class BulkActionResult:
+    """Outcome of a bulk action on a single vehicle, or on a failed account."""
+
+    vin: str | None
+    account_id: str | None
+    result: Any = None
+    error: Exception | None = None
+    duration: float = 0.0
+
+    @property
+    def success(self) -> bool:
+        """Whether the action succeeded."""
+        return self.error is None
+
+    @property
+    def target(self) -> str:
+        """The vin, or the account id if its vehicles could not be listed."""
+        return self.vin or f"account:{self.account_id}"
+
+
+@dataclass
+class BulkActionReport:
+    """Outcome of a bulk action, per vin."""
+
+    results: list[BulkActionResult] = field(default_factory=list)
+    duration: float = 0.0
+
+    @property
+    def succeeded(self) -> list[BulkActionResult]:
+        """Results of the successful actions."""
+        return [result for result in self.results if result.success]
+
+    @property
+    def failed(self) -> list[BulkActionResult]:
+        """Results of the failed actions."""
+        return [result for result in self.results if not result.success]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Get the report as a JSON serialisable dict."""
+        return {
+            "duration": self.duration,
+            "succeeded": len(self.succeeded),
+            "failed": len(self.failed),
+            "results": {
+                result.target: {
+                    "account_id": result.account_id,
+                    "success": result.success,
+                    "error": str(result.error) if result.error else None,
+                    "duration": result.duration,
+                }
+                for result in self.results
+            },
+        }
+
+
+async def select_vehicles(
+    client: RenaultClient, selector: VehicleSelector = None
+) -> tuple[dict[str, RenaultVehicle], list[str], dict[str, Exception]]:
+    """Get the vehicles matching the selector, across all accounts.
+
+    Args:
+        client: the client to get the accounts from.
+        selector: a collection of vins, a predicate on the vehicle, or None to
+            select all vehicles.
+
+    Returns:
+        The selected vehicles by vin, the requested vins that were not found,
+        and the errors by account id for the accounts whose vehicles could not
+        be listed. A failure on one account does not affect the others.
+    """
+    accounts = await client.get_api_accounts()
+    vehicle_lists = await asyncio.gather(
+        *(account.get_api_vehicles() for account in accounts),
+        return_exceptions=True,
+    )
+    vehicles: dict[str, RenaultVehicle] = {}
+    account_errors: dict[str, Exception] = {}
+    for account, vehicle_list in zip(accounts, vehicle_lists, strict=True):
+        if isinstance(vehicle_list, Exception):
+            _LOGGER.debug(
+                "Failed to get the vehicles of %s: %s", account.account_id, vehicle_list
+            )
+            account_errors[account.account_id] = vehicle_list
+        elif isinstance(vehicle_list, BaseException):
+            raise vehicle_list
+        else:
+            vehicles.update((vehicle.vin, vehicle) for vehicle in vehicle_list)
+    if selector is None:
+        return vehicles, [], account_errors
+    if callable(selector):
+        return (
+            {vin: vehicle for vin, vehicle in vehicles.items() if selector(vehicle)},
+            [],
+            account_errors,
+        )
+    return (
+        {vin: vehicles[vin] for vin in selector if vin in vehicles},
+        [vin for vin in selector if vin not in vehicles],
+        account_errors,
+    )
+
+
+async def run_bulk_action(
+    client: RenaultClient,
+    action: VehicleAction,
+    *,
+    selector: VehicleSelector = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    account_concurrency: int = DEFAULT_ACCOUNT_CONCURRENCY,
+    rate: float | None = None,
+) -> BulkActionReport:
+    """Run an action on the selected vehicles, with bounded concurrency.
+
+    Args:
+        client: the client to get the accounts and vehicles from.
+        action: the coroutine function to run on each vehicle, eg.
+            `lambda vehicle: vehicle.set_charge_mode("always")`.
+        selector: a collection of vins, a predicate on the vehicle, or None to
+            select all vehicles.
+        concurrency: maximum number of actions in flight.
+        account_concurrency: maximum number of actions in flight per account.
+        rate: maximum number of actions started per second.
+
+    Returns:
+        The outcome of the action, per vin, with the accounts whose vehicles
+        could not be listed as failures. A failure on one vehicle does not
+        affect the others.
+    """
+    start = time.perf_counter()
+    vehicles, missing_vins, account_errors = await select_vehicles(client, selector)
+    report = BulkActionReport(
+        results=[
+            BulkActionResult(None, account_id, error=error)
+            for account_id, error in account_errors.items()
+        ]
+    )
+    report.results.extend(
+        BulkActionResult(
+            vin, None, error=RenaultException(f"Vehicle `{vin}` not found.")
+        )
+        for vin in missing_vins
+    )
+
+    semaphore = asyncio.Semaphore(concurrency)
+    account_semaphores: dict[str, asyncio.Semaphore] = {}
+    rate_limiter = RateLimiter(rate) if rate else None
+
+    async def _run(vehicle: RenaultVehicle) -> BulkActionResult:
+        account_semaphore = account_semaphores.setdefault(
+            vehicle.account_id, asyncio.Semaphore(account_concurrency)
+        )
+        # Wait for the account slot first, so other accounts can use global slots
+        async with account_semaphore, semaphore:
+            if rate_limiter is not None:
+                await rate_limiter.acquire()
+            result = BulkActionResult(vehicle.vin, vehicle.account_id)
+            action_start = time.perf_counter()
+            try:
+                result.result = await action(vehicle)
+            except Exception as exc:
+                _LOGGER.debug("Bulk action failed on %s: %s", vehicle.vin, exc)
+                result.error = exc
+            result.duration = time.perf_counter() - action_start
+            return result
+
+    report.results.extend(
+        await asyncio.gather(*(_run(vehicle) for vehicle in vehicles.values()))
+    )
+    report.duration = time.perf_counter() - start
+    return report
@@ -11,6 +11,7 @@ from marshmallow.schema import Schema
 from . import models
 from . import schemas
 from .exceptions import GigyaException
+from renault_api.tracing import start_span
 
 GIGYA_JWT = "gigya_jwt"
 GIGYA_LOGIN_TOKEN = "gigya_login_token"  # nosec
@@ -28,19 +29,20 @@ async def request(
     schema: Schema,
 ) -> models.GigyaResponse:
     """Send request to Gigya."""
-    async with websession.request(method, url, data=data) as http_response:
-        response_text = await http_response.text()
-        # Don't log on Gigya, to avoid unnecessary exposure.
-        try:
-            gigya_response: models.GigyaResponse = schema.loads(response_text)
-        except JSONDecodeError as err:
-            raise GigyaException("Gigya responded with invalid JSON") from err
-        # Check for Gigya error
-        gigya_response.raise_for_error_code()
-        # Check for HTTP error
-        http_response.raise_for_status()
+    with start_span("gigya.request", {"http.request.method": method, "url.full": url}):
+        async with websession.request(method, url, data=data) as http_response:
+            response_text = await http_response.text()
+            # Don't log on Gigya, to avoid unnecessary exposure.
+            try:
+                gigya_response: models.GigyaResponse = schema.loads(response_text)
+            except JSONDecodeError as err:
+                raise GigyaException("Gigya responded with invalid JSON") from err
+            # Check for Gigya error
+            gigya_response.raise_for_error_code()
+            # Check for HTTP error
+            http_response.raise_for_status()
 
-        return gigya_response
+            return gigya_response
 
 
 async def login(
@@ -1,25 +1,47 @@
-"""Gigya schemas."""
+"""Gigya schemas.
+
+Schemas are compiled on first use and then cached as module attributes, so
+that importing the package doesn't compile schemas a process never uses.
+"""
+
+from typing import TYPE_CHECKING
+from typing import Any
 
 import marshmallow_dataclass
+from marshmallow.schema import Schema
 
 from . import models
 from renault_api.models import BaseSchema
 
-GigyaResponseSchema = marshmallow_dataclass.class_schema(
-    models.GigyaResponse, base_schema=BaseSchema
-)()
-
-
-GigyaLoginResponseSchema = marshmallow_dataclass.class_schema(
-    models.GigyaLoginResponse, base_schema=BaseSchema
-)()
-
-
-GigyaGetAccountInfoResponseSchema = marshmallow_dataclass.class_schema(
-    models.GigyaGetAccountInfoResponse, base_schema=BaseSchema
-)()
-
-
-GigyaGetJWTResponseSchema = marshmallow_dataclass.class_schema(
-    models.GigyaGetJWTResponse, base_schema=BaseSchema
-)()
+_SCHEMA_MODELS: dict[str, type[Any]] = {
+    f"{model.__name__}Schema": model
+    for model in (
+        models.GigyaResponse,
+        models.GigyaLoginResponse,
+        models.GigyaGetAccountInfoResponse,
+        models.GigyaGetJWTResponse,
+    )
+}
+
+
+if TYPE_CHECKING:
+    # Declared for type checkers, as the module __getattr__ accepts any name
+    GigyaResponseSchema: Schema
+    GigyaLoginResponseSchema: Schema
+    GigyaGetAccountInfoResponseSchema: Schema
+    GigyaGetJWTResponseSchema: Schema
+
+
+def __getattr__(name: str) -> Schema:
+    """Compile the requested schema on first access."""
+    model = _SCHEMA_MODELS.get(name)
+    if model is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    schema: Schema = marshmallow_dataclass.class_schema(model, base_schema=BaseSchema)()
+    globals()[name] = schema
+    return schema
+
+
+def __dir__() -> list[str]:
+    """List the available schemas."""
+    return sorted([*globals(), *_SCHEMA_MODELS])
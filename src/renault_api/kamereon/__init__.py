@@ -1,20 +1,33 @@
 """Kamereon API."""
 
 import logging
+import re
 from json import dumps as json_dumps
+from json import loads as json_loads
 from typing import Any
 from typing import cast
 from warnings import warn
 
 import aiohttp
 from marshmallow.schema import Schema
+from yarl import URL
 
 from . import models
 from . import schemas
 from .exceptions import KamereonResponseException
+from renault_api.tracing import start_span
 
 _LOGGER = logging.getLogger(__name__)
 
+# Identifiers in the url paths, replaced by placeholders in the traces
+_URL_IDENTIFIERS = {
+    "accounts": "{accountId}",
+    "cars": "{vin}",
+    "persons": "{personId}",
+    "vehicles": "{vin}",
+}
+_URL_IDENTIFIER_PATTERN = re.compile(r"/(accounts|cars|persons|vehicles)/[^/]+")
+
 
 _KCA_GET_ENDPOINTS: dict[str, Any] = {
     "": {"version": 2},
@@ -83,6 +96,13 @@ def get_contracts_url(root_url: str, account_id: str, vin: str) -> str:
     return f"{account_url}/vehicles/{vin}/contracts"
 
 
+def get_url_template(url: str) -> str:
+    """Get the url path, with the account, person and vehicle ids templated."""
+    return _URL_IDENTIFIER_PATTERN.sub(
+        lambda match: f"/{match[1]}/{_URL_IDENTIFIERS[match[1]]}", URL(url).path
+    )
+
+
 async def request(
     websession: aiohttp.ClientSession,
     method: str,
@@ -102,46 +122,57 @@ async def request(
         "apikey": api_key,
         "x-gigya-id_token": gigya_jwt,
     }
-    async with websession.request(
-        method,
-        url,
-        headers=headers,
-        params=params,
-        json=json,
-    ) as http_response:
-        response_text = await http_response.text()
-        if json:
-            _LOGGER.debug(
-                "Send Kamereon %s request to %s with body: %s",
-                method,
-                http_response.url,
-                json_dumps(json),
-            )
-        _LOGGER.debug(
-            "Received Kamereon response %s on %s to %s: %s",
-            http_response.status,
+    with start_span(
+        "kamereon.request",
+        {"http.request.method": method, "url.template": get_url_template(url)},
+    ) as span:
+        async with websession.request(
             method,
-            http_response.url,
-            response_text,
-        )
+            url,
+            headers=headers,
+            params=params,
+            json=json,
+        ) as http_response:
+            response_body = await http_response.read()
+            if span is not None:
+                span.set_attribute("http.response.status_code", http_response.status)
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                if json:
+                    _LOGGER.debug(
+                        "Send Kamereon %s request to %s with body: %s",
+                        method,
+                        http_response.url,
+                        json_dumps(json),
+                    )
+                _LOGGER.debug(
+                    "Received Kamereon response %s on %s to %s: %s",
+                    http_response.status,
+                    method,
+                    http_response.url,
+                    response_body.decode(errors="replace"),
+                )
+
+            if response_body[:1] not in (b"{", b"["):
+                # Check for HTTP error
+                http_response.raise_for_status()
+                raise KamereonResponseException(
+                    "Invalid JSON", response_body.decode(errors="replace")
+                )
+
+            response_data = json_loads(response_body)
+            # Some endpoints return arrays instead of objects.
+            # These need to be wrapped in an object.
+            if isinstance(response_data, list):
+                response_data = {wrap_array_in or "data": response_data}
+
+            kamereon_response: models.KamereonResponse = schema.load(response_data)
+            # Check for Kamereon error
+            kamereon_response.raise_for_error_code()
 
-        # Some endpoints return arrays instead of objects.
-        # These need to be wrapped in an object.
-        if response_text.startswith("["):
-            response_text = f'{{"{wrap_array_in or "data"}": {response_text}}}'
-        if not response_text.startswith("{"):
             # Check for HTTP error
             http_response.raise_for_status()
-            raise KamereonResponseException("Invalid JSON", response_text)
-
-        kamereon_response: models.KamereonResponse = schema.loads(response_text)
-        # Check for Kamereon error
-        kamereon_response.raise_for_error_code()
-
-        # Check for HTTP error
-        http_response.raise_for_status()
 
-        return kamereon_response
+            return kamereon_response
 
 
 async def get_person(
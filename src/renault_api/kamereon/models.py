@@ -650,6 +650,9 @@ _VEHICLE_ENDPOINTS: dict[str, dict[str, EndpointDefinition | None]] = {
     },
 }
 
+# Endpoints which require a period, and cannot be probed
+_UNPROBED_ENDPOINTS = {"charge-history", "charges", "hvac-history", "hvac-sessions"}
+
 _ALREADY_WARNED_VEHICLE: set[str] = set()
 _ALREADY_WARNED_VEHICLE_ENDPOINT: set[str] = set()
 
@@ -700,6 +703,24 @@ def get_model_endpoint(
     return endpoints[endpoint]
 
 
+def get_probe_candidates() -> dict[str, list[EndpointDefinition]]:
+    """Return the candidate definitions of the endpoints which can be probed.
+
+    Actions are excluded, as probing them would trigger the action, and so are
+    the endpoints which require a period.
+    """
+    candidates = {
+        endpoint: [definition]
+        for endpoint, definition in _DEFAULT_ENDPOINTS.items()
+        if not endpoint.startswith("actions/") and endpoint not in _UNPROBED_ENDPOINTS
+    }
+    for name, definition in _KCM_ENDPOINTS.items():
+        endpoint = name.split("-via-")[0]
+        if endpoint in candidates and definition not in candidates[endpoint]:
+            candidates[endpoint].append(definition)
+    return candidates
+
+
 @dataclass
 class KamereonResponseError(BaseModel):
     """Kamereon response error."""
@@ -1,141 +1,97 @@
-"""Kamereon schemas."""
+"""Kamereon schemas.
+
+Schemas are compiled on first use and then cached as module attributes, so
+that importing the package doesn't compile schemas a process never uses.
+"""
+
+from typing import TYPE_CHECKING
+from typing import Any
 
 import marshmallow_dataclass
+from marshmallow.schema import Schema
 
 from . import models
 from renault_api.models import BaseSchema
 
-KamereonResponseSchema = marshmallow_dataclass.class_schema(
-    models.KamereonResponse, base_schema=BaseSchema
-)()
-
-
-KamereonPersonResponseSchema = marshmallow_dataclass.class_schema(
-    models.KamereonPersonResponse, base_schema=BaseSchema
-)()
-
-
-KamereonVehicleContractsResponseSchema = marshmallow_dataclass.class_schema(
-    models.KamereonVehicleContractsResponse, base_schema=BaseSchema
-)()
-
-KamereonVehiclesResponseSchema = marshmallow_dataclass.class_schema(
-    models.KamereonVehiclesResponse, base_schema=BaseSchema
-)()
-
-KamereonVehicleDetailsResponseSchema = marshmallow_dataclass.class_schema(
-    models.KamereonVehicleDetailsResponse, base_schema=BaseSchema
-)()
-
-
-KamereonVehicleDataResponseSchema = marshmallow_dataclass.class_schema(
-    models.KamereonVehicleDataResponse, base_schema=BaseSchema
-)()
-
-
-KamereonVehicleBatteryStatusDataSchema = marshmallow_dataclass.class_schema(
-    models.KamereonVehicleBatteryStatusData, base_schema=BaseSchema
-)()
-
-KamereonVehicleBatterySocDataSchema = marshmallow_dataclass.class_schema(
-    models.KamereonVehicleBatterySocData, base_schema=BaseSchema
-)()
-
-KamereonVehicleTyrePressureDataSchema = marshmallow_dataclass.class_schema(
-    models.KamereonVehicleTyrePressureData, base_schema=BaseSchema
-)()
-
-KamereonVehicleLocationDataSchema = marshmallow_dataclass.class_schema(
-    models.KamereonVehicleLocationData, base_schema=BaseSchema
-)()
-
-KamereonVehicleLockStatusDataSchema = marshmallow_dataclass.class_schema(
-    models.KamereonVehicleLockStatusData, base_schema=BaseSchema
-)()
-
-KamereonVehicleResStateDataSchema = marshmallow_dataclass.class_schema(
-    models.KamereonVehicleResStateData, base_schema=BaseSchema
-)()
-
-KamereonVehicleHvacStatusDataSchema = marshmallow_dataclass.class_schema(
-    models.KamereonVehicleHvacStatusData, base_schema=BaseSchema
-)()
-
-
-KamereonVehicleChargeModeDataSchema = marshmallow_dataclass.class_schema(
-    models.KamereonVehicleChargeModeData, base_schema=BaseSchema
-)()
-
-
-KamereonVehicleCockpitDataSchema = marshmallow_dataclass.class_schema(
-    models.KamereonVehicleCockpitData, base_schema=BaseSchema
-)()
-
-
-KamereonVehicleLockStatusDataSchema = marshmallow_dataclass.class_schema(
-    models.KamereonVehicleLockStatusData, base_schema=BaseSchema
-)()
-
-
-KamereonVehicleCarAdapterDataSchema = marshmallow_dataclass.class_schema(
-    models.KamereonVehicleCarAdapterData, base_schema=BaseSchema
-)()
-
-
-KamereonVehicleChargingSettingsDataSchema = marshmallow_dataclass.class_schema(
-    models.KamereonVehicleChargingSettingsData, base_schema=BaseSchema
-)()
-
-KamereonVehicleHvacSettingsDataSchema = marshmallow_dataclass.class_schema(
-    models.KamereonVehicleHvacSettingsData, base_schema=BaseSchema
-)()
-
-KamereonVehicleNotificationSettingsDataSchema = marshmallow_dataclass.class_schema(
-    models.KamereonVehicleNotificationSettingsData, base_schema=BaseSchema
-)()
-
-
-KamereonVehicleChargeHistoryDataSchema = marshmallow_dataclass.class_schema(
-    models.KamereonVehicleChargeHistoryData, base_schema=BaseSchema
-)()
-
-
-KamereonVehicleChargesDataSchema = marshmallow_dataclass.class_schema(
-    models.KamereonVehicleChargesData, base_schema=BaseSchema
-)()
-
-
-KamereonVehicleHvacHistoryDataSchema = marshmallow_dataclass.class_schema(
-    models.KamereonVehicleHvacHistoryData, base_schema=BaseSchema
-)()
-
-
-KamereonVehicleHvacSessionsDataSchema = marshmallow_dataclass.class_schema(
-    models.KamereonVehicleHvacSessionsData, base_schema=BaseSchema
-)()
-
-KamereonVehicleBatterySocActionDataSchema = marshmallow_dataclass.class_schema(
-    models.KamereonVehicleBatterySocActionData, base_schema=BaseSchema
-)()
-
-KamereonVehicleHvacStartActionDataSchema = marshmallow_dataclass.class_schema(
-    models.KamereonVehicleHvacStartActionData, base_schema=BaseSchema
-)()
-
-KamereonVehicleHvacScheduleActionDataSchema = marshmallow_dataclass.class_schema(
-    models.KamereonVehicleHvacScheduleActionData, base_schema=BaseSchema
-)()
-
-KamereonVehicleChargeScheduleActionDataSchema = marshmallow_dataclass.class_schema(
-    models.KamereonVehicleChargeScheduleActionData, base_schema=BaseSchema
-)()
-
-
-KamereonVehicleChargeModeActionDataSchema = marshmallow_dataclass.class_schema(
-    models.KamereonVehicleChargeModeActionData, base_schema=BaseSchema
-)()
-
-
-KamereonVehicleChargingStartActionDataSchema = marshmallow_dataclass.class_schema(
-    models.KamereonVehicleChargingStartActionData, base_schema=BaseSchema
-)()
+_SCHEMA_MODELS: dict[str, type[Any]] = {
+    f"{model.__name__}Schema": model
+    for model in (
+        models.KamereonResponse,
+        models.KamereonPersonResponse,
+        models.KamereonVehicleContractsResponse,
+        models.KamereonVehiclesResponse,
+        models.KamereonVehicleDetailsResponse,
+        models.KamereonVehicleDataResponse,
+        models.KamereonVehicleBatteryStatusData,
+        models.KamereonVehicleBatterySocData,
+        models.KamereonVehicleTyrePressureData,
+        models.KamereonVehicleLocationData,
+        models.KamereonVehicleLockStatusData,
+        models.KamereonVehicleResStateData,
+        models.KamereonVehicleHvacStatusData,
+        models.KamereonVehicleChargeModeData,
+        models.KamereonVehicleCockpitData,
+        models.KamereonVehicleCarAdapterData,
+        models.KamereonVehicleChargingSettingsData,
+        models.KamereonVehicleHvacSettingsData,
+        models.KamereonVehicleNotificationSettingsData,
+        models.KamereonVehicleChargeHistoryData,
+        models.KamereonVehicleChargesData,
+        models.KamereonVehicleHvacHistoryData,
+        models.KamereonVehicleHvacSessionsData,
+        models.KamereonVehicleBatterySocActionData,
+        models.KamereonVehicleHvacStartActionData,
+        models.KamereonVehicleHvacScheduleActionData,
+        models.KamereonVehicleChargeScheduleActionData,
+        models.KamereonVehicleChargeModeActionData,
+        models.KamereonVehicleChargingStartActionData,
+    )
+}
+
+
+if TYPE_CHECKING:
+    # Declared for type checkers, as the module __getattr__ accepts any name
+    KamereonResponseSchema: Schema
+    KamereonPersonResponseSchema: Schema
+    KamereonVehicleContractsResponseSchema: Schema
+    KamereonVehiclesResponseSchema: Schema
+    KamereonVehicleDetailsResponseSchema: Schema
+    KamereonVehicleDataResponseSchema: Schema
+    KamereonVehicleBatteryStatusDataSchema: Schema
+    KamereonVehicleBatterySocDataSchema: Schema
+    KamereonVehicleTyrePressureDataSchema: Schema
+    KamereonVehicleLocationDataSchema: Schema
+    KamereonVehicleLockStatusDataSchema: Schema
+    KamereonVehicleResStateDataSchema: Schema
+    KamereonVehicleHvacStatusDataSchema: Schema
+    KamereonVehicleChargeModeDataSchema: Schema
+    KamereonVehicleCockpitDataSchema: Schema
+    KamereonVehicleCarAdapterDataSchema: Schema
+    KamereonVehicleChargingSettingsDataSchema: Schema
+    KamereonVehicleHvacSettingsDataSchema: Schema
+    KamereonVehicleNotificationSettingsDataSchema: Schema
+    KamereonVehicleChargeHistoryDataSchema: Schema
+    KamereonVehicleChargesDataSchema: Schema
+    KamereonVehicleHvacHistoryDataSchema: Schema
+    KamereonVehicleHvacSessionsDataSchema: Schema
+    KamereonVehicleBatterySocActionDataSchema: Schema
+    KamereonVehicleHvacStartActionDataSchema: Schema
+    KamereonVehicleHvacScheduleActionDataSchema: Schema
+    KamereonVehicleChargeScheduleActionDataSchema: Schema
+    KamereonVehicleChargeModeActionDataSchema: Schema
+    KamereonVehicleChargingStartActionDataSchema: Schema
+
+
+def __getattr__(name: str) -> Schema:
+    """Compile the requested schema on first access."""
+    model = _SCHEMA_MODELS.get(name)
+    if model is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    schema: Schema = marshmallow_dataclass.class_schema(model, base_schema=BaseSchema)()
+    globals()[name] = schema
+    return schema
+
+
+def __dir__() -> list[str]:
+    """List the available schemas."""
+    return sorted([*globals(), *_SCHEMA_MODELS])
@@ -0,0 +1,222 @@
+"""Prometheus-style metrics for Renault API sessions."""
+
+from collections import defaultdict
+from dataclasses import dataclass
+from dataclasses import field
+
+from aiohttp import web
+
+from .data_cache import DataCache
+from .events import EVENT_AFTER_RESPONSE
+from .events import EVENT_AUTH_REFRESH
+from .events import EVENT_ON_ERROR
+from .events import SessionEvent
+from .exceptions import CircuitOpenError
+from .kamereon.exceptions import KamereonResponseException
+from .renault_session import RenaultSession
+
+DEFAULT_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+DEFAULT_METRICS_HOST = "127.0.0.1"
+DEFAULT_METRICS_PORT = 9464
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_Labels = tuple[tuple[str, str], ...]
+
+
+@dataclass
+class _Histogram:
+    """Cumulative histogram for a single label set."""
+
+    buckets: tuple[float, ...]
+    counts: list[int] = field(default_factory=list)
+    total: float = 0.0
+    count: int = 0
+
+    def __post_init__(self) -> None:
+        """Initialise bucket counts."""
+        self.counts = [0] * len(self.buckets)
+
+    def observe(self, value: float) -> None:
+        """Record a single observation."""
+        for index, upper_bound in enumerate(self.buckets):
+            if value <= upper_bound:
+                self.counts[index] += 1
+        self.total += value
+        self.count += 1
+
+
+def _format_labels(labels: _Labels) -> str:
+    """Format labels as `{name="value",...}`."""
+    if not labels:
+        return ""
+    formatted = ",".join(
+        '{}="{}"'.format(
+            name,
+            value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"),
+        )
+        for name, value in labels
+    )
+    return f"{{{formatted}}}"
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value."""
+    if isinstance(value, int) or value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+class MetricsCollector:
+    """Collect request metrics from session events.
+
+    Latency histograms and request counters are kept per endpoint name,
+    error counters per Kamereon error code, alongside circuit breaker
+    rejections, JWT refresh counts and data cache hit ratios.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        """Initialise the metrics collector."""
+        self._buckets = tuple(sorted(buckets))
+        self._latency: dict[_Labels, _Histogram] = {}
+        self._requests: dict[_Labels, int] = defaultdict(int)
+        self._errors: dict[_Labels, int] = defaultdict(int)
+        self._rejections: dict[_Labels, int] = defaultdict(int)
+        self._jwt_refreshes: dict[_Labels, int] = defaultdict(int)
+        self._data_caches: list[DataCache] = []
+
+    def attach(self, session: RenaultSession) -> None:
+        """Register the collector on the session events."""
+        session.add_listener(EVENT_AFTER_RESPONSE, self._on_request)
+        session.add_listener(EVENT_ON_ERROR, self._on_request)
+        session.add_listener(EVENT_AUTH_REFRESH, self._on_auth_refresh)
+
+    def track_data_cache(self, data_cache: DataCache) -> None:
+        """Include the data cache statistics in the metrics."""
+        self._data_caches.append(data_cache)
+
+    def _on_request(self, event: SessionEvent) -> None:
+        """Record a completed request."""
+        if event.error is not None and event.endpoint == "accounts.getJWT":
+            # JWT renewal failures are recorded by _on_auth_refresh
+            self._on_auth_refresh(event)
+            return
+        labels = (("method", event.method), ("endpoint", event.endpoint))
+        if isinstance(event.error, CircuitOpenError):
+            # Failed fast without sending: not a request, nor a latency sample
+            self._rejections[labels] += 1
+            return
+        self._requests[(*labels, ("outcome", event.outcome))] += 1
+        if event.duration is not None:
+            histogram = self._latency.get(labels)
+            if histogram is None:
+                histogram = self._latency[labels] = _Histogram(self._buckets)
+            histogram.observe(event.duration)
+        if isinstance(event.error, KamereonResponseException):
+            error_code = event.error.error_code or "unknown"
+            self._errors[(("endpoint", event.endpoint), ("code", error_code))] += 1
+
+    def _on_auth_refresh(self, event: SessionEvent) -> None:
+        """Record a JWT refresh."""
+        self._jwt_refreshes[(("outcome", event.outcome),)] += 1
+
+    def render(self) -> str:
+        """Render the metrics in the Prometheus text format."""
+        lines: list[str] = []
+
+        lines.append(
+            "# HELP renault_api_request_duration_seconds Kamereon request latency."
+        )
+        lines.append("# TYPE renault_api_request_duration_seconds histogram")
+        for labels, histogram in sorted(self._latency.items()):
+            for upper_bound, count in zip(
+                histogram.buckets, histogram.counts, strict=True
+            ):
+                bucket_labels = (*labels, ("le", _format_value(upper_bound)))
+                lines.append(
+                    "renault_api_request_duration_seconds_bucket"
+                    f"{_format_labels(bucket_labels)} {count}"
+                )
+            inf_labels = _format_labels((*labels, ("le", "+Inf")))
+            lines.append(
+                f"renault_api_request_duration_seconds_bucket{inf_labels}"
+                f" {histogram.count}"
+            )
+            lines.append(
+                "renault_api_request_duration_seconds_sum"
+                f"{_format_labels(labels)} {_format_value(histogram.total)}"
+            )
+            lines.append(
+                "renault_api_request_duration_seconds_count"
+                f"{_format_labels(labels)} {histogram.count}"
+            )
+
+        self._render_counter(
+            lines,
+            "renault_api_requests_total",
+            "Kamereon requests, by endpoint and outcome.",
+            self._requests,
+        )
+        self._render_counter(
+            lines,
+            "renault_api_errors_total",
+            "Kamereon errors, by endpoint and error code.",
+            self._errors,
+        )
+        self._render_counter(
+            lines,
+            "renault_api_circuit_rejections_total",
+            "Kamereon requests failed fast by an open circuit, by endpoint.",
+            self._rejections,
+        )
+        self._render_counter(
+            lines,
+            "renault_api_jwt_refresh_total",
+            "Gigya JWT refreshes, by outcome.",
+            self._jwt_refreshes,
+        )
+
+        hits = sum(data_cache.hits for data_cache in self._data_caches)
+        misses = sum(data_cache.misses for data_cache in self._data_caches)
+        lines.append("# HELP renault_api_data_cache_hits_total Data cache hits.")
+        lines.append("# TYPE renault_api_data_cache_hits_total counter")
+        lines.append(f"renault_api_data_cache_hits_total {hits}")
+        lines.append("# HELP renault_api_data_cache_misses_total Data cache misses.")
+        lines.append("# TYPE renault_api_data_cache_misses_total counter")
+        lines.append(f"renault_api_data_cache_misses_total {misses}")
+        lines.append("# HELP renault_api_data_cache_hit_ratio Data cache hit ratio.")
+        lines.append("# TYPE renault_api_data_cache_hit_ratio gauge")
+        ratio = hits / (hits + misses) if hits + misses else 0.0
+        lines.append(f"renault_api_data_cache_hit_ratio {_format_value(ratio)}")
+
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _render_counter(
+        lines: list[str], name: str, description: str, values: dict[_Labels, int]
+    ) -> None:
+        """Render a counter."""
+        lines.append(f"# HELP {name} {description}")
+        lines.append(f"# TYPE {name} counter")
+        for labels, value in sorted(values.items()):
+            lines.append(f"{name}{_format_labels(labels)} {value}")
+
+    async def handle(self, request: web.Request) -> web.Response:
+        """Serve the metrics over HTTP."""
+        return web.Response(
+            body=self.render().encode(), headers={"Content-Type": CONTENT_TYPE}
+        )
+
+    async def start_server(
+        self, host: str = DEFAULT_METRICS_HOST, port: int = DEFAULT_METRICS_PORT
+    ) -> web.AppRunner:
+        """Start a local HTTP server exposing `/metrics`.
+
+        The returned runner should be cleaned up by the caller.
+        """
+        app = web.Application()
+        app.router.add_get("/metrics", self.handle)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        await web.TCPSite(runner, host, port).start()
+        return runner
@@ -0,0 +1,355 @@
+"""Adaptive polling of vehicle data, driven by the vehicle state.
+
+A parked, unplugged vehicle rarely changes, so polling it as often as a
+charging one wastes quota. The `PollingScheduler` picks the next poll time of
+each endpoint from the latest battery and hvac status: fast while charging or
+preconditioning, slow when idle, and aligned to the expected charge end.
+
+Kamereon enforces per-account quotas, so `plan_polling_budget` shares a daily
+request budget across the vehicles and endpoints of each account, and sets the
+resulting minimum intervals on the scheduler.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable
+from collections.abc import Callable
+from collections.abc import Iterable
+from collections.abc import Mapping
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+
+from .exceptions import InvalidInputError
+from .kamereon import enums
+from .kamereon import models
+from .kamereon.exceptions import QuotaLimitException
+from .renault_vehicle import RenaultVehicle
+from .request_scheduler import PRIORITY_BACKGROUND
+from .request_scheduler import request_priority
+
+_LOGGER = logging.getLogger(__name__)
+
+STATE_CHARGING = "charging"
+STATE_PRECONDITIONING = "preconditioning"
+STATE_PLUGGED = "plugged"
+STATE_IDLE = "idle"
+
+DEFAULT_POLL_INTERVALS: dict[str, float] = {  # seconds
+    STATE_CHARGING: 5 * 60,
+    STATE_PRECONDITIONING: 2 * 60,
+    STATE_PLUGGED: 15 * 60,
+    STATE_IDLE: 60 * 60,
+}
+CHARGE_END_MARGIN = 60.0  # seconds after the expected charge end
+SECONDS_PER_DAY = 24 * 3600
+
+DEFAULT_ACTION_RESERVE = 0.2  # share of the budget kept for user actions
+DEFAULT_ENDPOINT_PRIORITIES: dict[str, float] = {
+    "battery-status": 4,
+    "hvac-status": 2,
+}
+
+# Endpoints which follow the vehicle state, the others are polled as idle
+STATE_ENDPOINTS: dict[str, set[str]] = {
+    STATE_CHARGING: {"battery-status"},
+    STATE_PRECONDITIONING: {"battery-status", "hvac-status"},
+    STATE_PLUGGED: {"battery-status"},
+    STATE_IDLE: set(),
+}
+
+PollCallback = Callable[[RenaultVehicle, str, Any], None]
+
+
+@dataclass
+class _VehicleState:
+    """Latest known state of a vehicle, and its poll times."""
+
+    states: set[str] = field(default_factory=set)
+    charge_end: float | None = None
+    last_polls: dict[str, float] = field(default_factory=dict)
+
+
+class PollingScheduler:
+    """Schedule the polling of vehicle endpoints, based on the vehicle state."""
+
+    def __init__(self, intervals: dict[str, float] | None = None) -> None:
+        """Initialise the scheduler, with the poll interval per vehicle state."""
+        self._intervals = {**DEFAULT_POLL_INTERVALS, **(intervals or {})}
+        self._vehicles: dict[str, _VehicleState] = {}
+        self._min_intervals: dict[tuple[str, str], float] = {}
+
+    def _get_vehicle_state(self, vin: str) -> _VehicleState:
+        """Get the state of the vehicle, creating it if needed."""
+        return self._vehicles.setdefault(vin, _VehicleState())
+
+    def update_battery_status(
+        self,
+        vin: str,
+        battery_status: models.KamereonVehicleBatteryStatusData,
+        now: float | None = None,
+    ) -> None:
+        """Update the charging and plugged state from the battery status."""
+        now = time.monotonic() if now is None else now
+        vehicle_state = self._get_vehicle_state(vin)
+        vehicle_state.states.discard(STATE_CHARGING)
+        vehicle_state.states.discard(STATE_PLUGGED)
+        vehicle_state.charge_end = None
+        if battery_status.get_plug_status() == enums.PlugState.PLUGGED:
+            vehicle_state.states.add(STATE_PLUGGED)
+        if battery_status.get_charging_status() == enums.ChargeState.CHARGE_IN_PROGRESS:
+            vehicle_state.states.add(STATE_CHARGING)
+            if battery_status.chargingRemainingTime is not None:
+                # Remaining time is in minutes
+                vehicle_state.charge_end = (
+                    now + battery_status.chargingRemainingTime * 60
+                )
+
+    def update_hvac_status(
+        self, vin: str, hvac_status: models.KamereonVehicleHvacStatusData
+    ) -> None:
+        """Update the preconditioning state from the hvac status."""
+        vehicle_state = self._get_vehicle_state(vin)
+        if hvac_status.hvacStatus == "on":
+            vehicle_state.states.add(STATE_PRECONDITIONING)
+        else:
+            vehicle_state.states.discard(STATE_PRECONDITIONING)
+
+    def get_states(self, vin: str) -> set[str]:
+        """Get the active states of the vehicle (eg. charging and plugged)."""
+        return set(self._get_vehicle_state(vin).states) or {STATE_IDLE}
+
+    def set_min_interval(self, vin: str, endpoint: str, min_interval: float) -> None:
+        """Set the minimum poll interval of the endpoint, eg. from the budget."""
+        self._min_intervals[(vin, endpoint)] = min_interval
+
+    def get_fastest_interval(self, endpoint: str) -> float:
+        """Get the poll interval of the endpoint, in its fastest vehicle state."""
+        return min(
+            (
+                self._intervals[state]
+                for state, endpoints in STATE_ENDPOINTS.items()
+                if endpoint in endpoints
+            ),
+            default=self._intervals[STATE_IDLE],
+        )
+
+    def get_interval(self, vin: str, endpoint: str) -> float:
+        """Get the poll interval of the endpoint, for the vehicle state."""
+        interval = min(
+            (
+                self._intervals[state]
+                for state in self.get_states(vin)
+                if endpoint in STATE_ENDPOINTS[state]
+            ),
+            default=self._intervals[STATE_IDLE],
+        )
+        return max(interval, self._min_intervals.get((vin, endpoint), 0.0))
+
+    def get_next_poll(self, vin: str, endpoint: str) -> float:
+        """Get the monotonic time of the next poll of the endpoint."""
+        vehicle_state = self._get_vehicle_state(vin)
+        last_poll = vehicle_state.last_polls.get(endpoint)
+        if last_poll is None:
+            return float("-inf")
+        next_poll = last_poll + self.get_interval(vin, endpoint)
+        if (
+            vehicle_state.charge_end is not None
+            and endpoint in STATE_ENDPOINTS[STATE_CHARGING]
+        ):
+            # Check shortly after the expected charge end
+            charge_end_poll = vehicle_state.charge_end + CHARGE_END_MARGIN
+            if charge_end_poll > last_poll:
+                next_poll = min(next_poll, charge_end_poll)
+        return max(next_poll, last_poll + self._min_intervals.get((vin, endpoint), 0.0))
+
+    def set_polled(self, vin: str, endpoint: str, now: float | None = None) -> None:
+        """Record that the endpoint has just been polled."""
+        now = time.monotonic() if now is None else now
+        self._get_vehicle_state(vin).last_polls[endpoint] = now
+
+    def get_due(
+        self, vin: str, endpoints: Iterable[str], now: float | None = None
+    ) -> list[str]:
+        """Get the endpoints due for polling."""
+        now = time.monotonic() if now is None else now
+        return [
+            endpoint
+            for endpoint in endpoints
+            if self.get_next_poll(vin, endpoint) <= now
+        ]
+
+    async def poll(
+        self, vehicle: RenaultVehicle, endpoints: Iterable[str]
+    ) -> dict[str, Any]:
+        """Poll the endpoints due on the vehicle, and update its state.
+
+        The requests are sent with the background priority.
+
+        Returns:
+            The data of the endpoints successfully polled. Failed endpoints are
+            retried after their normal interval.
+
+        Raises:
+            InvalidInputError: an endpoint has no getter on the vehicle.
+            QuotaLimitException: the account quota is reached, so polling
+                should back off.
+        """
+        # Check all the endpoints before polling any of them
+        getters: dict[str, Callable[[], Awaitable[Any]]] = {}
+        for endpoint in endpoints:
+            getter = getattr(vehicle, f"get_{endpoint.replace('-', '_')}", None)
+            if getter is None:
+                raise InvalidInputError(f"No getter for `{endpoint}`.")
+            getters[endpoint] = getter
+        results: dict[str, Any] = {}
+        for endpoint in self.get_due(vehicle.vin, getters):
+            self.set_polled(vehicle.vin, endpoint)
+            try:
+                with request_priority(PRIORITY_BACKGROUND):
+                    data = await getters[endpoint]()
+            except QuotaLimitException:
+                raise
+            except Exception as exc:
+                _LOGGER.warning(
+                    "Poll of %s failed on %s: %s", endpoint, vehicle.vin, exc
+                )
+                continue
+            if isinstance(data, models.KamereonVehicleBatteryStatusData):
+                self.update_battery_status(vehicle.vin, data)
+            elif isinstance(data, models.KamereonVehicleHvacStatusData):
+                self.update_hvac_status(vehicle.vin, data)
+            results[endpoint] = data
+        return results
+
+    async def run(
+        self,
+        vehicles: Iterable[RenaultVehicle],
+        endpoints: Iterable[str],
+        callback: PollCallback,
+    ) -> None:
+        """Poll the endpoints of the vehicles as they become due, until cancelled.
+
+        Args:
+            vehicles: the vehicles to poll.
+            endpoints: the endpoints to poll, eg. `battery-status`.
+            callback: called with the vehicle, endpoint and data of each poll.
+
+        Raises:
+            InvalidInputError: an endpoint has no getter on the vehicle.
+            QuotaLimitException: the account quota is reached.
+        """
+        vehicles = list(vehicles)
+        endpoints = list(endpoints)
+        if not vehicles or not endpoints:
+            return
+        while True:
+            for vehicle in vehicles:
+                results = await self.poll(vehicle, endpoints)
+                for endpoint, data in results.items():
+                    callback(vehicle, endpoint, data)
+            next_poll = min(
+                self.get_next_poll(vehicle.vin, endpoint)
+                for vehicle in vehicles
+                for endpoint in endpoints
+            )
+            if next_poll == float("inf"):
+                # Nothing left in the budget
+                return
+            await asyncio.sleep(max(next_poll - time.monotonic(), 0))
+
+
+@dataclass
+class PollingAllocation:
+    """Share of the daily budget allocated to an endpoint of a vehicle."""
+
+    account_id: str
+    vin: str
+    endpoint: str
+    daily_requests: float
+
+    @property
+    def min_interval(self) -> float:
+        """Minimum poll interval to stay within the allocation, in seconds."""
+        if self.daily_requests <= 0:
+            return float("inf")
+        return SECONDS_PER_DAY / self.daily_requests
+
+
+def plan_polling_budget(
+    scheduler: PollingScheduler,
+    vehicles: Iterable[RenaultVehicle],
+    endpoints: Iterable[str],
+    daily_budget: float,
+    *,
+    priorities: Mapping[str, float] | None = None,
+    reserve: float = DEFAULT_ACTION_RESERVE,
+) -> list[PollingAllocation]:
+    """Share the daily request budget of each account, and apply it to the scheduler.
+
+    The budget left after the reserve is shared across the vehicles and
+    endpoints of each account, in proportion to the endpoint priorities. An
+    endpoint never gets more than it can use at its fastest poll interval, and
+    the surplus goes to the others.
+
+    Args:
+        scheduler: the scheduler to set the minimum poll intervals on.
+        vehicles: the vehicles to poll.
+        endpoints: the endpoints to poll, eg. `battery-status`.
+        daily_budget: maximum number of requests per account and per day.
+        priorities: the weight of each endpoint, defaulting to 1 for endpoints
+            not in `DEFAULT_ENDPOINT_PRIORITIES`.
+        reserve: share of the budget kept for user-initiated actions.
+
+    Returns:
+        The allocation of each endpoint of each vehicle.
+    """
+    if daily_budget <= 0:
+        raise ValueError("`daily_budget` must be positive")
+    if not 0 <= reserve < 1:
+        raise ValueError("`reserve` must be between 0 and 1")
+    priorities = {**DEFAULT_ENDPOINT_PRIORITIES, **(priorities or {})}
+    endpoints = list(endpoints)
+
+    accounts: dict[str, list[str]] = {}
+    for vehicle in vehicles:
+        accounts.setdefault(vehicle.account_id, []).append(vehicle.vin)
+
+    allocations: list[PollingAllocation] = []
+    for account_id, vins in accounts.items():
+        keys = [(vin, endpoint) for vin in vins for endpoint in endpoints]
+        daily_requests = dict.fromkeys(keys, 0.0)
+        # Endpoints with a zero priority are not polled again
+        pending = {
+            key: priorities.get(key[1], 1.0)
+            for key in keys
+            if priorities.get(key[1], 1.0) > 0
+        }
+        max_requests = {
+            key: SECONDS_PER_DAY / scheduler.get_fastest_interval(key[1])
+            for key in pending
+        }
+        remaining = daily_budget * (1 - reserve)
+        while pending:
+            total_priority = sum(pending.values())
+            # Cap the endpoints which cannot use their share, and share again
+            capped = [
+                key
+                for key, priority in pending.items()
+                if remaining * priority / total_priority >= max_requests[key]
+            ]
+            if not capped:
+                for key, priority in pending.items():
+                    daily_requests[key] = remaining * priority / total_priority
+                break
+            for key in capped:
+                daily_requests[key] = max_requests[key]
+                remaining -= max_requests[key]
+                del pending[key]
+
+        for (vin, endpoint), requests in daily_requests.items():
+            allocation = PollingAllocation(account_id, vin, endpoint, requests)
+            scheduler.set_min_interval(vin, endpoint, allocation.min_interval)
+            allocations.append(allocation)
+    return allocations
@@ -1,17 +1,23 @@
 """Client for Renault API."""
 
 import logging
+import time
 
 import aiohttp
 
+from .action_queue import ActionQueue
 from .credential_store import CredentialStore
+from .data_cache import DataCache
 from .exceptions import RenaultException
 from .kamereon import models
+from .kamereon import schemas
 from .renault_session import RenaultSession
 from .renault_vehicle import RenaultVehicle
 
 _LOGGER = logging.getLogger(__name__)
 
+DEFAULT_VEHICLES_TTL = 3600  # seconds between refreshes of the vehicle registry
+
 
 class RenaultAccount:
     """Proxy to a Renault account."""
@@ -25,9 +31,17 @@ class RenaultAccount:
         country: str | None = None,
         locale_details: dict[str, str] | None = None,
         credential_store: CredentialStore | None = None,
+        data_cache: DataCache | None = None,
+        action_queue: ActionQueue | None = None,
+        vehicles_ttl: float = DEFAULT_VEHICLES_TTL,
     ) -> None:
         """Initialise Renault account."""
         self._account_id = account_id
+        self._data_cache = data_cache
+        self._action_queue = action_queue
+        self._vehicles_ttl = vehicles_ttl
+        self._api_vehicles: dict[str, RenaultVehicle] | None = None
+        self._api_vehicles_expiry = 0.0
 
         if session:
             self._session = session
@@ -60,25 +74,83 @@ class RenaultAccount:
             self.account_id,
         )
 
-    async def get_api_vehicles(self) -> list[RenaultVehicle]:
-        """Get vehicle proxies."""
-        response = await self.get_vehicles()
+    async def _refresh_api_vehicles(
+        self, *, force_refresh: bool = False
+    ) -> dict[str, RenaultVehicle]:
+        """Refresh the vehicle registry from a single GET to /vehicles."""
+        response: models.KamereonVehiclesResponse
+        if self._data_cache is None:
+            response = await self.get_vehicles()
+        elif force_refresh:
+            response = await self.get_vehicles()
+            self._data_cache[f"accounts/{self.account_id}/vehicles"] = response.raw_data
+        else:
+            response = await self._data_cache.get_response(
+                f"accounts/{self.account_id}/vehicles",
+                schemas.KamereonVehiclesResponseSchema,
+                self.get_vehicles,
+                # Pick up added or removed vehicles at each registry refresh
+                refresh_interval=self._vehicles_ttl,
+            )
         if response.vehicleLinks is None:
             raise ValueError("response.accounts is None")
-        result: list[RenaultVehicle] = []
+        previous = self._api_vehicles or {}
+        api_vehicles: dict[str, RenaultVehicle] = {}
         for vehicle in response.vehicleLinks:
             if vehicle.vin is None:
                 continue
-            result.append(
-                RenaultVehicle(
+            api_vehicle = previous.get(vehicle.vin)
+            if api_vehicle is None:
+                api_vehicle = RenaultVehicle(
                     account_id=self.account_id,
                     vin=vehicle.vin,
                     session=self.session,
                     vehicle_details=vehicle.vehicleDetails,
+                    data_cache=self._data_cache,
+                    action_queue=self._action_queue,
                 )
-            )
-        return result
+            elif vehicle.vehicleDetails is not None:
+                # Keep existing proxies, so that their cached data is preserved,
+                # but not their outdated details
+                api_vehicle.set_vehicle_details(vehicle.vehicleDetails)
+            api_vehicles[vehicle.vin] = api_vehicle
+        self._api_vehicles = api_vehicles
+        self._api_vehicles_expiry = time.monotonic() + self._vehicles_ttl
+        return api_vehicles
+
+    async def _get_api_vehicles(
+        self, *, force_refresh: bool = False
+    ) -> dict[str, RenaultVehicle]:
+        """Get the vehicle registry, loading it on first use or once expired."""
+        if (
+            self._api_vehicles is None
+            or force_refresh
+            or time.monotonic() >= self._api_vehicles_expiry
+        ):
+            return await self._refresh_api_vehicles(force_refresh=force_refresh)
+        return self._api_vehicles
+
+    async def get_api_vehicles(
+        self, *, force_refresh: bool = False
+    ) -> list[RenaultVehicle]:
+        """Get vehicle proxies."""
+        api_vehicles = await self._get_api_vehicles(force_refresh=force_refresh)
+        return list(api_vehicles.values())
 
     async def get_api_vehicle(self, vin: str) -> RenaultVehicle:
-        """Get vehicle proxy for specified vin."""
-        return RenaultVehicle(account_id=self.account_id, vin=vin, session=self.session)
+        """Get vehicle proxy for specified vin.
+
+        The proxy is served from the vehicle registry, loaded on first use,
+        with the vehicle details already available. A vin missing from the
+        registry gets a standalone proxy.
+        """
+        api_vehicles = await self._get_api_vehicles()
+        if vin in api_vehicles:
+            return api_vehicles[vin]
+        return RenaultVehicle(
+            account_id=self.account_id,
+            vin=vin,
+            session=self.session,
+            data_cache=self._data_cache,
+            action_queue=self._action_queue,
+        )
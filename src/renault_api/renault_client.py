@@ -4,9 +4,12 @@ import logging
 
 import aiohttp
 
+from .action_queue import ActionQueue
 from .credential_store import CredentialStore
+from .data_cache import DataCache
 from .exceptions import RenaultException
 from .kamereon import models
+from .kamereon import schemas
 from .renault_account import RenaultAccount
 from .renault_session import RenaultSession
 
@@ -24,8 +27,12 @@ class RenaultClient:
         country: str | None = None,
         locale_details: dict[str, str] | None = None,
         credential_store: CredentialStore | None = None,
+        data_cache: DataCache | None = None,
+        action_queue: ActionQueue | None = None,
     ) -> None:
         """Initialise Renault client."""
+        self._data_cache = data_cache
+        self._action_queue = action_queue
         if session:
             self._session = session
         else:
@@ -51,8 +58,21 @@ class RenaultClient:
         return await self.session.get_person()
 
     async def get_api_accounts(self) -> list[RenaultAccount]:
-        """Get account proxies."""
-        response = await self.get_person()
+        """Get account proxies.
+
+        If a data cache is available, the account list is served from it on
+        warm starts, and refreshed in the background.
+        """
+        response: models.KamereonPersonResponse
+        if self._data_cache is None:
+            response = await self.get_person()
+        else:
+            person_id = await self.session.get_person_id()
+            response = await self._data_cache.get_response(
+                f"persons/{person_id}",
+                schemas.KamereonPersonResponseSchema,
+                self.get_person,
+            )
         if response.accounts is None:
             raise ValueError("response.accounts is None")
         result: list[RenaultAccount] = []
@@ -60,10 +80,20 @@ class RenaultClient:
             if account.accountId is None:
                 continue
             result.append(
-                RenaultAccount(account_id=account.accountId, session=self.session)
+                RenaultAccount(
+                    account_id=account.accountId,
+                    session=self.session,
+                    data_cache=self._data_cache,
+                    action_queue=self._action_queue,
+                )
             )
         return result
 
     async def get_api_account(self, account_id: str) -> RenaultAccount:
         """Get account proxy for specified account id."""
-        return RenaultAccount(account_id=account_id, session=self.session)
+        return RenaultAccount(
+            account_id=account_id,
+            session=self.session,
+            data_cache=self._data_cache,
+            action_queue=self._action_queue,
+        )
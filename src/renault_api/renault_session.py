@@ -2,13 +2,20 @@
 
 import asyncio
 import logging
+import time
+from collections.abc import Awaitable
+from collections.abc import Callable
+from functools import partial
 from typing import Any
+from typing import TypeVar
 
 import aiohttp
 from marshmallow.schema import Schema
+from yarl import URL
 
 from . import gigya
 from . import kamereon
+from .circuit_breaker import CircuitBreaker
 from .const import CONF_COUNTRY
 from .const import CONF_GIGYA_APIKEY
 from .const import CONF_GIGYA_URL
@@ -18,14 +25,30 @@ from .const import CONF_LOCALE
 from .credential import Credential
 from .credential import JWTCredential
 from .credential_store import CredentialStore
+from .events import EVENT_AFTER_RESPONSE
+from .events import EVENT_AUTH_REFRESH
+from .events import EVENT_BEFORE_REQUEST
+from .events import EVENT_ON_ERROR
+from .events import EVENT_TYPES
+from .events import SessionEvent
+from .events import SessionEventListener
+from .exceptions import CircuitOpenError
 from .exceptions import NotAuthenticatedException
 from .exceptions import RenaultException
 from .gigya.exceptions import GigyaResponseException
 from .kamereon import models
+from .request_scheduler import RequestScheduler
+from .request_scheduler import get_request_priority
+from .tracing import start_span
 from renault_api.helpers import get_api_keys
 
 _LOGGER = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+
+# Span covering the credentials resolved from Renault servers, on cache miss
+CREDENTIAL_SPAN = "RenaultSession.resolve_credential"
+
 
 class RenaultSession:
     """Renault session for interaction with Renault servers."""
@@ -37,11 +60,19 @@ class RenaultSession:
         country: str | None = None,
         locale_details: dict[str, str] | None = None,
         credential_store: CredentialStore | None = None,
+        *,
+        circuit_breaker: CircuitBreaker | None = None,
+        request_scheduler: RequestScheduler | None = None,
     ) -> None:
         """Initialise RenaultSession."""
         self._gigya_lock = asyncio.Lock()
         self._websession = websession
+        self._circuit_breaker = circuit_breaker
+        self._request_scheduler = request_scheduler
         self._credentials: CredentialStore = credential_store or CredentialStore()
+        self._listeners: dict[str, list[SessionEventListener]] = {
+            event_type: [] for event_type in EVENT_TYPES
+        }
 
         if locale_details:
             for k, v in locale_details.items():
@@ -51,6 +82,127 @@ class RenaultSession:
         if country:
             self._credentials[CONF_COUNTRY] = Credential(country)
 
+    @property
+    def circuit_breaker(self) -> CircuitBreaker | None:
+        """Get the circuit breaker, if any."""
+        return self._circuit_breaker
+
+    @property
+    def request_scheduler(self) -> RequestScheduler | None:
+        """Get the request scheduler, if any."""
+        return self._request_scheduler
+
+    def add_listener(
+        self, event_type: str, listener: SessionEventListener
+    ) -> Callable[[], None]:
+        """Register a listener for session events.
+
+        Returns a callable that removes the listener.
+        """
+        if event_type not in self._listeners:
+            raise ValueError(f"Unknown event type `{event_type}`.")
+        self._listeners[event_type].append(listener)
+        return lambda: self._listeners[event_type].remove(listener)
+
+    def _dispatch(self, event: SessionEvent) -> None:
+        """Dispatch event to the registered listeners."""
+        for listener in self._listeners[event.event_type]:
+            try:
+                listener(event)
+            except Exception:
+                _LOGGER.exception("Error in %s listener", event.event_type)
+
+    async def _instrument(
+        self,
+        method: str,
+        endpoint: str,
+        vin: str | None,
+        request: Callable[..., Awaitable[_T]],
+        *,
+        kamereon_request: bool = True,
+        event_type: str = EVENT_AFTER_RESPONSE,
+    ) -> _T:
+        """Send the request, dispatching events to the listeners.
+
+        Kamereon requests wait for a slot of the request scheduler, by priority,
+        if a request scheduler is set, and only then resolve the JWT which is
+        passed to `request` as `gigya_jwt`.
+        """
+        request_scheduler = self._request_scheduler if kamereon_request else None
+        if request_scheduler is not None:
+            await request_scheduler.acquire(get_request_priority(method))
+        try:
+            if kamereon_request:
+                request = partial(request, gigya_jwt=await self._get_jwt())
+            return await self._send(
+                method,
+                endpoint,
+                vin,
+                request,
+                kamereon_request=kamereon_request,
+                event_type=event_type,
+            )
+        finally:
+            if request_scheduler is not None:
+                request_scheduler.release()
+
+    async def _send(
+        self,
+        method: str,
+        endpoint: str,
+        vin: str | None,
+        request: Callable[[], Awaitable[_T]],
+        *,
+        kamereon_request: bool,
+        event_type: str,
+    ) -> _T:
+        """Send the request, dispatching events to the listeners.
+
+        Kamereon requests go through the circuits of the host and of the endpoint,
+        if a circuit breaker is set.
+        """
+        circuit_breaker = self._circuit_breaker if kamereon_request else None
+        circuits: list[str] = []
+        if circuit_breaker is not None:
+            host = URL(await self._get_kamereon_root_url()).host or ""
+            circuits = [host, f"{host}/{endpoint}"]
+            try:
+                circuit_breaker.acquire(circuits)
+            except CircuitOpenError as err:
+                # The request was never sent, so it has no duration
+                self._dispatch(
+                    SessionEvent(EVENT_ON_ERROR, method, endpoint, vin, None, err)
+                )
+                raise
+        self._dispatch(SessionEvent(EVENT_BEFORE_REQUEST, method, endpoint, vin))
+        start = time.monotonic()
+        try:
+            result = await request()
+        except asyncio.CancelledError as err:
+            if circuit_breaker is not None:
+                circuit_breaker.release(circuits, err)
+            raise
+        except Exception as err:
+            if circuit_breaker is not None:
+                circuit_breaker.release(circuits, err)
+            self._dispatch(
+                SessionEvent(
+                    EVENT_ON_ERROR,
+                    method,
+                    endpoint,
+                    vin,
+                    time.monotonic() - start,
+                    err,
+                )
+            )
+            raise
+        if circuit_breaker is not None:
+            circuit_breaker.release(circuits, None)
+        self._dispatch(
+            SessionEvent(event_type, method, endpoint, vin, time.monotonic() - start)
+        )
+        return result
+
     async def login(self, login_id: str, password: str) -> None:
         """Attempt login on Gigya."""
         self._credentials.clear_keys(gigya.GIGYA_KEYS)
@@ -89,7 +241,8 @@ class RenaultSession:
         """Get specified credential, or raise RenaultException."""
         if key not in self._credentials:
             if CONF_LOCALE in self._credentials:
-                await self._update_from_locale()
+                with start_span(CREDENTIAL_SPAN, {"renault_api.credential": key}):
+                    await self._update_from_locale()
 
         value = self._credentials.get_value(key)
         if value:
@@ -139,39 +292,60 @@ class RenaultSession:
             person_id = self._credentials.get_value(gigya.GIGYA_PERSON_ID)
             if person_id:
                 return person_id
-            login_token = await self._get_login_token()
-            response = await gigya.get_account_info(
-                self._websession,
-                await self._get_gigya_root_url(),
-                await self._get_gigya_api_key(),
-                login_token,
-            )
+            with start_span(
+                CREDENTIAL_SPAN, {"renault_api.credential": gigya.GIGYA_PERSON_ID}
+            ):
+                login_token = await self._get_login_token()
+                response = await gigya.get_account_info(
+                    self._websession,
+                    await self._get_gigya_root_url(),
+                    await self._get_gigya_api_key(),
+                    login_token,
+                )
             person_id = response.get_person_id()
             self._credentials[gigya.GIGYA_PERSON_ID] = Credential(person_id)
             return person_id
 
+    async def get_person_id(self) -> str:
+        """Get Gigya person id, from credential store or from Gigya."""
+        return await self._get_person_id()
+
     async def _get_jwt(self) -> str:
         """Get json web token from credential store or from Gigya.."""
         async with self._gigya_lock:
             jwt = self._credentials.get_value(gigya.GIGYA_JWT)
             if jwt:
                 return jwt
-            login_token = await self._get_login_token()
-            try:
-                response = await gigya.get_jwt(
+            with start_span(
+                CREDENTIAL_SPAN, {"renault_api.credential": gigya.GIGYA_JWT}
+            ):
+                return await self._refresh_jwt()
+
+    async def _refresh_jwt(self) -> str:
+        """Get a new json web token from Gigya."""
+        login_token = await self._get_login_token()
+        try:
+            response = await self._instrument(
+                "POST",
+                "accounts.getJWT",
+                None,
+                partial(
+                    gigya.get_jwt,
                     self._websession,
                     await self._get_gigya_root_url(),
                     await self._get_gigya_api_key(),
                     login_token,
-                )
-            except GigyaResponseException as exc:
-                if exc.error_code in [403005, 403013]:
-                    self._credentials.clear_keys(gigya.GIGYA_KEYS)
-                raise NotAuthenticatedException("Authentication expired.") from exc
-            else:
-                jwt = response.get_jwt()
-                self._credentials[gigya.GIGYA_JWT] = JWTCredential(jwt)
-                return jwt
+                ),
+                kamereon_request=False,
+                event_type=EVENT_AUTH_REFRESH,
+            )
+        except GigyaResponseException as exc:
+            if exc.error_code in [403005, 403013]:
+                self._credentials.clear_keys(gigya.GIGYA_KEYS)
+            raise NotAuthenticatedException("Authentication expired.") from exc
+        jwt = response.get_jwt()
+        self._credentials[gigya.GIGYA_JWT] = JWTCredential(jwt)
+        return jwt
 
     async def http_request(
         self,
@@ -180,57 +354,82 @@ class RenaultSession:
         json: dict[str, Any] | None = None,
         *,
         schema: Schema | None = None,
+        endpoint_name: str | None = None,
+        vin: str | None = None,
     ) -> models.KamereonResponse:
-        """GET to specified endpoint."""
+        """GET to specified endpoint.
+
+        `endpoint_name` and `vin` are only used to label instrumentation events.
+        """
         url = (await self._get_kamereon_root_url()) + endpoint
         params = {"country": await self._get_country()}
-        return await kamereon.request(
-            websession=self._websession,
-            method=method,
-            url=url,
-            api_key=await self._get_kamereon_api_key(),
-            gigya_jwt=await self._get_jwt(),
-            params=params,
-            json=json,
-            schema=schema,
+        return await self._instrument(
+            method,
+            endpoint_name or endpoint,
+            vin,
+            partial(
+                kamereon.request,
+                websession=self._websession,
+                method=method,
+                url=url,
+                api_key=await self._get_kamereon_api_key(),
+                params=params,
+                json=json,
+                schema=schema,
+            ),
         )
 
     async def get_person(self) -> models.KamereonPersonResponse:
         """GET to /persons/{person_id}."""
-        return await kamereon.get_person(
-            websession=self._websession,
-            root_url=await self._get_kamereon_root_url(),
-            api_key=await self._get_kamereon_api_key(),
-            gigya_jwt=await self._get_jwt(),
-            country=await self._get_country(),
-            person_id=await self._get_person_id(),
+        return await self._instrument(
+            "GET",
+            "person",
+            None,
+            partial(
+                kamereon.get_person,
+                websession=self._websession,
+                root_url=await self._get_kamereon_root_url(),
+                api_key=await self._get_kamereon_api_key(),
+                country=await self._get_country(),
+                person_id=await self._get_person_id(),
+            ),
         )
 
     async def get_account_vehicles(
         self, account_id: str
     ) -> models.KamereonVehiclesResponse:
         """GET to /accounts/{account_id}/vehicles."""
-        return await kamereon.get_account_vehicles(
-            websession=self._websession,
-            root_url=await self._get_kamereon_root_url(),
-            api_key=await self._get_kamereon_api_key(),
-            gigya_jwt=await self._get_jwt(),
-            country=await self._get_country(),
-            account_id=account_id,
+        return await self._instrument(
+            "GET",
+            "vehicles",
+            None,
+            partial(
+                kamereon.get_account_vehicles,
+                websession=self._websession,
+                root_url=await self._get_kamereon_root_url(),
+                api_key=await self._get_kamereon_api_key(),
+                country=await self._get_country(),
+                account_id=account_id,
+            ),
         )
 
     async def get_vehicle_details(
         self, account_id: str, vin: str
     ) -> models.KamereonVehicleDetailsResponse:
         """GET to /accounts/{account_id}/vehicles/{vin}/details."""
-        return await kamereon.get_vehicle_details(
-            websession=self._websession,
-            root_url=await self._get_kamereon_root_url(),
-            api_key=await self._get_kamereon_api_key(),
-            gigya_jwt=await self._get_jwt(),
-            country=await self._get_country(),
-            account_id=account_id,
-            vin=vin,
+        return await self._instrument(
+            "GET",
+            "details",
+            vin,
+            partial(
+                kamereon.get_vehicle_details,
+                websession=self._websession,
+                root_url=await self._get_kamereon_root_url(),
+                api_key=await self._get_kamereon_api_key(),
+                country=await self._get_country(),
+                account_id=account_id,
+                vin=vin,
+            ),
         )
 
     async def get_vehicle_data(
@@ -243,17 +442,22 @@ class RenaultSession:
         adapter_type: str = "kca",
     ) -> models.KamereonVehicleDataResponse:
         """GET to /v{endpoint_version}/cars/{vin}/{endpoint}."""
-        return await kamereon.get_vehicle_data(
-            websession=self._websession,
-            root_url=await self._get_kamereon_root_url(),
-            api_key=await self._get_kamereon_api_key(),
-            gigya_jwt=await self._get_jwt(),
-            country=await self._get_country(),
-            account_id=account_id,
-            vin=vin,
-            endpoint=endpoint,
-            params=params,
-            adapter_type=adapter_type,
+        return await self._instrument(
+            "GET",
+            endpoint,
+            vin,
+            partial(
+                kamereon.get_vehicle_data,
+                websession=self._websession,
+                root_url=await self._get_kamereon_root_url(),
+                api_key=await self._get_kamereon_api_key(),
+                country=await self._get_country(),
+                account_id=account_id,
+                vin=vin,
+                endpoint=endpoint,
+                params=params,
+                adapter_type=adapter_type,
+            ),
         )
 
     async def get_vehicle_contracts(
@@ -262,15 +466,20 @@ class RenaultSession:
         vin: str,
     ) -> models.KamereonVehicleContractsResponse:
         """GET to /v{endpoint_version}/cars/{vin}/contracts."""
-        return await kamereon.get_vehicle_contracts(
-            websession=self._websession,
-            root_url=await self._get_kamereon_root_url(),
-            api_key=await self._get_kamereon_api_key(),
-            gigya_jwt=await self._get_jwt(),
-            country=await self._get_country(),
-            account_id=account_id,
-            vin=vin,
-            locale=await self._get_credential(CONF_LOCALE),
+        return await self._instrument(
+            "GET",
+            "contracts",
+            vin,
+            partial(
+                kamereon.get_vehicle_contracts,
+                websession=self._websession,
+                root_url=await self._get_kamereon_root_url(),
+                api_key=await self._get_kamereon_api_key(),
+                country=await self._get_country(),
+                account_id=account_id,
+                vin=vin,
+                locale=await self._get_credential(CONF_LOCALE),
+            ),
         )
 
     async def set_vehicle_action(
@@ -283,15 +492,20 @@ class RenaultSession:
         adapter_type: str = "kca",
     ) -> models.KamereonVehicleDataResponse:
         """POST to /v{endpoint_version}/cars/{vin}/{endpoint}."""
-        return await kamereon.set_vehicle_action(
-            websession=self._websession,
-            root_url=await self._get_kamereon_root_url(),
-            api_key=await self._get_kamereon_api_key(),
-            gigya_jwt=await self._get_jwt(),
-            country=await self._get_country(),
-            account_id=account_id,
-            vin=vin,
-            endpoint=endpoint,
-            attributes=attributes,
-            adapter_type=adapter_type,
+        return await self._instrument(
+            "POST",
+            endpoint,
+            vin,
+            partial(
+                kamereon.set_vehicle_action,
+                websession=self._websession,
+                root_url=await self._get_kamereon_root_url(),
+                api_key=await self._get_kamereon_api_key(),
+                country=await self._get_country(),
+                account_id=account_id,
+                vin=vin,
+                endpoint=endpoint,
+                attributes=attributes,
+                adapter_type=adapter_type,
+            ),
         )
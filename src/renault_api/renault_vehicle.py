@@ -1,5 +1,11 @@
 """Client for Renault API."""
 
+import asyncio
+import copy
+import logging
+import time
+from collections.abc import Collection
+from dataclasses import asdict
 from datetime import datetime
 from datetime import timezone
 from typing import Any
@@ -7,18 +13,51 @@ from typing import cast
 
 import aiohttp
 
+from . import effects
+from .action_queue import ActionQueue
 from .credential_store import CredentialStore
+from .data_cache import DataCache
+from .exceptions import EffectTimeoutError
 from .exceptions import EndpointNotAvailableError
+from .exceptions import InvalidInputError
 from .exceptions import RenaultException
 from .kamereon import ACCOUNT_ENDPOINT_ROOT
+from .kamereon import exceptions as kamereon_exceptions
 from .kamereon import models
 from .kamereon import schemas
 from .renault_session import RenaultSession
+from .request_scheduler import PRIORITY_BACKFILL
+from .request_scheduler import request_priority
+from .tracing import traced
+
+_LOGGER = logging.getLogger(__name__)
 
 PERIOD_DAY_FORMAT = "%Y%m%d"
 PERIOD_MONTH_FORMAT = "%Y%m"
 PERIOD_TZ_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
 PERIOD_FORMATS = {"day": PERIOD_DAY_FORMAT, "month": PERIOD_MONTH_FORMAT}
+KCM_SETTINGS_ENDPOINT = "ev-settings"
+KCM_SETTINGS_TTL = 60.0  # seconds
+SCHEDULES_TTL = 60.0  # seconds
+UNAVAILABLE_ENDPOINT_TTL = 24 * 3600  # seconds
+DEFAULT_PROBE_CONCURRENCY = 4
+
+# Errors showing that the endpoint is not available for the vehicle
+_UNAVAILABLE_ENDPOINT_EXCEPTIONS = (
+    kamereon_exceptions.NotSupportedException,
+    kamereon_exceptions.ResourceNotFoundException,
+    kamereon_exceptions.ForbiddenException,
+)
+
+
+def _get_schedules_json(
+    schedules: list[models.ChargeSchedule] | list[models.HvacSchedule] | None,
+) -> list[dict[str, Any]]:
+    """Get the schedules as json, sorted by id for comparison."""
+    return sorted(
+        (schedule.for_json() for schedule in schedules or []),
+        key=lambda schedule: (schedule["id"] is None, schedule["id"] or 0),
+    )
 
 
 class RenaultVehicle:
@@ -37,13 +76,23 @@ class RenaultVehicle:
         credential_store: CredentialStore | None = None,
         vehicle_details: models.KamereonVehicleDetails | None = None,
         car_adapter: models.KamereonVehicleCarAdapterData | None = None,
+        data_cache: DataCache | None = None,
+        action_queue: ActionQueue | None = None,
     ) -> None:
         """Initialise Renault vehicle."""
         self._account_id = account_id
         self._vin = vin
+        self._data_cache = data_cache
+        self._action_queue = action_queue
         self._vehicle_details = vehicle_details
         self._car_adapter = car_adapter
         self._contracts: list[models.KamereonVehicleContract] | None = None
+        self._endpoint_definitions: dict[str, models.EndpointDefinition | None] = {}
+        self._resolved_urls: dict[str, str] = {}
+        self._kcm_settings: tuple[float, dict[str, Any]] | None = None
+        self._schedules: dict[str, tuple[float, list[dict[str, Any]]]] = {}
+        self._unavailable_endpoints: dict[str, float] | None = None
+        self._capabilities: dict[str, models.EndpointDefinition] = {}
 
         if session:
             self._session = session
@@ -75,6 +124,13 @@ class RenaultVehicle:
         """Get vin."""
         return self._vin
 
+    def set_vehicle_details(
+        self, vehicle_details: models.KamereonVehicleDetails
+    ) -> None:
+        """Replace the vehicle details, and the endpoints resolved from them."""
+        self._vehicle_details = vehicle_details
+        self._endpoint_definitions.clear()
+
     def _convert_variables(self, endpoint: str) -> str:
         """Replace account_id / vin"""
         return endpoint.replace("{account_id}", self.account_id).replace(
@@ -93,6 +149,16 @@ class RenaultVehicle:
         endpoint = self._convert_variables(endpoint)
         return await self.session.http_request("POST", endpoint, json)
 
+    def _resolve_url(self, endpoint_definition: models.EndpointDefinition) -> str:
+        """Get the account / vin substituted url for the endpoint definition."""
+        url = self._resolved_urls.get(endpoint_definition.endpoint)
+        if url is None:
+            url = self._convert_variables(
+                ACCOUNT_ENDPOINT_ROOT + endpoint_definition.endpoint
+            )
+            self._resolved_urls[endpoint_definition.endpoint] = url
+        return url
+
     async def get_full_endpoint(self, endpoint: str) -> str:
         """From VEHICLE_ENDPOINTS / DEFAULT_ENDPOINT."""
         endpoint_definition = await self.get_endpoint_definition(endpoint)
@@ -101,21 +167,47 @@ class RenaultVehicle:
     async def get_endpoint_definition(self, endpoint: str) -> models.EndpointDefinition:
         """From VEHICLE_ENDPOINTS / DEFAULT_ENDPOINT."""
         details = await self.get_details()
-        full_endpoint = details.get_endpoint(endpoint)
+        if endpoint not in self._endpoint_definitions:
+            # Resolve once per vehicle, to skip model lookups on later calls
+            capabilities = self._get_capabilities(details.get_model_code())
+            if endpoint in capabilities:
+                self._endpoint_definitions[endpoint] = capabilities[endpoint]
+            else:
+                self._endpoint_definitions[endpoint] = details.get_endpoint(endpoint)
+        full_endpoint = self._endpoint_definitions[endpoint]
         if full_endpoint is None:
             raise EndpointNotAvailableError(endpoint, details.get_model_code())
 
         return full_endpoint
 
     async def _get_vehicle_data(
-        self, endpoint: str | models.EndpointDefinition
+        self,
+        endpoint: str,
+        endpoint_definition: models.EndpointDefinition | None = None,
     ) -> models.KamereonVehicleDataResponse:
-        """GET to /v{endpoint_version}/cars/{vin}/{endpoint}."""
-        if isinstance(endpoint, models.EndpointDefinition):
-            full_endpoint = ACCOUNT_ENDPOINT_ROOT + endpoint.endpoint
-        else:
-            full_endpoint = await self.get_full_endpoint(endpoint)
-        response = await self.http_get(full_endpoint)
+        """GET to /v{endpoint_version}/cars/{vin}/{endpoint}.
+
+        The endpoint name labels the request, and keys the unavailable endpoints:
+        it is resolved to its definition, unless the definition is provided.
+        """
+        if self._is_endpoint_unavailable(endpoint):
+            details = await self.get_details()
+            raise EndpointNotAvailableError(endpoint, details.get_model_code())
+        if endpoint_definition is None:
+            endpoint_definition = await self.get_endpoint_definition(endpoint)
+        try:
+            response = await self.session.http_request(
+                "GET",
+                self._resolve_url(endpoint_definition),
+                endpoint_name=endpoint,
+                vin=self.vin,
+            )
+        except _UNAVAILABLE_ENDPOINT_EXCEPTIONS as exc:
+            _LOGGER.debug(
+                "Endpoint %s not available on %s: %s", endpoint, self.vin, exc
+            )
+            self._update_unavailable_endpoints([endpoint])
+            raise
         return cast(
             models.KamereonVehicleDataResponse,
             schemas.KamereonVehicleDataResponseSchema.load(response.raw_data),
@@ -123,25 +215,254 @@ class RenaultVehicle:
 
     async def _set_vehicle_data(
         self,
-        endpoint: str | models.EndpointDefinition,
+        endpoint: str,
         json: dict[str, Any] | None,
+        endpoint_definition: models.EndpointDefinition | None = None,
     ) -> models.KamereonVehicleDataResponse:
-        """GET to /v{endpoint_version}/cars/{vin}/{endpoint}."""
-        if isinstance(endpoint, models.EndpointDefinition):
-            full_endpoint = ACCOUNT_ENDPOINT_ROOT + endpoint.endpoint
+        """POST to /v{endpoint_version}/cars/{vin}/{endpoint}."""
+        if endpoint_definition is None:
+            endpoint_definition = await self.get_endpoint_definition(endpoint)
+        url = self._resolve_url(endpoint_definition)
+
+        async def _post() -> models.KamereonResponse:
+            return await self.session.http_request(
+                "POST", url, json, endpoint_name=endpoint, vin=self.vin
+            )
+
+        if self._action_queue is None:
+            response = await _post()
         else:
-            full_endpoint = await self.get_full_endpoint(endpoint)
-        response = await self.http_post(full_endpoint, json)
+            response = await self._action_queue.submit(
+                self.vin, self._action_queue.get_kind(endpoint), _post
+            )
         return cast(
             models.KamereonVehicleDataResponse,
             schemas.KamereonVehicleDataResponseSchema.load(response.raw_data),
         )
 
+    def _get_unavailable_endpoints(self) -> dict[str, float]:
+        """Get the expiry of the endpoints learned to be unavailable."""
+        if self._unavailable_endpoints is None:
+            self._unavailable_endpoints = dict(
+                self._get_cached_data("unavailable-endpoints") or {}
+            )
+        return self._unavailable_endpoints
+
+    def _is_endpoint_unavailable(self, endpoint: str) -> bool:
+        """Check if the endpoint was recently learned to be unavailable."""
+        expiry = self._get_unavailable_endpoints().get(endpoint)
+        return expiry is not None and expiry > time.time()
+
+    def _update_unavailable_endpoints(
+        self, unavailable: Collection[str], available: Collection[str] = ()
+    ) -> None:
+        """Remember the endpoints found unavailable until expiry, or available."""
+        now = time.time()
+        unavailable_endpoints = {
+            name: expiry
+            for name, expiry in self._get_unavailable_endpoints().items()
+            if expiry > now and name not in available
+        }
+        for endpoint in unavailable:
+            unavailable_endpoints[endpoint] = now + UNAVAILABLE_ENDPOINT_TTL
+        self._unavailable_endpoints = unavailable_endpoints
+        self._set_cached_data("unavailable-endpoints", unavailable_endpoints)
+
+    def reset_unavailable_endpoints(self) -> None:
+        """Forget the endpoints learned to be unavailable."""
+        self._unavailable_endpoints = {}
+        self._set_cached_data("unavailable-endpoints", {})
+
+    def _get_capabilities_key(self, model_code: str | None) -> str:
+        """Get the data cache key of the capability map, shared per model."""
+        return f"capabilities/{model_code or self.vin}"
+
+    def _get_capabilities(
+        self, model_code: str | None
+    ) -> dict[str, models.EndpointDefinition]:
+        """Get the endpoint definitions probed successfully on the model.
+
+        The data cache is read on each call, to pick up the endpoints probed
+        since by the other vehicles of the same model.
+        """
+        if self._data_cache is not None:
+            cached_data = self._data_cache.get(self._get_capabilities_key(model_code))
+            self._capabilities = {
+                endpoint: models.EndpointDefinition(**definition)
+                for endpoint, definition in (cached_data or {}).items()
+                if definition
+            }
+        return self._capabilities
+
+    @traced
+    async def probe_endpoints(
+        self,
+        endpoints: Collection[str] | None = None,
+        *,
+        concurrency: int = DEFAULT_PROBE_CONCURRENCY,
+    ) -> dict[str, models.EndpointDefinition | None]:
+        """Probe which endpoints the vehicle supports, and in which mode.
+
+        Each candidate definition (kca, then kcm) is tried once with a GET, until
+        one succeeds. The working definitions take precedence over the
+        documented endpoints during endpoint resolution, and are stored in the
+        data cache for the other vehicles of the same model. The endpoints found
+        unavailable are only remembered for this vehicle, until expiry (see
+        `UNAVAILABLE_ENDPOINT_TTL`), as the failure may be specific to it
+        (eg. privacy mode or contract).
+
+        Args:
+            endpoints: the endpoints to probe, or None for all readable endpoints.
+            concurrency: maximum number of probe requests in flight.
+
+        Returns:
+            The definition that worked for each endpoint, or None if the endpoint
+            is not available. Endpoints failing for other reasons (eg. quota or
+            upstream errors) are left out, and resolved as documented.
+        """
+        candidates = models.get_probe_candidates()
+        if endpoints is not None:
+            unknown_endpoints = set(endpoints).difference(candidates)
+            if unknown_endpoints:
+                raise InvalidInputError(
+                    f"Cannot probe endpoints: {', '.join(sorted(unknown_endpoints))}"
+                )
+            candidates = {endpoint: candidates[endpoint] for endpoint in endpoints}
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _probe(
+            endpoint: str, definitions: list[models.EndpointDefinition]
+        ) -> tuple[str, models.EndpointDefinition | None] | None:
+            conclusive = True
+            for definition in definitions:
+                try:
+                    async with semaphore:
+                        await self.session.http_request(
+                            "GET",
+                            self._resolve_url(definition),
+                            endpoint_name=endpoint,
+                            vin=self.vin,
+                        )
+                except _UNAVAILABLE_ENDPOINT_EXCEPTIONS as exc:
+                    _LOGGER.debug(
+                        "Probe of %s (%s) failed on %s: %s",
+                        endpoint,
+                        definition.mode,
+                        self.vin,
+                        exc,
+                    )
+                except (RenaultException, aiohttp.ClientError) as exc:
+                    _LOGGER.debug(
+                        "Probe of %s (%s) inconclusive on %s: %s",
+                        endpoint,
+                        definition.mode,
+                        self.vin,
+                        exc,
+                    )
+                    conclusive = False
+                else:
+                    return endpoint, definition
+            return (endpoint, None) if conclusive else None
+
+        results = await asyncio.gather(
+            *(
+                _probe(endpoint, definitions)
+                for endpoint, definitions in candidates.items()
+            )
+        )
+        probed = dict(result for result in results if result is not None)
+        await self._set_capabilities(probed)
+        return probed
+
+    async def _set_capabilities(
+        self, probed: dict[str, models.EndpointDefinition | None]
+    ) -> None:
+        """Store the probed endpoint definitions, and the unavailable endpoints."""
+        details = await self.get_details()
+        capabilities = self._get_capabilities(details.get_model_code())
+        for endpoint, definition in probed.items():
+            if definition is None:
+                # Resolved as documented, once the negative result expires
+                self._endpoint_definitions.pop(endpoint, None)
+            else:
+                capabilities[endpoint] = definition
+                self._endpoint_definitions[endpoint] = definition
+        self._update_unavailable_endpoints(
+            [endpoint for endpoint, definition in probed.items() if definition is None],
+            [endpoint for endpoint, definition in probed.items() if definition],
+        )
+        if self._data_cache is not None:
+            self._data_cache[self._get_capabilities_key(details.get_model_code())] = {
+                endpoint: asdict(definition)
+                for endpoint, definition in capabilities.items()
+            }
+
+    async def _get_kcm_settings(
+        self, endpoint_definition: models.EndpointDefinition
+    ) -> dict[str, Any]:
+        """Get a copy of the kcm ev/settings, from the short-lived cache if fresh."""
+        if self._kcm_settings is not None:
+            expiry, settings = self._kcm_settings
+            if expiry > time.monotonic():
+                return copy.deepcopy(settings)
+        # Labelled as a read of its own, not as the action it prepares
+        response = await self._get_vehicle_data(
+            KCM_SETTINGS_ENDPOINT, endpoint_definition
+        )
+        self._set_kcm_settings(response.raw_data)
+        return copy.deepcopy(response.raw_data)
+
+    def _set_kcm_settings(self, settings: dict[str, Any]) -> None:
+        """Store the kcm ev/settings in the short-lived cache."""
+        self._kcm_settings = (
+            time.monotonic() + KCM_SETTINGS_TTL,
+            copy.deepcopy(settings),
+        )
+
+    def _get_cached_schedules(self, kind: str) -> list[dict[str, Any]] | None:
+        """Get the charge or hvac schedules from the short-lived cache, if fresh."""
+        if kind in self._schedules:
+            expiry, schedules = self._schedules[kind]
+            if expiry > time.monotonic():
+                return schedules
+        return None
+
+    def _set_cached_schedules(
+        self,
+        kind: str,
+        schedules: list[models.ChargeSchedule] | list[models.HvacSchedule] | None,
+    ) -> None:
+        """Store the charge or hvac schedules in the short-lived cache."""
+        self._schedules[kind] = (
+            time.monotonic() + SCHEDULES_TTL,
+            _get_schedules_json(schedules),
+        )
+
+    def _get_cached_data(self, key: str) -> Any | None:
+        """Get raw data from the data cache, if available."""
+        if self._data_cache is None:
+            return None
+        return self._data_cache.get(f"{self.vin}/{key}")
+
+    def _set_cached_data(self, key: str, data: Any) -> None:
+        """Store raw data in the data cache, if available."""
+        if self._data_cache is not None:
+            self._data_cache[f"{self.vin}/{key}"] = data
+
+    @traced
     async def get_details(self) -> models.KamereonVehicleDetails:
         """Get vehicle details."""
         if self._vehicle_details:
             return self._vehicle_details
 
+        cached_data = self._get_cached_data("details")
+        if cached_data is not None:
+            self._vehicle_details = cast(
+                models.KamereonVehicleDetails,
+                schemas.KamereonVehicleDetailsResponseSchema.load(cached_data),
+            )
+            return self._vehicle_details
+
         response = await self.session.get_vehicle_details(
             account_id=self.account_id,
             vin=self.vin,
@@ -150,13 +471,23 @@ class RenaultVehicle:
             models.KamereonVehicleDetails,
             response,
         )
+        self._set_cached_data("details", response.raw_data)
         return self._vehicle_details
 
+    @traced
     async def get_car_adapter(self) -> models.KamereonVehicleCarAdapterData:
         """Get vehicle car adapter details."""
         if self._car_adapter:
             return self._car_adapter
 
+        cached_data = self._get_cached_data("car-adapter")
+        if cached_data is not None:
+            self._car_adapter = cast(
+                models.KamereonVehicleCarAdapterData,
+                schemas.KamereonVehicleCarAdapterDataSchema.load(cached_data),
+            )
+            return self._car_adapter
+
         response = await self.session.get_vehicle_data(
             account_id=self.account_id,
             vin=self.vin,
@@ -166,22 +497,33 @@ class RenaultVehicle:
             models.KamereonVehicleCarAdapterData,
             response.get_attributes(schemas.KamereonVehicleCarAdapterDataSchema),
         )
+        self._set_cached_data("car-adapter", self._car_adapter.raw_data)
         return self._car_adapter
 
+    @traced
     async def get_contracts(self) -> list[models.KamereonVehicleContract]:
         """Get vehicle contracts."""
         if self._contracts:
             return self._contracts
 
-        response = await self.session.get_vehicle_contracts(
-            account_id=self.account_id,
-            vin=self.vin,
-        )
+        cached_data = self._get_cached_data("contracts")
+        if cached_data is not None:
+            response = cast(
+                models.KamereonVehicleContractsResponse,
+                schemas.KamereonVehicleContractsResponseSchema.load(cached_data),
+            )
+        else:
+            response = await self.session.get_vehicle_contracts(
+                account_id=self.account_id,
+                vin=self.vin,
+            )
+            self._set_cached_data("contracts", response.raw_data)
         if response.contractList is None:
             raise ValueError("response.contractList is None")
         self._contracts = response.contractList
         return self._contracts
 
+    @traced
     async def get_battery_status(self) -> models.KamereonVehicleBatteryStatusData:
         """Get vehicle battery status."""
         response = await self._get_vehicle_data("battery-status")
@@ -190,6 +532,7 @@ class RenaultVehicle:
             response.get_attributes(schemas.KamereonVehicleBatteryStatusDataSchema),
         )
 
+    @traced
     async def get_battery_soc(self) -> models.KamereonVehicleBatterySocData:
         """Get vehicle battery state of charge limits"""
         response = await self._get_vehicle_data("soc-levels")
@@ -198,6 +541,7 @@ class RenaultVehicle:
             schemas.KamereonVehicleBatterySocDataSchema.load(response.raw_data),
         )
 
+    @traced
     async def get_tyre_pressure(self) -> models.KamereonVehicleTyrePressureData:
         """Get vehicle tyre pressure."""
         response = await self._get_vehicle_data("pressure")
@@ -206,6 +550,7 @@ class RenaultVehicle:
             response.get_attributes(schemas.KamereonVehicleTyrePressureDataSchema),
         )
 
+    @traced
     async def get_location(self) -> models.KamereonVehicleLocationData:
         """Get vehicle location."""
         response = await self._get_vehicle_data("location")
@@ -214,6 +559,7 @@ class RenaultVehicle:
             response.get_attributes(schemas.KamereonVehicleLocationDataSchema),
         )
 
+    @traced
     async def get_hvac_status(self) -> models.KamereonVehicleHvacStatusData:
         """Get vehicle hvac status."""
         response = await self._get_vehicle_data("hvac-status")
@@ -222,14 +568,18 @@ class RenaultVehicle:
             response.get_attributes(schemas.KamereonVehicleHvacStatusDataSchema),
         )
 
+    @traced
     async def get_hvac_settings(self) -> models.KamereonVehicleHvacSettingsData:
         """Get vehicle hvac settings (schedule+mode)."""
         response = await self._get_vehicle_data("hvac-settings")
-        return cast(
+        settings = cast(
             models.KamereonVehicleHvacSettingsData,
             response.get_attributes(schemas.KamereonVehicleHvacSettingsDataSchema),
         )
+        self._set_cached_schedules("hvac", settings.schedules)
+        return settings
 
+    @traced
     async def get_charge_mode(self) -> models.KamereonVehicleChargeModeData:
         """Get vehicle charge mode."""
         response = await self._get_vehicle_data("charge-mode")
@@ -238,14 +588,18 @@ class RenaultVehicle:
             response.get_attributes(schemas.KamereonVehicleChargeModeDataSchema),
         )
 
+    @traced
     async def get_charging_settings(self) -> models.KamereonVehicleChargingSettingsData:
         """Get vehicle charging settings."""
         response = await self._get_vehicle_data("charging-settings")
-        return cast(
+        settings = cast(
             models.KamereonVehicleChargingSettingsData,
             response.get_attributes(schemas.KamereonVehicleChargingSettingsDataSchema),
         )
+        self._set_cached_schedules("charge", settings.schedules)
+        return settings
 
+    @traced
     async def get_cockpit(self) -> models.KamereonVehicleCockpitData:
         """Get vehicle cockpit."""
         response = await self._get_vehicle_data("cockpit")
@@ -254,6 +608,7 @@ class RenaultVehicle:
             response.get_attributes(schemas.KamereonVehicleCockpitDataSchema),
         )
 
+    @traced
     async def get_lock_status(self) -> models.KamereonVehicleLockStatusData:
         """Get vehicle lock status."""
         response = await self._get_vehicle_data("lock-status")
@@ -262,6 +617,7 @@ class RenaultVehicle:
             response.get_attributes(schemas.KamereonVehicleLockStatusDataSchema),
         )
 
+    @traced
     async def get_res_state(self) -> models.KamereonVehicleResStateData:
         """Get vehicle res state."""
         response = await self._get_vehicle_data("res-state")
@@ -270,14 +626,17 @@ class RenaultVehicle:
             response.get_attributes(schemas.KamereonVehicleResStateDataSchema),
         )
 
+    @traced
     async def get_charge_schedule(self) -> dict[str, Any]:
         """Get vehicle charge schedule."""
         endpoint_definition = await self.get_endpoint_definition("charge-schedule")
-        response = await self._get_vehicle_data(endpoint_definition)
+        response = await self._get_vehicle_data("charge-schedule", endpoint_definition)
         if endpoint_definition.mode == "kcm-settings":
+            self._set_kcm_settings(response.raw_data)
             return response.raw_data
         return response.raw_data["data"]["attributes"]  # type:ignore[no-any-return]
 
+    @traced
     async def get_notification_settings(
         self,
     ) -> models.KamereonVehicleNotificationSettingsData:
@@ -290,6 +649,7 @@ class RenaultVehicle:
             ),
         )
 
+    @traced
     async def get_charge_history(
         self, start: datetime, end: datetime, period: str
     ) -> models.KamereonVehicleChargeHistoryData:
@@ -311,17 +671,19 @@ class RenaultVehicle:
             "start": start.strftime(PERIOD_FORMATS[period]),
             "end": end.strftime(PERIOD_FORMATS[period]),
         }
-        response = await self.session.get_vehicle_data(
-            account_id=self.account_id,
-            vin=self.vin,
-            endpoint="charge-history",
-            params=params,
-        )
+        with request_priority(PRIORITY_BACKFILL):
+            response = await self.session.get_vehicle_data(
+                account_id=self.account_id,
+                vin=self.vin,
+                endpoint="charge-history",
+                params=params,
+            )
         return cast(
             models.KamereonVehicleChargeHistoryData,
             response.get_attributes(schemas.KamereonVehicleChargeHistoryDataSchema),
         )
 
+    @traced
     async def get_charges(
         self, start: datetime, end: datetime
     ) -> models.KamereonVehicleChargesData:
@@ -340,17 +702,19 @@ class RenaultVehicle:
             "start": start.strftime(PERIOD_DAY_FORMAT),
             "end": end.strftime(PERIOD_DAY_FORMAT),
         }
-        response = await self.session.get_vehicle_data(
-            account_id=self.account_id,
-            vin=self.vin,
-            endpoint="charges",
-            params=params,
-        )
+        with request_priority(PRIORITY_BACKFILL):
+            response = await self.session.get_vehicle_data(
+                account_id=self.account_id,
+                vin=self.vin,
+                endpoint="charges",
+                params=params,
+            )
         return cast(
             models.KamereonVehicleChargesData,
             response.get_attributes(schemas.KamereonVehicleChargesDataSchema),
         )
 
+    @traced
     async def get_hvac_history(
         self, start: datetime, end: datetime, period: str
     ) -> models.KamereonVehicleHvacHistoryData:
@@ -372,17 +736,19 @@ class RenaultVehicle:
             "start": start.strftime(PERIOD_FORMATS[period]),
             "end": end.strftime(PERIOD_FORMATS[period]),
         }
-        response = await self.session.get_vehicle_data(
-            account_id=self.account_id,
-            vin=self.vin,
-            endpoint="hvac-history",
-            params=params,
-        )
+        with request_priority(PRIORITY_BACKFILL):
+            response = await self.session.get_vehicle_data(
+                account_id=self.account_id,
+                vin=self.vin,
+                endpoint="hvac-history",
+                params=params,
+            )
         return cast(
             models.KamereonVehicleHvacHistoryData,
             response.get_attributes(schemas.KamereonVehicleHvacHistoryDataSchema),
         )
 
+    @traced
     async def get_hvac_sessions(
         self, start: datetime, end: datetime
     ) -> models.KamereonVehicleHvacSessionsData:
@@ -401,17 +767,19 @@ class RenaultVehicle:
             "start": start.strftime(PERIOD_DAY_FORMAT),
             "end": end.strftime(PERIOD_DAY_FORMAT),
         }
-        response = await self.session.get_vehicle_data(
-            account_id=self.account_id,
-            vin=self.vin,
-            endpoint="hvac-sessions",
-            params=params,
-        )
+        with request_priority(PRIORITY_BACKFILL):
+            response = await self.session.get_vehicle_data(
+                account_id=self.account_id,
+                vin=self.vin,
+                endpoint="hvac-sessions",
+                params=params,
+            )
         return cast(
             models.KamereonVehicleHvacSessionsData,
             response.get_attributes(schemas.KamereonVehicleHvacSessionsDataSchema),
         )
 
+    @traced
     async def set_ac_start(
         self, temperature: float, when: datetime | None = None
     ) -> models.KamereonVehicleHvacStartActionData:
@@ -441,6 +809,7 @@ class RenaultVehicle:
             response.get_attributes(schemas.KamereonVehicleHvacStartActionDataSchema),
         )
 
+    @traced
     async def set_ac_stop(self) -> models.KamereonVehicleHvacStartActionData:
         """Stop vehicle ac."""
         json: dict[str, Any] = {
@@ -460,12 +829,15 @@ class RenaultVehicle:
             # Using alternative endpoint that requires "stop" action
             json["data"]["attributes"]["action"] = "stop"
 
-        response = await self._set_vehicle_data(endpoint_definition, json)
+        response = await self._set_vehicle_data(
+            "actions/hvac-stop", json, endpoint_definition
+        )
         return cast(
             models.KamereonVehicleHvacStartActionData,
             response.get_attributes(schemas.KamereonVehicleHvacStartActionDataSchema),
         )
 
+    @traced
     async def set_battery_soc(
         self, *, min: int, target: int
     ) -> models.KamereonVehicleBatterySocActionData:
@@ -478,6 +850,7 @@ class RenaultVehicle:
             response.get_attributes(schemas.KamereonVehicleBatterySocActionDataSchema),
         )
 
+    @traced
     async def set_hvac_schedules(
         self, schedules: list[models.HvacSchedule]
     ) -> models.KamereonVehicleHvacScheduleActionData:
@@ -498,6 +871,7 @@ class RenaultVehicle:
         }
 
         response = await self._set_vehicle_data("actions/hvac-set-schedule", json)
+        self._set_cached_schedules("hvac", schedules)
         return cast(
             models.KamereonVehicleHvacScheduleActionData,
             response.get_attributes(
@@ -505,6 +879,7 @@ class RenaultVehicle:
             ),
         )
 
+    @traced
     async def set_charge_schedules(
         self, schedules: list[models.ChargeSchedule]
     ) -> models.KamereonVehicleChargeScheduleActionData:
@@ -526,6 +901,7 @@ class RenaultVehicle:
         }
 
         response = await self._set_vehicle_data("actions/charge-set-schedule", json)
+        self._set_cached_schedules("charge", schedules)
         return cast(
             models.KamereonVehicleChargeScheduleActionData,
             response.get_attributes(
@@ -533,6 +909,93 @@ class RenaultVehicle:
             ),
         )
 
+    @traced
+    async def apply_hvac_schedules(
+        self,
+        schedules: list[models.HvacSchedule],
+        current_settings: models.KamereonVehicleHvacSettingsData | None = None,
+    ) -> models.KamereonVehicleHvacScheduleActionData | None:
+        """Set vehicle hvac schedules, only if they differ from the vehicle.
+
+        Args:
+            schedules: the desired hvac schedules.
+            current_settings: the current hvac settings, if already available.
+                Otherwise the schedules from the last hvac settings or schedules
+                update are used, and only requested with `get_hvac_settings`
+                if not fresh.
+
+        Returns:
+            The action response, or None if the schedules were already set.
+        """
+        for schedule in schedules:
+            if not isinstance(schedule, models.HvacSchedule):
+                raise TypeError(
+                    "`schedules` should be a list of HvacSchedule, "
+                    f"not {schedules.__class__}"
+                )
+        current_schedules = None
+        if current_settings is None:
+            current_schedules = self._get_cached_schedules("hvac")
+            if current_schedules is None:
+                current_settings = await self.get_hvac_settings()
+        if current_settings is not None:
+            # Reload from the raw data, in case the schedules were updated in place
+            current_settings = cast(
+                models.KamereonVehicleHvacSettingsData,
+                schemas.KamereonVehicleHvacSettingsDataSchema.load(
+                    current_settings.raw_data
+                ),
+            )
+            current_schedules = _get_schedules_json(current_settings.schedules)
+        if _get_schedules_json(schedules) == current_schedules:
+            _LOGGER.debug("Hvac schedules already set on %s", self.vin)
+            return None
+        return await self.set_hvac_schedules(schedules)
+
+    @traced
+    async def apply_charge_schedules(
+        self,
+        schedules: list[models.ChargeSchedule],
+        current_settings: models.KamereonVehicleChargingSettingsData | None = None,
+    ) -> models.KamereonVehicleChargeScheduleActionData | None:
+        """Set vehicle charge schedules, only if they differ from the vehicle.
+
+        Args:
+            schedules: the desired charge schedules.
+            current_settings: the current charging settings, if already
+                available. Otherwise the schedules from the last charging
+                settings or schedules update are used, and only requested with
+                `get_charging_settings` if not fresh.
+
+        Returns:
+            The action response, or None if the schedules were already set.
+        """
+        for schedule in schedules:
+            if not isinstance(schedule, models.ChargeSchedule):
+                raise TypeError(
+                    "`schedules` should be a list of ChargeSchedule, "
+                    f"not {schedules.__class__}"
+                )
+        current_schedules = None
+        if current_settings is None:
+            current_schedules = self._get_cached_schedules("charge")
+            if current_schedules is None:
+                current_settings = await self.get_charging_settings()
+        if current_settings is not None:
+            # Reload from the raw data, in case the schedules were updated in place
+            current_settings = cast(
+                models.KamereonVehicleChargingSettingsData,
+                schemas.KamereonVehicleChargingSettingsDataSchema.load(
+                    current_settings.raw_data
+                ),
+            )
+            current_schedules = _get_schedules_json(current_settings.schedules)
+        if _get_schedules_json(schedules) == current_schedules:
+            _LOGGER.debug("Charge schedules already set on %s", self.vin)
+            return None
+        return await self.set_charge_schedules(schedules)
+
+    @traced
     async def set_charge_mode(
         self, charge_mode: str
     ) -> models.KamereonVehicleChargeModeActionData:
@@ -552,6 +1015,7 @@ class RenaultVehicle:
             response.get_attributes(schemas.KamereonVehicleChargeModeActionDataSchema),
         )
 
+    @traced
     async def set_charge_start(
         self, when: datetime | None = None
     ) -> models.KamereonVehicleChargingStartActionData:
@@ -565,8 +1029,9 @@ class RenaultVehicle:
             # - Disable all scheduled programs (programActivationStatus: false)
             # - POST the modified settings back
             # This triggers immediate charging by disabling scheduled mode.
-            get_settings_response = await self._get_vehicle_data(endpoint_definition)
-            current_settings = get_settings_response.raw_data
+            # The settings are served from a short-lived cache, refreshed from
+            # the POST response, so that repeated toggles only cost the POST.
+            current_settings = await self._get_kcm_settings(endpoint_definition)
             # Disable all programs to trigger immediate charging
             if "programs" in current_settings:
                 for program in current_settings["programs"]:
@@ -604,7 +1069,22 @@ class RenaultVehicle:
                     },
                 }
             }
-        response = await self._set_vehicle_data(endpoint_definition, json)
+        response = await self._set_vehicle_data(
+            "actions/charge-start", json, endpoint_definition
+        )
+        if endpoint_definition.mode == "kcm-settings":
+            # The response may only hold the updated keys, and echoes the
+            # programs as an empty list: keep the programs that were posted
+            self._set_kcm_settings(
+                {
+                    **json,
+                    **{
+                        key: value
+                        for key, value in response.raw_data.items()
+                        if key != "programs"
+                    },
+                }
+            )
         return cast(
             models.KamereonVehicleChargingStartActionData,
             response.get_attributes(
@@ -612,6 +1092,7 @@ class RenaultVehicle:
             ),
         )
 
+    @traced
     async def set_charge_stop(self) -> models.KamereonVehicleChargingStartActionData:
         """Start vehicle charge."""
         endpoint_definition = await self.get_endpoint_definition("actions/charge-stop")
@@ -634,7 +1115,9 @@ class RenaultVehicle:
                     },
                 }
             }
-        response = await self._set_vehicle_data(endpoint_definition, json)
+        response = await self._set_vehicle_data(
+            "actions/charge-stop", json, endpoint_definition
+        )
         return cast(
             models.KamereonVehicleChargingStartActionData,
             response.get_attributes(
@@ -642,6 +1125,7 @@ class RenaultVehicle:
             ),
         )
 
+    @traced
     async def start_horn(self) -> dict[str, Any]:
         json: dict[str, Any] = {
             "data": {
@@ -652,6 +1136,7 @@ class RenaultVehicle:
         response = await self._set_vehicle_data("actions/horn-start", json)
         return response.raw_data
 
+    @traced
     async def start_lights(self) -> dict[str, Any]:
         json: dict[str, Any] = {
             "data": {
@@ -662,6 +1147,7 @@ class RenaultVehicle:
         response = await self._set_vehicle_data("actions/lights-start", json)
         return response.raw_data
 
+    @traced
     async def refresh_location(self) -> dict[str, Any]:
         json: dict[str, Any] = {
             "data": {
@@ -671,7 +1157,56 @@ class RenaultVehicle:
         response = await self._set_vehicle_data("actions/refresh-location", json)
         return response.raw_data
 
+    @traced
+    async def await_effect(
+        self,
+        effect: effects.Effect,
+        *,
+        timeout: float = effects.DEFAULT_EFFECT_TIMEOUT,
+        interval: float = effects.DEFAULT_EFFECT_INTERVAL,
+        max_interval: float = effects.DEFAULT_EFFECT_MAX_INTERVAL,
+        backoff: float = effects.DEFAULT_EFFECT_BACKOFF,
+    ) -> Any:
+        """Poll the status endpoint until the expected effect of an action appears.
+
+        The first check happens after `interval` seconds, and the delay is then
+        multiplied by `backoff` (up to `max_interval`) until `timeout` expires.
+
+        Args:
+            effect: the expected state, eg. `effects.hvac_status("on")`.
+            timeout: maximum time to wait, in seconds.
+            interval: initial delay between status requests, in seconds.
+            max_interval: maximum delay between status requests, in seconds.
+            backoff: multiplier applied to the delay after each request.
+
+        Returns:
+            The status data showing the expected state.
+
+        Raises:
+            EffectTimeoutError: the expected state did not appear in time.
+            InvalidInputError: the effect endpoint has no status getter.
+        """
+        getter = getattr(self, f"get_{effect.endpoint.replace('-', '_')}", None)
+        if getter is None:
+            raise InvalidInputError(f"No status getter for `{effect.endpoint}`.")
+
+        deadline = time.monotonic() + timeout
+        delay = interval
+        data: Any = None
+        while (remaining := deadline - time.monotonic()) > 0:
+            await asyncio.sleep(min(delay, remaining))
+            data = await getter()
+            if effect.predicate(data):
+                return data
+            _LOGGER.debug("Waiting for %s on %s", effect, self.vin)
+            delay = min(delay * backoff, max_interval)
+        raise EffectTimeoutError(str(effect), data)
+
     async def supports_endpoint(self, endpoint: str) -> bool:
         """Check if vehicle supports endpoint."""
+        if self._is_endpoint_unavailable(endpoint):
+            return False
         details = await self.get_details()
+        if endpoint in self._get_capabilities(details.get_model_code()):
+            return True
         return details.supports_endpoint(endpoint)
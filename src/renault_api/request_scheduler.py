@@ -0,0 +1,111 @@
+"""Priority lanes for the Kamereon requests of a shared session.
+
+With a shared `RenaultSession`, a user action should not wait behind dozens of
+background polls. The `RequestScheduler` limits the requests in flight, and
+hands the free slots to the waiting request with the highest priority (lowest
+value), in order of arrival within a priority class.
+"""
+
+import asyncio
+import heapq
+import itertools
+from collections.abc import AsyncIterator
+from collections.abc import Iterator
+from contextlib import asynccontextmanager
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+PRIORITY_INTERACTIVE_ACTION = 0
+PRIORITY_INTERACTIVE_READ = 1
+PRIORITY_BACKGROUND = 2
+PRIORITY_BACKFILL = 3
+
+DEFAULT_MAX_CONCURRENCY = 4
+
+_request_priority: ContextVar[int | None] = ContextVar(
+    "renault_api_request_priority", default=None
+)
+
+
+@contextmanager
+def request_priority(priority: int) -> Iterator[None]:
+    """Set the priority of the requests sent within the context.
+
+    Example:
+        `with request_priority(PRIORITY_BACKGROUND): await vehicle.get_location()`
+    """
+    token = _request_priority.set(priority)
+    try:
+        yield
+    finally:
+        _request_priority.reset(token)
+
+
+def get_request_priority(method: str) -> int:
+    """Get the priority of a request, from the context or from its method.
+
+    Outside of `request_priority`, requests are considered interactive: actions
+    (POST) before reads (GET).
+    """
+    priority = _request_priority.get()
+    if priority is not None:
+        return priority
+    if method == "GET":
+        return PRIORITY_INTERACTIVE_READ
+    return PRIORITY_INTERACTIVE_ACTION
+
+
+class RequestScheduler:
+    """Limit the requests in flight, serving the highest priority first."""
+
+    def __init__(self, max_concurrency: int = DEFAULT_MAX_CONCURRENCY) -> None:
+        """Initialise the scheduler, with the maximum requests in flight."""
+        if max_concurrency < 1:
+            raise ValueError("`max_concurrency` must be positive")
+        self._max_concurrency = max_concurrency
+        self._in_flight = 0
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._counter = itertools.count()
+
+    @property
+    def in_flight(self) -> int:
+        """Number of requests in flight."""
+        return self._in_flight
+
+    @property
+    def waiting(self) -> int:
+        """Number of requests waiting for a slot."""
+        return sum(1 for _, _, future in self._waiters if not future.done())
+
+    @asynccontextmanager
+    async def slot(self, priority: int) -> AsyncIterator[None]:
+        """Wait for a request slot, and release it on exit."""
+        await self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(self, priority: int) -> None:
+        """Wait for a request slot, to be released with `release`."""
+        if self._in_flight < self._max_concurrency and not self.waiting:
+            self._in_flight += 1
+            return
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._counter), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was handed over before the cancellation
+                self.release()
+            raise
+
+    def release(self) -> None:
+        """Hand the slot over to the next waiting request, or free it."""
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self._in_flight -= 1
@@ -0,0 +1 @@
+"""Testing helpers for renault-api."""
@@ -0,0 +1,375 @@
+"""Local fake Gigya/Kamereon server, serving the fixture corpus.
+
+Unlike the `aiointercept` fixtures, the fake server listens on a real socket,
+so that connection pooling and concurrency can be exercised offline.
+
+The responses are read from the fixture corpus of the test suite, by default
+from `tests/fixtures` relative to the working directory. It can also be started
+on its own for manual load testing, from the root of the repository:
+
+    python -m renault_api.testing.fake_server --port 8080 --latency 0.2
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+from collections import Counter
+from collections import deque
+from collections.abc import Sequence
+from glob import glob
+from os import path
+
+import jwt
+from aiohttp import web
+
+from renault_api.const import AVAILABLE_LOCALES
+from renault_api.const import CONF_GIGYA_APIKEY
+from renault_api.const import CONF_GIGYA_URL
+from renault_api.const import CONF_KAMEREON_APIKEY
+from renault_api.const import CONF_KAMEREON_URL
+
+DEFAULT_FIXTURE_PATH = path.join("tests", "fixtures")
+DEFAULT_LOCALE = "fr_FR"
+
+JWT_KEY = "renault-api-fake-server-signing-key"  # nosec
+
+# Injectable errors: HTTP status, fixture and content type
+ERRORS: dict[str, tuple[int, str, str]] = {
+    "quota": (429, "error/quota_limit.json", "application/json"),
+    "bad_gateway": (502, "error/bad_gateway.html", "text/html"),
+    "privacy_on": (403, "error/privacy_on.json", "application/json"),
+}
+
+_COMMERCE_PATTERNS = [
+    ("person", re.compile(r"^persons/[^/]+$")),
+    ("vehicles", re.compile(r"^accounts/[^/]+/vehicles$")),
+    ("details", re.compile(r"^accounts/[^/]+/vehicles/[^/]+/details$")),
+    ("contracts", re.compile(r"^accounts/[^/]+/vehicles/[^/]+/contracts$")),
+    ("alerts", re.compile(r"^accounts/[^/]+/vehicles/[^/]+/alerts$")),
+    (
+        "car-adapter",
+        re.compile(r"^accounts/[^/]+/kamereon/kca/car-adapter/v\d+/cars/[^/]+$"),
+    ),
+    (
+        "vehicle-data",
+        re.compile(
+            r"^accounts/[^/]+/kamereon/"
+            r"(?:kca/car-adapter/v\d+/cars|kcm/v\d+/vehicles)/[^/]+/(?P<endpoint>.+)$"
+        ),
+    ),
+]
+
+
+def _read_fixture(fixture_path: str, filename: str) -> bytes:
+    """Read fixture file content."""
+    with open(path.join(fixture_path, filename), "rb") as file:
+        return file.read()
+
+
+def _find_fixture(
+    fixture_path: str, directories: Sequence[str], endpoint: str
+) -> str | None:
+    """Find the first fixture for the endpoint, eg. `battery-status.1.json`."""
+    for directory in directories:
+        exact = f"{directory}/{endpoint}.json"
+        if path.exists(path.join(fixture_path, exact)):
+            return exact
+        candidates = sorted(
+            glob(path.join(fixture_path, directory, f"{endpoint}.*.json"))
+        )
+        if candidates:
+            return f"{directory}/{path.basename(candidates[0])}"
+    return None
+
+
+class FakeRenaultServer:
+    """Fake Gigya/Kamereon server.
+
+    Args:
+        vehicle: fixture name used for the vehicle list and details.
+        latency: delay (in seconds) added to each response.
+        jitter: random delay (in seconds) added on top of `latency`.
+        error_rate: probability of answering with one of the `errors`.
+        errors: error kinds (from `ERRORS`) used for random injection.
+        jwt_ttl: lifetime (in seconds) of the JWTs issued by `getJWT`.
+        responses: fixture overrides per endpoint name (eg. `charges`).
+        seed: seed for the random error injection and jitter.
+        fixture_path: directory of the fixture corpus, with its `gigya` and
+            `kamereon` sub-directories.
+    """
+
+    def __init__(
+        self,
+        *,
+        vehicle: str = "zoe_40.1.json",
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        errors: Sequence[str] = ("quota", "bad_gateway", "privacy_on"),
+        jwt_ttl: float = 900,
+        responses: dict[str, str] | None = None,
+        seed: int | None = None,
+        fixture_path: str = DEFAULT_FIXTURE_PATH,
+    ) -> None:
+        """Initialise the fake server."""
+        for error in errors:
+            if error not in ERRORS:
+                raise ValueError(f"Unknown error kind `{error}`.")
+        self.vehicle = vehicle
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.errors = list(errors)
+        self.jwt_ttl = jwt_ttl
+        self.responses = responses or {}
+        self.requests: Counter[str] = Counter()
+        self._random = random.Random(seed)
+        self._gigya_fixture_path = path.join(fixture_path, "gigya")
+        self._kamereon_fixture_path = path.join(fixture_path, "kamereon")
+        self._pending_errors: deque[str] = deque()
+        self._jwt_not_before = 0.0
+        self._runner: web.AppRunner | None = None
+        self._url: str | None = None
+
+    @property
+    def url(self) -> str:
+        """Get the server base url."""
+        if self._url is None:
+            raise RuntimeError("Server is not started.")
+        return self._url
+
+    @property
+    def locale_details(self) -> dict[str, str]:
+        """Get the locale details pointing to the fake server."""
+        locale_details = AVAILABLE_LOCALES[DEFAULT_LOCALE]
+        return {
+            CONF_GIGYA_APIKEY: locale_details[CONF_GIGYA_APIKEY],
+            CONF_GIGYA_URL: f"{self.url}/gigya",
+            CONF_KAMEREON_APIKEY: locale_details[CONF_KAMEREON_APIKEY],
+            CONF_KAMEREON_URL: f"{self.url}/kamereon",
+        }
+
+    def inject_error(self, kind: str, count: int = 1) -> None:
+        """Answer the next `count` Kamereon requests with the error."""
+        if kind not in ERRORS:
+            raise ValueError(f"Unknown error kind `{kind}`.")
+        self._pending_errors.extend([kind] * count)
+
+    def expire_jwts(self) -> None:
+        """Reject all the JWTs issued so far."""
+        self._jwt_not_before = time.time()
+
+    def create_app(self) -> web.Application:
+        """Create the aiohttp application."""
+        app = web.Application()
+        app.router.add_post("/gigya/{method}", self._handle_gigya)
+        app.router.add_route(
+            "*", "/kamereon/commerce/v1/{tail:.+}", self._handle_kamereon
+        )
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        """Start the server, on a random port by default."""
+        self._runner = web.AppRunner(self.create_app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        self._url = f"http://{host}:{port}"
+
+    async def close(self) -> None:
+        """Stop the server."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+            self._url = None
+
+    async def __aenter__(self) -> FakeRenaultServer:
+        """Start the server."""
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        """Stop the server."""
+        await self.close()
+
+    async def _delay(self) -> None:
+        """Apply the configured latency."""
+        delay = self.latency + self._random.uniform(0, self.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+
+    def _issue_jwt(self) -> str:
+        """Issue a JWT valid for `jwt_ttl` seconds."""
+        now = time.time()
+        return jwt.encode(
+            {"iat": now, "exp": now + self.jwt_ttl}, JWT_KEY, algorithm="HS256"
+        )
+
+    def _is_valid_jwt(self, token: str | None) -> bool:
+        """Check the JWT was issued by this server and has not expired."""
+        if not token:
+            return False
+        try:
+            payload = jwt.decode(token, JWT_KEY, algorithms=["HS256"])
+        except jwt.InvalidTokenError:
+            return False
+        return bool(payload["iat"] > self._jwt_not_before)
+
+    async def _handle_gigya(self, request: web.Request) -> web.Response:
+        """Handle Gigya requests."""
+        method = request.match_info["method"]
+        self.requests[method] += 1
+        await self._delay()
+        filename = {
+            "accounts.login": "login.json",
+            "accounts.getAccountInfo": "get_account_info.json",
+            "accounts.getJWT": "get_jwt.json",
+        }.get(method)
+        if filename is None:
+            raise web.HTTPNotFound()
+        gigya_fixture = path.join(self._gigya_fixture_path, filename)
+        with open(gigya_fixture, encoding="utf-8") as file:
+            body = file.read()
+        if method == "accounts.getJWT":
+            body = body.replace("sample-jwt-token", self._issue_jwt())
+        return web.Response(text=body, content_type="text/javascript")
+
+    async def _handle_kamereon(self, request: web.Request) -> web.Response:
+        """Handle Kamereon requests."""
+        endpoint, filename = self._resolve(request.method, request.match_info["tail"])
+        self.requests[endpoint] += 1
+        await self._delay()
+
+        if not self._is_valid_jwt(request.headers.get("x-gigya-id_token")):
+            return web.json_response(
+                {
+                    "errors": [
+                        {
+                            "errorCode": "err.func.401",
+                            "errorMessage": "Invalid or expired JWT",
+                        }
+                    ]
+                },
+                status=401,
+            )
+
+        error = self._next_error()
+        if error is not None:
+            status, error_file, content_type = ERRORS[error]
+            return web.Response(
+                body=self._read_fixture(error_file),
+                status=status,
+                content_type=content_type,
+            )
+
+        if filename is None:
+            return web.Response(
+                body=self._read_fixture("error/resource_not_found.json"),
+                status=404,
+                content_type="application/json",
+            )
+        if endpoint == "details" and filename.startswith("vehicles/"):
+            # Extract the details from the vehicle list
+            vehicles = json.loads(self._read_fixture(filename))
+            return web.json_response(vehicles["vehicleLinks"][0]["vehicleDetails"])
+        return web.Response(
+            body=self._read_fixture(filename), content_type="application/json"
+        )
+
+    def _next_error(self) -> str | None:
+        """Get the error to inject, if any."""
+        if self._pending_errors:
+            return self._pending_errors.popleft()
+        if self.errors and self._random.random() < self.error_rate:
+            return self._random.choice(self.errors)
+        return None
+
+    def _resolve(self, method: str, tail: str) -> tuple[str, str | None]:
+        """Get the endpoint name and the fixture for the request path."""
+        for name, pattern in _COMMERCE_PATTERNS:
+            match = pattern.match(tail)
+            if match is None:
+                continue
+            endpoint = match.groupdict().get("endpoint") or name
+            if endpoint in self.responses:
+                return endpoint, self.responses[endpoint]
+            return endpoint, self._default_fixture(method, endpoint)
+        return tail, None
+
+    def _default_fixture(self, method: str, endpoint: str) -> str | None:
+        """Get the default fixture for the endpoint."""
+        if endpoint == "person":
+            return "person.json"
+        if endpoint == "vehicles":
+            return f"vehicles/{self.vehicle}"
+        if endpoint == "details":
+            details = f"vehicle_details/{self.vehicle}"
+            if path.exists(path.join(self._kamereon_fixture_path, details)):
+                return details
+            return f"vehicles/{self.vehicle}"
+        if endpoint == "contracts":
+            return "vehicle_contract/fr_FR.1.json"
+        if endpoint == "alerts":
+            return "vehicle_info/alerts.json"
+        if endpoint == "car-adapter":
+            gateway = f"vehicle_gateway/{self.vehicle}"
+            if path.exists(path.join(self._kamereon_fixture_path, gateway)):
+                return gateway
+            return None
+        # Fixtures are named after the last path segments, eg. `ev-settings`
+        fixture_name = endpoint.removeprefix("actions/").replace("/", "-")
+        if method == "POST":
+            directories = ("vehicle_action", "vehicle_kcm_action")
+        else:
+            directories = ("vehicle_data", "vehicle_kcm_data")
+        return _find_fixture(self._kamereon_fixture_path, directories, fixture_name)
+
+    def _read_fixture(self, filename: str) -> bytes:
+        """Read Kamereon fixture file content."""
+        return _read_fixture(self._kamereon_fixture_path, filename)
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    """Run the fake server until interrupted."""
+    server = FakeRenaultServer(
+        vehicle=args.vehicle,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        jwt_ttl=args.jwt_ttl,
+        fixture_path=args.fixtures,
+    )
+    await server.start(args.host, args.port)
+    print(json.dumps(server.locale_details, indent=2))
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Start the fake server from the command line."""
+    parser = argparse.ArgumentParser(description="Fake Gigya/Kamereon server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--vehicle", default="zoe_40.1.json")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--jwt-ttl", type=float, default=900)
+    parser.add_argument("--fixtures", default=DEFAULT_FIXTURE_PATH)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
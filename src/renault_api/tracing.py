@@ -0,0 +1,58 @@
+"""Optional OpenTelemetry tracing.
+
+Spans are only recorded when `opentelemetry-api` is installed (`tracing`
+extra). Otherwise the helpers below are no-ops, and `traced` leaves the
+decorated functions untouched.
+"""
+
+import functools
+from collections.abc import Awaitable
+from collections.abc import Callable
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+from typing import ParamSpec
+from typing import TypeVar
+
+try:
+    from opentelemetry import trace
+
+    _TRACING_AVAILABLE = True
+except ImportError:  # pragma: no cover
+    _TRACING_AVAILABLE = False
+
+_P = ParamSpec("_P")
+_T = TypeVar("_T")
+
+TRACER_NAME = "renault_api"
+
+
+def is_tracing_available() -> bool:
+    """Check if OpenTelemetry is installed."""
+    return _TRACING_AVAILABLE
+
+
+@contextmanager
+def start_span(name: str, attributes: dict[str, Any] | None = None) -> Iterator[Any]:
+    """Start a span, or yield None if OpenTelemetry is not installed."""
+    if not _TRACING_AVAILABLE:  # pragma: no cover
+        yield None
+        return
+    tracer = trace.get_tracer(TRACER_NAME)
+    with tracer.start_as_current_span(name, attributes=attributes) as span:
+        yield span
+
+
+def traced(
+    func: Callable[_P, Awaitable[_T]],
+) -> Callable[_P, Awaitable[_T]]:
+    """Wrap the coroutine function in a span named after its qualified name."""
+    if not _TRACING_AVAILABLE:  # pragma: no cover
+        return func
+
+    @functools.wraps(func)
+    async def wrapper(*args: _P.args, **kwargs: _P.kwargs) -> _T:
+        with start_span(func.__qualname__):
+            return await func(*args, **kwargs)
+
+    return wrapper
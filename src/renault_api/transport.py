@@ -0,0 +1,301 @@
+"""Record and replay transport for Gigya and Kamereon requests.
+
+`RecordingTransport` wraps an aiohttp websession and records every response
+into a `TrafficArchive`. `ReplayTransport` serves the archived responses back,
+either with their original timings or as fast as possible. Both implement the
+subset of `aiohttp.ClientSession` used by `gigya.request`, `kamereon.request`
+and `get_api_keys` (`request` and `get`), and can be passed wherever such a
+websession is expected using `recording_websession` and `replay_websession`.
+
+Credentials are never recorded: request headers and Gigya form data are
+dropped, tokens and account identifiers are scrubbed from the responses, and
+the scrubbed identifiers are also replaced in the URLs recorded afterwards.
+"""
+
+import asyncio
+import gzip
+import json
+import time
+from collections.abc import AsyncIterator
+from contextlib import AbstractAsyncContextManager
+from contextlib import asynccontextmanager
+from dataclasses import asdict
+from dataclasses import dataclass
+from typing import Any
+from typing import cast
+
+import aiohttp
+import jwt
+from multidict import CIMultiDict
+from multidict import CIMultiDictProxy
+from yarl import URL
+
+from .exceptions import RenaultException
+
+SCRUBBED = "*SCRUBBED*"
+SCRUBBED_KEYS = {
+    "cookieValue",
+    "id_token",
+    "UID",
+    "UIDSignature",
+    "email",
+    "loginIDs",
+    "personId",
+}
+REPLAY_JWT_TTL = 900
+REPLAY_JWT_KEY = "renault-api-replay-transport-signing-key"  # nosec
+
+
+class ReplayError(RenaultException):
+    """No recorded response is available for the request."""
+
+    pass
+
+
+@dataclass
+class TrafficEntry:
+    """Recorded request and response."""
+
+    method: str
+    url: str
+    params: dict[str, str] | None
+    json: dict[str, Any] | None
+    status: int
+    content_type: str
+    body: str
+    offset: float
+    duration: float
+
+    @property
+    def key(self) -> tuple[str, str, str]:
+        """Key used to match requests on replay."""
+        return _get_key(self.method, self.url, self.params)
+
+
+def _get_key(
+    method: str, url: str, params: dict[str, str] | None
+) -> tuple[str, str, str]:
+    """Get the key used to match requests on replay."""
+    return (method.upper(), url, json.dumps(params or {}, sort_keys=True))
+
+
+def _scrub(data: Any, scrubbed: set[str]) -> Any:
+    """Recursively replace the credentials, collecting the replaced strings."""
+    if isinstance(data, dict):
+        result = {}
+        for key, value in data.items():
+            if key not in SCRUBBED_KEYS:
+                result[key] = _scrub(value, scrubbed)
+                continue
+            if isinstance(value, str) and value:
+                scrubbed.add(value)
+            result[key] = SCRUBBED
+        return result
+    if isinstance(data, list):
+        return [_scrub(value, scrubbed) for value in data]
+    return data
+
+
+def _scrub_body(body: str, scrubbed: set[str]) -> str:
+    """Scrub the credentials from a JSON body."""
+    try:
+        data = json.loads(body)
+    except json.JSONDecodeError:
+        return body
+    return json.dumps(_scrub(data, scrubbed))
+
+
+def _scrub_url(url: str, scrubbed: set[str]) -> str:
+    """Replace the previously scrubbed strings (such as the person id) in a URL."""
+    for value in scrubbed:
+        url = url.replace(value, SCRUBBED)
+    return url
+
+
+class TrafficArchive:
+    """Archive of recorded traffic, stored as gzipped JSON lines."""
+
+    def __init__(self, entries: list[TrafficEntry] | None = None) -> None:
+        """Initialise the archive."""
+        self.entries: list[TrafficEntry] = entries or []
+
+    def save(self, location: str) -> None:
+        """Write the archive to file."""
+        with gzip.open(location, "wt", encoding="utf-8") as file:
+            for entry in self.entries:
+                file.write(json.dumps(asdict(entry), separators=(",", ":")) + "\n")
+
+    @classmethod
+    def load(cls, location: str) -> "TrafficArchive":
+        """Read the archive from file."""
+        with gzip.open(location, "rt", encoding="utf-8") as file:
+            return cls([TrafficEntry(**json.loads(line)) for line in file if line])
+
+
+class RecordedResponse:
+    """Response served from (or captured into) the archive."""
+
+    def __init__(self, entry: TrafficEntry, body: bytes | None = None) -> None:
+        """Initialise the response."""
+        self._entry = entry
+        self._body = entry.body.encode() if body is None else body
+        self.status = entry.status
+        self.content_type = entry.content_type
+        self.url = URL(entry.url).update_query(entry.params or {})
+
+    async def read(self) -> bytes:
+        """Read the response body."""
+        return self._body
+
+    async def text(self) -> str:
+        """Read the response body as text."""
+        return self._body.decode()
+
+    async def json(self, *, content_type: str | None = None) -> Any:
+        """Read the response body as JSON, whatever its content type."""
+        return json.loads(self._body)
+
+    def raise_for_status(self) -> None:
+        """Raise ClientResponseError if the status is 400 or higher."""
+        if self.status < 400:  # noqa: PLR2004
+            return
+        request_info = aiohttp.RequestInfo(
+            self.url, self._entry.method, CIMultiDictProxy(CIMultiDict()), self.url
+        )
+        raise aiohttp.ClientResponseError(request_info, (), status=self.status)
+
+
+class RecordingTransport:
+    """Websession wrapper recording the responses into an archive."""
+
+    def __init__(
+        self, websession: aiohttp.ClientSession, archive: TrafficArchive
+    ) -> None:
+        """Initialise the recording transport."""
+        self._websession = websession
+        self.archive = archive
+        self._start: float | None = None
+        self._scrubbed: set[str] = set()
+
+    def get(
+        self, url: str, **kwargs: Any
+    ) -> AbstractAsyncContextManager[RecordedResponse]:
+        """Send a GET request, and record the response."""
+        return self.request("GET", url, **kwargs)
+
+    @asynccontextmanager
+    async def request(
+        self, method: str, url: str, **kwargs: Any
+    ) -> AsyncIterator[RecordedResponse]:
+        """Send the request, and record the response."""
+        start = time.monotonic()
+        if self._start is None:
+            self._start = start
+        async with self._websession.request(method, url, **kwargs) as response:
+            body = await response.read()
+            duration = time.monotonic() - start
+        scrubbed_body = _scrub_body(body.decode(errors="replace"), self._scrubbed)
+        entry = TrafficEntry(
+            method=method,
+            url=_scrub_url(url, self._scrubbed),
+            params=kwargs.get("params"),
+            json=kwargs.get("json"),
+            status=response.status,
+            content_type=response.content_type,
+            body=scrubbed_body,
+            offset=start - self._start,
+            duration=duration,
+        )
+        self.archive.entries.append(entry)
+        # Return the genuine body, only the archive is scrubbed
+        yield RecordedResponse(entry, body)
+
+
+class ReplayTransport:
+    """Websession replacement serving the responses from an archive.
+
+    Args:
+        archive: the recorded traffic.
+        realtime: serve each response at its recorded offset from the start of
+            the replay, after its recorded duration.
+        cycle: restart from the first recording once a request is exhausted,
+            with the offsets counted from the start of the new cycle of that
+            request.
+    """
+
+    def __init__(
+        self, archive: TrafficArchive, *, realtime: bool = False, cycle: bool = False
+    ) -> None:
+        """Initialise the replay transport."""
+        self._realtime = realtime
+        self._cycle = cycle
+        self._entries: dict[tuple[str, str, str], list[TrafficEntry]] = {}
+        for entry in archive.entries:
+            self._entries.setdefault(entry.key, []).append(entry)
+        self._served: dict[tuple[str, str, str], int] = {}
+        self._start: float | None = None
+        self._cycle_starts: dict[tuple[tuple[str, str, str], int], float] = {}
+
+    def get(
+        self, url: str, **kwargs: Any
+    ) -> AbstractAsyncContextManager[RecordedResponse]:
+        """Serve the next recorded response for a GET request."""
+        return self.request("GET", url, **kwargs)
+
+    @asynccontextmanager
+    async def request(
+        self, method: str, url: str, **kwargs: Any
+    ) -> AsyncIterator[RecordedResponse]:
+        """Serve the next recorded response for the request."""
+        key = _get_key(method, url, kwargs.get("params"))
+        entries = self._entries.get(key, [])
+        served = self._served.get(key, 0)
+        if not entries or (served >= len(entries) and not self._cycle):
+            raise ReplayError(f"No recorded response for {method} {url}.")
+        self._served[key] = served + 1
+        entry = entries[served % len(entries)]
+        if self._realtime:
+            # The first response served sets the start of the replay, and the
+            # first response served in a new cycle of a request its start
+            if self._start is None:
+                self._start = time.monotonic() - entry.offset
+            cycle = served // len(entries)
+            cycle_start = self._start
+            if cycle:
+                cycle_start = self._cycle_starts.setdefault(
+                    (key, cycle), time.monotonic() - entry.offset
+                )
+            await asyncio.sleep(max(cycle_start + entry.offset - time.monotonic(), 0))
+            await asyncio.sleep(entry.duration)
+        yield RecordedResponse(entry, self._get_body(entry).encode())
+
+    @staticmethod
+    def _get_body(entry: TrafficEntry) -> str:
+        """Get the body, with a valid JWT in place of the scrubbed one."""
+        try:
+            data = json.loads(entry.body)
+        except json.JSONDecodeError:
+            return entry.body
+        if not isinstance(data, dict) or data.get("id_token") != SCRUBBED:
+            return entry.body
+        data["id_token"] = jwt.encode(
+            {"exp": time.time() + REPLAY_JWT_TTL}, REPLAY_JWT_KEY, algorithm="HS256"
+        )
+        return json.dumps(data)
+
+
+def recording_websession(
+    websession: aiohttp.ClientSession, archive: TrafficArchive
+) -> aiohttp.ClientSession:
+    """Get a websession recording the traffic into the archive."""
+    return cast(aiohttp.ClientSession, RecordingTransport(websession, archive))
+
+
+def replay_websession(
+    archive: TrafficArchive, *, realtime: bool = False, cycle: bool = False
+) -> aiohttp.ClientSession:
+    """Get a websession replaying the traffic from the archive."""
+    return cast(
+        aiohttp.ClientSession,
+        ReplayTransport(archive, realtime=realtime, cycle=cycle),
+    )
@@ -0,0 +1,135 @@
+"""Test cases for the fleet load generator."""
+
+import asyncio
+import json
+import threading
+from collections.abc import Generator
+
+import aiohttp
+import click
+import pytest
+from click.testing import CliRunner
+
+from tests.const import TEST_LOCALE
+
+from renault_api.cli import __main__
+from renault_api.cli.bench import parse_endpoint_mix
+from renault_api.cli.bench import run_bench
+from renault_api.testing.fake_server import FakeRenaultServer
+
+
+@pytest.fixture
+def fake_server_url() -> Generator[str, None, None]:
+    """Fixture for a fake server, running in a background thread."""
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    server = FakeRenaultServer()
+    asyncio.run_coroutine_threadsafe(server.start(), loop).result()
+    yield server.url
+    asyncio.run_coroutine_threadsafe(server.close(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+
+def test_parse_endpoint_mix() -> None:
+    """Test parsing the endpoint mix."""
+    assert parse_endpoint_mix("battery-status=3, cockpit") == {
+        "battery-status": 3,
+        "cockpit": 1,
+    }
+    # Getters requiring arguments cannot be requested
+    for endpoint in ["charges", "charge-history", "hvac-history", "hvac-sessions"]:
+        with pytest.raises(click.BadParameter, match="Unknown endpoint"):
+            parse_endpoint_mix(f"battery-status,{endpoint}=2")
+    with pytest.raises(click.BadParameter, match="Invalid weight"):
+        parse_endpoint_mix("cockpit=often")
+    for weight in ("0", "-2"):
+        with pytest.raises(click.BadParameter, match="expected at least 1"):
+            parse_endpoint_mix(f"cockpit={weight}")
+
+
+@pytest.mark.asyncio
+async def test_run_bench() -> None:
+    """Test the load generator against the fake server."""
+    async with (
+        FakeRenaultServer(errors=["quota"]) as server,
+        aiohttp.ClientSession() as websession,
+    ):
+        server.inject_error("quota", 2)
+        report = await run_bench(
+            websession,
+            base_url=server.url,
+            locale=TEST_LOCALE,
+            user="user",
+            password="password",
+            accounts=2,
+            vehicles=5,
+            concurrency=4,
+            requests=20,
+            endpoint_mix={"battery-status": 1, "cockpit": 1},
+            seed=1,
+        )
+
+    assert report.requests == 20
+    assert set(report.latencies) == {"battery-status", "cockpit"}
+    assert report.errors == {"QuotaLimitException (err.func.wired.overloaded)": 2}
+    assert server.requests["accounts.login"] == 2
+    stats = report.get_latency_stats()
+    assert stats["all"]["requests"] == 20
+    assert stats["all"]["p50"] <= stats["all"]["p99"] <= stats["all"]["max"]
+
+
+def test_bench(cli_runner: CliRunner, fake_server_url: str) -> None:
+    """Test the bench command."""
+    result = cli_runner.invoke(
+        __main__.main,
+        [
+            "--json",
+            "bench",
+            "--base-url",
+            fake_server_url,
+            "--vehicles",
+            "3",
+            "--requests",
+            "10",
+            "--endpoint-mix",
+            "battery-status",
+        ],
+    )
+    assert result.exit_code == 0, result.exception
+    report = json.loads(result.output)
+    assert report["requests"] == 10
+    assert report["errors"] == {}
+    assert list(report["latency_ms"]) == ["battery-status", "all"]
+
+    result = cli_runner.invoke(__main__.main, ["bench", "--base-url", fake_server_url])
+    assert result.exit_code == 0, result.exception
+    assert "1000 requests in" in result.output
+
+
+def test_bench_invalid_endpoint(cli_runner: CliRunner) -> None:
+    """Test the bench command with an invalid endpoint mix."""
+    result = cli_runner.invoke(
+        __main__.main,
+        ["bench", "--base-url", "http://localhost", "--endpoint-mix", "unknown=1"],
+    )
+    assert result.exit_code == 2
+    assert "Unknown endpoint `unknown`" in result.output
+
+
+def test_bench_invalid_weight(cli_runner: CliRunner) -> None:
+    """Test the bench command with a weight below 1."""
+    result = cli_runner.invoke(
+        __main__.main,
+        [
+            "bench",
+            "--base-url",
+            "http://localhost",
+            "--endpoint-mix",
+            "battery-status=2,cockpit=0",
+        ],
+    )
+    assert result.exit_code == 2
+    assert "Invalid weight `0` for `cockpit`" in result.output
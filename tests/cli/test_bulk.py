@@ -0,0 +1,86 @@
+"""Test cases for the bulk actions."""
+
+import json
+from pathlib import Path
+
+from aiointercept import aiointercept
+from click.testing import CliRunner
+from yarl import URL
+
+from tests import fixtures
+from tests.test_fleet import FLEET_VINS
+from tests.test_fleet import inject_fleet
+from tests.test_fleet import inject_set_charge_mode
+
+from . import initialise_credential_store
+from renault_api.cli import __main__
+from renault_api.kamereon.helpers import DAYS_OF_WEEK
+
+
+def test_bulk_charge_mode(
+    mocked_responses: aiointercept, cli_runner: CliRunner
+) -> None:
+    """It sets the charge mode on all the vehicles."""
+    initialise_credential_store()
+    inject_fleet(mocked_responses, FLEET_VINS)
+    urls = [inject_set_charge_mode(mocked_responses, vin) for vin in FLEET_VINS]
+
+    result = cli_runner.invoke(
+        __main__.main, "--json bulk charge-mode schedule_mode --rate 100"
+    )
+    assert result.exit_code == 0, result.exception
+    report = json.loads(result.output)
+    assert (report["succeeded"], report["failed"]) == (3, 0)
+    for url in urls:
+        request = mocked_responses.requests[("POST", URL(url))][0]
+        assert request.kwargs["json"] == {
+            "data": {"type": "ChargeMode", "attributes": {"action": "schedule_mode"}}
+        }
+
+
+def test_bulk_charge_mode_failed(
+    mocked_responses: aiointercept, cli_runner: CliRunner
+) -> None:
+    """It exits with a status code of one if any vehicle failed."""
+    initialise_credential_store()
+    inject_fleet(mocked_responses, FLEET_VINS)
+    inject_set_charge_mode(mocked_responses, FLEET_VINS[1])
+
+    result = cli_runner.invoke(
+        __main__.main,
+        f"bulk charge-mode schedule_mode --vins {FLEET_VINS[1]} --vins VF1UNKNOWN",
+    )
+    assert result.exit_code == 1, result.exception
+    assert f"{FLEET_VINS[1]}  OK" in result.output
+    assert "VF1UNKNOWN         FAILED    Vehicle `VF1UNKNOWN` not found." in (
+        result.output
+    )
+    assert "1 succeeded, 1 failed" in result.output
+
+
+def test_bulk_charge_schedules(
+    mocked_responses: aiointercept, cli_runner: CliRunner, tmp_path: Path
+) -> None:
+    """It sets the charge schedules from file."""
+    initialise_credential_store()
+    inject_fleet(mocked_responses, FLEET_VINS[:1])
+    url = fixtures.inject_set_charge_schedule(mocked_responses, "schedules")
+    schedules_file = tmp_path / "schedules.json"
+    schedule = {
+        "id": 1,
+        "activated": True,
+        "monday": {"startTime": "T12:00Z", "duration": 15},
+    }
+    schedules_file.write_text(json.dumps({"schedules": [schedule]}))
+
+    result = cli_runner.invoke(
+        __main__.main, ["bulk", "charge-schedules", str(schedules_file)]
+    )
+    assert result.exit_code == 0, result.exception
+    request = mocked_responses.requests[("POST", URL(url))][0]
+    assert request.kwargs["json"] == {
+        "data": {
+            "type": "ChargeSchedule",
+            "attributes": {"schedules": [{**dict.fromkeys(DAYS_OF_WEEK), **schedule}]},
+        }
+    }
@@ -2,6 +2,8 @@
 
 import os
 import pathlib
+import subprocess
+import sys
 from collections.abc import Generator
 from datetime import datetime
 from importlib import metadata as imp_metadata
@@ -84,3 +86,27 @@ def test_log_existing_folder(
 
     with open("logs/2018-12-25.log") as myfile:
         assert __main__._WARNING_DEBUG_ENABLED in myfile.read()
+
+
+def test_lazy_imports() -> None:
+    """Test the CLI entry point doesn't import heavy modules."""
+    code = (
+        "import sys\n"
+        "from renault_api.cli import __main__\n"
+        "print(sorted({'aiohttp', 'dateparser', 'tabulate', 'renault_api.kamereon'}"
+        " & set(sys.modules)))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "[]"
+
+
+def test_help_lists_lazy_commands(cli_runner: CliRunner) -> None:
+    """Test --help lists the lazy commands."""
+    result = cli_runner.invoke(__main__.main, "--help")
+    assert result.exit_code == 0
+    assert "charge     Charge functionality." in result.output
+    assert "hvac       HVAC functionality." in result.output
+    assert "bench      Fleet load generator." in result.output
+    assert "bulk       Bulk actions across vehicles." in result.output
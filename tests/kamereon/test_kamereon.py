@@ -1,5 +1,12 @@
 """Tests for Kamereon API."""
 
+import ast
+import inspect
+import logging
+import subprocess
+import sys
+from typing import Any
+
 import aiohttp
 import pytest
 from aiointercept import aiointercept
@@ -15,8 +22,43 @@ from tests.const import TEST_PERSON_ID
 from tests.const import TEST_VIN
 
 from renault_api import kamereon
+from renault_api.gigya import schemas as gigya_schemas
 from renault_api.kamereon import exceptions
 from renault_api.kamereon import models
+from renault_api.kamereon import schemas
+
+
+def test_schemas_are_compiled_lazily() -> None:
+    """Ensure schemas are compiled on first use, and then reused."""
+    code = (
+        "from renault_api.kamereon import schemas\n"
+        "print('KamereonVehicleChargesDataSchema' in vars(schemas))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "False"
+
+    schema = schemas.KamereonVehicleChargesDataSchema
+    assert schema is schemas.KamereonVehicleChargesDataSchema
+    assert "KamereonVehicleChargesDataSchema" in dir(schemas)
+    with pytest.raises(AttributeError):
+        schemas.UnknownSchema  # noqa: B018
+
+
+@pytest.mark.parametrize("module", [schemas, gigya_schemas])
+def test_schemas_are_declared_for_type_checkers(module: Any) -> None:
+    """Ensure each lazy schema is declared in the TYPE_CHECKING block."""
+    declared = {
+        node.target.id
+        for block in ast.parse(inspect.getsource(module)).body
+        if isinstance(block, ast.If)
+        and isinstance(block.test, ast.Name)
+        and block.test.id == "TYPE_CHECKING"
+        for node in block.body
+        if isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name)
+    }
+    assert declared == set(module._SCHEMA_MODELS)
 
 
 def test_vehicle_endpoints_sorted_by_key() -> None:
@@ -131,3 +173,36 @@ async def test_set_vehicle_action(
 
     request = mocked_responses.requests[("POST", URL(url))][0]
     assert request.kwargs["json"] == snapshot
+
+
+@pytest.mark.asyncio
+async def test_request_debug_logging(
+    websession: aiohttp.ClientSession,
+    mocked_responses: aiointercept,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test request payloads are only logged when debug is enabled."""
+    fixtures.inject_set_hvac_start(mocked_responses, "cancel")
+    kwargs: dict[str, Any] = {
+        "websession": websession,
+        "root_url": TEST_KAMEREON_URL,
+        "api_key": TEST_KAMEREON_APIKEY,
+        "gigya_jwt": fixtures.get_jwt(),
+        "country": TEST_COUNTRY,
+        "account_id": TEST_ACCOUNT_ID,
+        "vin": TEST_VIN,
+        "endpoint": "hvac-start",
+        "attributes": {"action": "cancel"},
+    }
+    with caplog.at_level(logging.INFO, logger="renault_api.kamereon"):
+        assert await kamereon.set_vehicle_action(**kwargs)
+    assert not caplog.records
+
+    fixtures.inject_set_hvac_start(mocked_responses, "cancel")
+    with caplog.at_level(logging.DEBUG, logger="renault_api.kamereon"):
+        assert await kamereon.set_vehicle_action(**kwargs)
+    assert [record.getMessage()[:35] for record in caplog.records] == [
+        "Send Kamereon POST request to https",
+        "Received Kamereon response 200 on P",
+    ]
+    assert '"action": "cancel"' in caplog.records[0].getMessage()
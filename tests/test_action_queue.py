@@ -0,0 +1,144 @@
+"""Test cases for the per-vehicle action queue."""
+
+import asyncio
+from collections.abc import Awaitable
+from collections.abc import Callable
+
+import aiohttp
+import pytest
+from aiointercept import aiointercept
+from yarl import URL
+
+from tests import fixtures
+from tests.const import TEST_ACCOUNT_ID
+from tests.const import TEST_VIN
+from tests.fixtures import DEFAULT_QUERY_STRING
+from tests.fixtures import KCA_ADAPTER_PATH_V1
+from tests.test_renault_session import get_logged_in_session
+
+from renault_api.action_queue import ActionQueue
+from renault_api.exceptions import ActionSuperseded
+from renault_api.kamereon.exceptions import ChargeModeInProgressException
+from renault_api.renault_vehicle import RenaultVehicle
+
+
+def _get_action(
+    calls: list[str], name: str, errors: int = 0
+) -> Callable[[], Awaitable[str]]:
+    """Get an action recording its calls, and failing `errors` times."""
+
+    async def _action() -> str:
+        calls.append(name)
+        if calls.count(name) <= errors:
+            raise ChargeModeInProgressException("409001", "in progress")
+        await asyncio.sleep(0.01)
+        return name
+
+    return _action
+
+
+@pytest.mark.asyncio
+async def test_submit_in_order() -> None:
+    """Test actions for the same vin are sent one at a time, in order."""
+    queue = ActionQueue()
+    calls: list[str] = []
+    results = await asyncio.gather(
+        queue.submit(TEST_VIN, None, _get_action(calls, "horn")),
+        queue.submit(TEST_VIN, None, _get_action(calls, "lights")),
+        queue.submit(TEST_VIN, None, _get_action(calls, "horn2")),
+    )
+    assert list(results) == ["horn", "lights", "horn2"]
+    assert calls == ["horn", "lights", "horn2"]
+    assert queue.superseded == 0
+
+
+@pytest.mark.asyncio
+async def test_submit_superseded() -> None:
+    """Test a waiting action is superseded by a newer action of the same kind."""
+    queue = ActionQueue()
+    calls: list[str] = []
+    first = asyncio.create_task(
+        queue.submit(TEST_VIN, "hvac", _get_action(calls, "ac-start"))
+    )
+    await asyncio.sleep(0.005)
+    results = await asyncio.gather(
+        first,
+        queue.submit(TEST_VIN, "charge-mode", _get_action(calls, "always")),
+        queue.submit(TEST_VIN, "charge-mode", _get_action(calls, "scheduled")),
+        queue.submit(TEST_VIN, "hvac", _get_action(calls, "ac-stop")),
+        # Other vehicles are not affected
+        queue.submit("OTHER_VIN", "charge-mode", _get_action(calls, "other")),
+        return_exceptions=True,
+    )
+    # First action was already sent, so could not be superseded
+    assert results[0] == "ac-start"
+    assert isinstance(results[1], ActionSuperseded)
+    assert str(results[1]) == "Superseded by a newer 'charge-mode' action"
+    assert list(results[2:]) == ["scheduled", "ac-stop", "other"]
+    assert calls == ["ac-start", "other", "scheduled", "ac-stop"]
+    assert queue.superseded == 1
+    # The queues are dropped once empty
+    assert not queue._queues
+    assert not queue._workers
+
+
+@pytest.mark.asyncio
+async def test_submit_retry() -> None:
+    """Test actions are retried while another charge mode is in progress."""
+    queue = ActionQueue(retry_delay=0.01, max_retries=2)
+    calls: list[str] = []
+    assert await queue.submit(TEST_VIN, None, _get_action(calls, "ok", 2)) == "ok"
+    assert calls == ["ok", "ok", "ok"]
+    assert queue.retried == 2
+
+    with pytest.raises(ChargeModeInProgressException):
+        await queue.submit(TEST_VIN, None, _get_action(calls, "ko", 3))
+    assert calls.count("ko") == 3
+
+    # Queue keeps working after a failure
+    assert await queue.submit(TEST_VIN, None, _get_action(calls, "next")) == "next"
+
+
+@pytest.mark.asyncio
+async def test_vehicle_action_queue(
+    websession: aiohttp.ClientSession, mocked_responses: aiointercept
+) -> None:
+    """Test vehicle actions go through the action queue."""
+    vehicle = RenaultVehicle(
+        account_id=TEST_ACCOUNT_ID,
+        vin=TEST_VIN,
+        session=get_logged_in_session(websession),
+        action_queue=ActionQueue(retry_delay=0.05),
+    )
+    url = f"{fixtures.KAMEREON_BASE_URL}/{KCA_ADAPTER_PATH_V1}/actions/charge-mode"
+    url = f"{url}?{DEFAULT_QUERY_STRING}"
+    fixtures.inject_get_vehicle_details(mocked_responses, "zoe_40.1.json")
+    mocked_responses.post(
+        url,
+        status=409,
+        body=fixtures.get_file_content(
+            f"{fixtures.KAMEREON_FIXTURE_PATH}/error/charge_mode_inprogress.json"
+        ),
+    )
+    fixtures.inject_set_charge_mode(mocked_responses, "schedule_mode")
+    fixtures.inject_set_charge_mode(mocked_responses, "schedule_mode")
+
+    await vehicle.get_details()
+    first = asyncio.ensure_future(vehicle.set_charge_mode("always"))
+    # Wait for the first command to be rejected, and waiting for retry
+    await asyncio.sleep(0.02)
+    second, third = await asyncio.gather(
+        vehicle.set_charge_mode("always_charging"),
+        vehicle.set_charge_mode("schedule_mode"),
+        return_exceptions=True,
+    )
+    assert isinstance(second, ActionSuperseded)
+    assert not isinstance(third, BaseException)
+    assert (await first).raw_data == third.raw_data
+
+    # First command was retried after 409001, second command was superseded
+    requests = mocked_responses.requests[("POST", URL(url))]
+    assert [request.kwargs["json"] for request in requests] == [
+        {"data": {"type": "ChargeMode", "attributes": {"action": action}}}
+        for action in ("always", "always", "schedule_mode")
+    ]
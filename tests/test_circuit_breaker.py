@@ -0,0 +1,112 @@
+"""Test cases for the circuit breaker."""
+
+import asyncio
+
+import aiohttp
+import pytest
+from aiointercept import aiointercept
+from yarl import URL
+
+from tests import fixtures
+from tests.const import TEST_ACCOUNT_ID
+from tests.const import TEST_COUNTRY
+from tests.const import TEST_LOCALE
+from tests.const import TEST_LOCALE_DETAILS
+from tests.const import TEST_VIN
+from tests.fixtures import DEFAULT_QUERY_STRING
+from tests.fixtures import KAMEREON_BASE_URL
+from tests.fixtures import KCA_ADAPTER_PATH_V2
+from tests.test_credential_store import get_logged_in_credential_store
+
+from renault_api.circuit_breaker import CIRCUIT_CLOSED
+from renault_api.circuit_breaker import CIRCUIT_HALF_OPEN
+from renault_api.circuit_breaker import CIRCUIT_OPEN
+from renault_api.circuit_breaker import CircuitBreaker
+from renault_api.exceptions import CircuitOpenError
+from renault_api.kamereon.exceptions import FailedForwardException
+from renault_api.kamereon.exceptions import NotSupportedException
+from renault_api.renault_session import RenaultSession
+from renault_api.renault_vehicle import RenaultVehicle
+
+FAILURE = FailedForwardException("err.tech.wired.kamereon-proxy", "Bad gateway")
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker() -> None:
+    """Test the circuit opens, then half-opens with a single probe."""
+    circuit_breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+    for _ in range(2):
+        circuit_breaker.acquire(["host", "host/cockpit"])
+        circuit_breaker.release(["host", "host/cockpit"], FAILURE)
+    assert circuit_breaker.get_state("host") == CIRCUIT_OPEN
+
+    # The host circuit fails fast on all endpoints
+    with pytest.raises(CircuitOpenError, match="Circuit 'host' is open"):
+        circuit_breaker.acquire(["host", "host/location"])
+
+    await asyncio.sleep(0.06)
+    assert circuit_breaker.get_state("host") == CIRCUIT_HALF_OPEN
+    circuit_breaker.acquire(["host", "host/location"])
+    with pytest.raises(CircuitOpenError):
+        circuit_breaker.acquire(["host", "host/cockpit"])
+    circuit_breaker.release(["host", "host/location"], FAILURE)
+    assert circuit_breaker.get_state("host") == CIRCUIT_OPEN
+
+    await asyncio.sleep(0.06)
+    circuit_breaker.acquire(["host", "host/cockpit"])
+    # Rejected requests show that the upstream is responding
+    circuit_breaker.release(
+        ["host", "host/cockpit"], NotSupportedException("err.tech.501", None)
+    )
+    assert circuit_breaker.get_state("host") == CIRCUIT_CLOSED
+    assert circuit_breaker.get_state("host/cockpit") == CIRCUIT_CLOSED
+
+    with pytest.raises(ValueError, match="must be positive"):
+        CircuitBreaker(failure_threshold=0)
+
+
+@pytest.mark.asyncio
+async def test_session_circuit_breaker(
+    websession: aiohttp.ClientSession, mocked_responses: aiointercept
+) -> None:
+    """Test the session fails fast on the endpoint with an open circuit."""
+    circuit_breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+    session = RenaultSession(
+        websession=websession,
+        country=TEST_COUNTRY,
+        locale=TEST_LOCALE,
+        locale_details=TEST_LOCALE_DETAILS,
+        credential_store=get_logged_in_credential_store(),
+        circuit_breaker=circuit_breaker,
+    )
+    vehicle = RenaultVehicle(account_id=TEST_ACCOUNT_ID, vin=TEST_VIN, session=session)
+    fixtures.inject_get_vehicle_details(mocked_responses, "zoe_40.1.json")
+    url = (
+        f"{KAMEREON_BASE_URL}/{KCA_ADAPTER_PATH_V2}"
+        f"/battery-status?{DEFAULT_QUERY_STRING}"
+    )
+    for _ in range(2):
+        mocked_responses.get(
+            url,
+            status=502,
+            body=fixtures.get_file_content(
+                f"{fixtures.KAMEREON_FIXTURE_PATH}/error/bad_gateway.html"
+            ),
+            content_type="text/html",
+        )
+        with pytest.raises(aiohttp.ClientResponseError):
+            await vehicle.get_battery_status()
+        # Other endpoints keep the host circuit closed
+        fixtures.inject_get_cockpit(mocked_responses, "zoe")
+        await vehicle.get_cockpit()
+
+    with pytest.raises(CircuitOpenError, match="battery-status"):
+        await vehicle.get_battery_status()
+    assert len(mocked_responses.requests[("GET", URL(url))]) == 2
+
+    await asyncio.sleep(0.06)
+    fixtures.inject_get_battery_status(mocked_responses)
+    assert await vehicle.get_battery_status()
+    host = URL(KAMEREON_BASE_URL).host
+    assert session.circuit_breaker is circuit_breaker
+    assert circuit_breaker.get_state(f"{host}/battery-status") == CIRCUIT_CLOSED
@@ -0,0 +1,108 @@
+"""Test cases for the data cache."""
+
+import json
+import os
+import tempfile
+import time
+from unittest import mock
+
+import pytest
+from typeguard import suppress_type_checks
+
+from renault_api.data_cache import DataCache
+from renault_api.data_cache import FileDataCache
+
+
+def test_invalid_key() -> None:
+    """Test set with invalid types."""
+    data_cache = DataCache()
+
+    with suppress_type_checks(), pytest.raises(TypeError):
+        data_cache[1] = {}  # type:ignore
+
+
+def test_simple_data() -> None:
+    """Test get/set/delete on data cache."""
+    data_cache = DataCache()
+    test_key = "vin/details"
+    test_value = {"vin": "VF1AAAAA555777999"}
+
+    # Try to get value from empty cache
+    assert test_key not in data_cache
+    assert data_cache.get(test_key) is None
+
+    # Set value
+    data_cache[test_key] = test_value
+    assert test_key in data_cache
+    assert data_cache.get(test_key) == test_value
+
+    # Delete value
+    del data_cache[test_key]
+    assert test_key not in data_cache
+
+
+def test_expired_data() -> None:
+    """Test data is ignored after ttl."""
+    data_cache = DataCache(ttl=60)
+    test_key = "vin/details"
+    data_cache[test_key] = {}
+    assert test_key in data_cache
+
+    expired_time = time.time() + 61
+    with mock.patch("time.time", mock.MagicMock(return_value=expired_time)):
+        assert test_key not in data_cache
+        assert data_cache.get(test_key) is None
+
+
+def test_file_cache() -> None:
+    """Test file data cache."""
+    with tempfile.TemporaryDirectory() as tmpdirname:
+        filename = f"{tmpdirname}/.credentials/renault-api-cache.json"
+        old_data_cache = FileDataCache(filename, ttl=60)
+        test_key = "vin/details"
+        test_value = {"vin": "VF1AAAAA555777999"}
+        old_data_cache[test_key] = test_value
+
+        # Check that the data is loaded in the new cache
+        new_data_cache = FileDataCache(filename)
+        assert new_data_cache.get(test_key) == test_value
+
+        # Check that the data is ignored after ttl
+        expired_time = time.time() + 3600
+        with mock.patch("time.time", mock.MagicMock(return_value=expired_time)):
+            assert test_key not in FileDataCache(filename)
+
+
+def test_file_cache_version() -> None:
+    """Test file data cache ignores content from other versions."""
+    with tempfile.TemporaryDirectory() as tmpdirname:
+        filename = f"{tmpdirname}/renault-api-cache.json"
+        with open(filename, "w") as json_file:
+            json.dump(
+                {
+                    "version": 0,
+                    "entries": {"key": {"expiry": time.time() + 60, "data": {}}},
+                },
+                json_file,
+            )
+
+        assert "key" not in FileDataCache(filename)
+
+
+def test_file_cache_atomic_write() -> None:
+    """Test an interrupted write leaves the previous file in place."""
+    with tempfile.TemporaryDirectory() as tmpdirname:
+        filename = f"{tmpdirname}/renault-api-cache.json"
+        data_cache = FileDataCache(filename)
+        data_cache["vin/details"] = {"vin": "VF1AAAAA555777999"}
+
+        with (
+            mock.patch("json.dump", side_effect=OSError("disk full")),
+            pytest.raises(OSError, match="disk full"),
+        ):
+            data_cache["vin/contracts"] = {}
+
+        assert os.listdir(tmpdirname) == ["renault-api-cache.json"]
+        new_data_cache = FileDataCache(filename)
+        assert new_data_cache.get("vin/details") == {"vin": "VF1AAAAA555777999"}
+        assert "vin/contracts" not in new_data_cache
@@ -0,0 +1,40 @@
+"""Test cases for the expected effects of vehicle actions."""
+
+from typing import cast
+
+from renault_api import effects
+from renault_api.kamereon import models
+from renault_api.kamereon import schemas
+
+
+def _get_battery_status(
+    charging_status: float,
+) -> models.KamereonVehicleBatteryStatusData:
+    """Get battery-status with the specified chargingStatus."""
+    return cast(
+        models.KamereonVehicleBatteryStatusData,
+        schemas.KamereonVehicleBatteryStatusDataSchema.load(
+            {"chargingStatus": charging_status}
+        ),
+    )
+
+
+def test_charging_effects() -> None:
+    """Test charging_started/charging_stopped."""
+    started = effects.charging_started()
+    stopped = effects.charging_stopped()
+    assert started.endpoint == stopped.endpoint == "battery-status"
+    assert str(started) == "battery-status chargingStatus in CHARGE_IN_PROGRESS"
+
+    assert started.predicate(_get_battery_status(1.0))
+    assert not stopped.predicate(_get_battery_status(1.0))
+    assert not started.predicate(_get_battery_status(-1.0))
+    assert stopped.predicate(_get_battery_status(-1.0))
+
+
+def test_charge_mode_effect() -> None:
+    """Test charge_mode."""
+    effect = effects.charge_mode("always")
+    assert effect.endpoint == "charge-mode"
+    assert effect.predicate(models.KamereonVehicleChargeModeData({}, "always"))
+    assert not effect.predicate(models.KamereonVehicleChargeModeData({}, "scheduled"))
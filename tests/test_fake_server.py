@@ -0,0 +1,81 @@
+"""Test cases for the fake Gigya/Kamereon server."""
+
+import aiohttp
+import pytest
+
+from tests.const import TEST_ACCOUNT_ID
+from tests.const import TEST_LOCALE
+from tests.const import TEST_PASSWORD
+from tests.const import TEST_USERNAME
+from tests.const import TEST_VIN
+
+from renault_api.gigya import GIGYA_JWT
+from renault_api.kamereon.exceptions import KamereonResponseException
+from renault_api.kamereon.exceptions import QuotaLimitException
+from renault_api.renault_client import RenaultClient
+from renault_api.testing.fake_server import FakeRenaultServer
+
+
+@pytest.mark.asyncio
+async def test_fake_server() -> None:
+    """Test the library against the fake server, over real sockets."""
+    async with (
+        FakeRenaultServer() as server,
+        aiohttp.ClientSession() as websession,
+    ):
+        client = RenaultClient(
+            websession=websession,
+            locale=TEST_LOCALE,
+            locale_details=server.locale_details,
+        )
+        await client.session.login(TEST_USERNAME, TEST_PASSWORD)
+        assert len(await client.get_api_accounts()) == 2
+
+        account = await client.get_api_account(TEST_ACCOUNT_ID)
+        vehicles = await account.get_vehicles()
+        assert vehicles.vehicleLinks
+        vehicle = await account.get_api_vehicle(TEST_VIN)
+        battery_status = await vehicle.get_battery_status()
+        assert battery_status.batteryLevel is not None
+        assert server.requests["accounts.getJWT"] == 1
+        assert server.requests["battery-status"] == 1
+
+        server.inject_error("quota")
+        with pytest.raises(QuotaLimitException):
+            await vehicle.get_battery_status()
+
+        server.inject_error("bad_gateway")
+        with pytest.raises(aiohttp.ClientResponseError):
+            await vehicle.get_battery_status()
+
+        server.expire_jwts()
+        with pytest.raises(KamereonResponseException, match="err.func.401"):
+            await vehicle.get_battery_status()
+
+        # A new JWT is accepted again
+        del client.session._credentials[GIGYA_JWT]
+        assert await vehicle.get_battery_status()
+        assert server.requests["accounts.getJWT"] == 2
+
+
+@pytest.mark.asyncio
+async def test_fake_server_responses() -> None:
+    """Test fixture overrides, and endpoints without fixture."""
+    responses = {"battery-status": "vehicle_data/battery-status.2.json"}
+    async with (
+        FakeRenaultServer(responses=responses) as server,
+        aiohttp.ClientSession() as websession,
+    ):
+        client = RenaultClient(
+            websession=websession,
+            locale=TEST_LOCALE,
+            locale_details=server.locale_details,
+        )
+        await client.session.login(TEST_USERNAME, TEST_PASSWORD)
+        account = await client.get_api_account(TEST_ACCOUNT_ID)
+        vehicle = await account.get_api_vehicle(TEST_VIN)
+        assert (await vehicle.get_battery_status()).batteryLevel == 60
+        with pytest.raises(KamereonResponseException):
+            await vehicle.http_get(
+                "/commerce/v1/accounts/1/kamereon/kca/car-adapter/v1/cars/1/unknown"
+            )
@@ -0,0 +1,178 @@
+"""Test cases for bulk actions across vehicles."""
+
+import copy
+import json
+import time
+from typing import Any
+
+import aiohttp
+import pytest
+from aiointercept import aiointercept
+
+from tests import fixtures
+from tests.const import TEST_ACCOUNT_ID
+from tests.const import TEST_VIN
+from tests.fixtures import DEFAULT_QUERY_STRING
+from tests.fixtures import KAMEREON_BASE_URL
+from tests.test_renault_session import get_logged_in_session
+
+from renault_api.fleet import RateLimiter
+from renault_api.fleet import run_bulk_action
+from renault_api.fleet import select_vehicles
+from renault_api.kamereon.exceptions import KamereonResponseException
+from renault_api.renault_client import RenaultClient
+from renault_api.renault_vehicle import RenaultVehicle
+
+FLEET_VINS = [TEST_VIN, "VF1AAAAA555777001", "VF1AAAAA555777002"]
+
+
+def inject_fleet(mocked_responses: aiointercept, vins: list[str]) -> None:
+    """Inject person and vehicles, with the vins on the first account."""
+    fixtures.inject_get_person(mocked_responses)
+    content = json.loads(
+        fixtures.get_file_content(
+            f"{fixtures.KAMEREON_FIXTURE_PATH}/vehicles/zoe_40.1.json"
+        )
+    )
+    vehicle_link = content["vehicleLinks"][0]
+    content["vehicleLinks"] = []
+    for vin in vins:
+        content["vehicleLinks"].append(copy.deepcopy(vehicle_link))
+        content["vehicleLinks"][-1]["vin"] = vin
+    fixtures.inject_data(
+        mocked_responses,
+        f"accounts/{TEST_ACCOUNT_ID}/vehicles?{DEFAULT_QUERY_STRING}",
+        body=json.dumps(content),
+    )
+    fixtures.inject_data(
+        mocked_responses,
+        f"accounts/account-id-2/vehicles?{DEFAULT_QUERY_STRING}",
+        body=json.dumps({"accountId": "account-id-2", "vehicleLinks": []}),
+    )
+
+
+def inject_set_charge_mode(mocked_responses: aiointercept, vin: str) -> str:
+    """Inject sample charge-mode for the vin."""
+    url = (
+        f"{KAMEREON_BASE_URL}/accounts/{TEST_ACCOUNT_ID}/kamereon/kca/car-adapter"
+        f"/v1/cars/{vin}/actions/charge-mode?{DEFAULT_QUERY_STRING}"
+    )
+    mocked_responses.post(
+        url,
+        status=200,
+        body=fixtures.get_file_content(
+            f"{fixtures.KAMEREON_FIXTURE_PATH}"
+            "/vehicle_action/charge-mode.schedule_mode.json"
+        ),
+    )
+    return url
+
+
+@pytest.fixture
+def client(websession: aiohttp.ClientSession) -> RenaultClient:
+    """Fixture for testing bulk actions."""
+    return RenaultClient(session=get_logged_in_session(websession))
+
+
+@pytest.mark.asyncio
+async def test_select_vehicles(
+    client: RenaultClient, mocked_responses: aiointercept
+) -> None:
+    """Test select_vehicles."""
+    inject_fleet(mocked_responses, FLEET_VINS)
+    vehicles, missing, account_errors = await select_vehicles(client)
+    assert list(vehicles) == FLEET_VINS
+    assert missing == []
+    assert account_errors == {}
+
+    inject_fleet(mocked_responses, FLEET_VINS)
+    vehicles, missing, _ = await select_vehicles(client, [FLEET_VINS[1], "VF1UNKNOWN"])
+    assert list(vehicles) == [FLEET_VINS[1]]
+    assert missing == ["VF1UNKNOWN"]
+
+    inject_fleet(mocked_responses, FLEET_VINS)
+    vehicles, missing, _ = await select_vehicles(
+        client, lambda vehicle: vehicle.vin.endswith("2")
+    )
+    assert list(vehicles) == [FLEET_VINS[2]]
+
+
+@pytest.mark.asyncio
+async def test_run_bulk_action(
+    client: RenaultClient, mocked_responses: aiointercept
+) -> None:
+    """Test run_bulk_action reports the outcome per vin."""
+    inject_fleet(mocked_responses, FLEET_VINS)
+    inject_set_charge_mode(mocked_responses, FLEET_VINS[0])
+    inject_set_charge_mode(mocked_responses, FLEET_VINS[2])
+    in_flight = max_in_flight = 0
+
+    async def _action(vehicle: RenaultVehicle) -> dict[str, Any]:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        try:
+            if vehicle.vin == FLEET_VINS[1]:
+                raise ValueError("Boom")
+            response = await vehicle.set_charge_mode("schedule_mode")
+            return response.raw_data
+        finally:
+            in_flight -= 1
+
+    report = await run_bulk_action(
+        client,
+        _action,
+        selector=[*FLEET_VINS, "VF1UNKNOWN"],
+        account_concurrency=2,
+    )
+    assert max_in_flight == 2
+    assert [result.vin for result in report.succeeded] == [
+        FLEET_VINS[0],
+        FLEET_VINS[2],
+    ]
+    assert report.succeeded[0].result == {"action": "schedule_mode"}
+    assert {result.vin: str(result.error) for result in report.failed} == {
+        "VF1UNKNOWN": "Vehicle `VF1UNKNOWN` not found.",
+        FLEET_VINS[1]: "Boom",
+    }
+    assert report.as_dict()["results"][FLEET_VINS[1]]["success"] is False
+
+
+@pytest.mark.asyncio
+async def test_run_bulk_action_account_error(
+    client: RenaultClient, mocked_responses: aiointercept
+) -> None:
+    """Test run_bulk_action reports the accounts failing to list their vehicles."""
+    fixtures.inject_get_person(mocked_responses)
+    fixtures.inject_get_vehicles(mocked_responses, "zoe_40.1.json")
+    mocked_responses.get(
+        f"{KAMEREON_BASE_URL}/accounts/account-id-2/vehicles?{DEFAULT_QUERY_STRING}",
+        status=403,
+        body=fixtures.get_file_content(
+            f"{fixtures.KAMEREON_FIXTURE_PATH}/error/forbidden.json"
+        ),
+    )
+    inject_set_charge_mode(mocked_responses, TEST_VIN)
+
+    report = await run_bulk_action(
+        client, lambda vehicle: vehicle.set_charge_mode("schedule_mode")
+    )
+    assert [result.vin for result in report.succeeded] == [TEST_VIN]
+    assert [
+        (result.vin, result.account_id, result.target) for result in report.failed
+    ] == [(None, "account-id-2", "account:account-id-2")]
+    assert isinstance(report.failed[0].error, KamereonResponseException)
+    assert report.as_dict()["results"]["account:account-id-2"]["success"] is False
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter() -> None:
+    """Test RateLimiter spaces out the slots."""
+    rate_limiter = RateLimiter(50)
+    start = time.monotonic()
+    for _ in range(4):
+        await rate_limiter.acquire()
+    assert time.monotonic() - start >= 0.06
+
+    with pytest.raises(ValueError, match="must be positive"):
+        RateLimiter(0)
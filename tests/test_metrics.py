@@ -0,0 +1,124 @@
+"""Test cases for the metrics collector."""
+
+import aiohttp
+import pytest
+from aiointercept import aiointercept
+
+from tests import fixtures
+from tests.const import TEST_COUNTRY
+from tests.const import TEST_LOCALE
+from tests.const import TEST_LOCALE_DETAILS
+from tests.const import TEST_PERSON_ID
+from tests.test_credential_store import get_logged_in_credential_store
+from tests.test_renault_session import get_logged_in_session
+
+from renault_api.circuit_breaker import CircuitBreaker
+from renault_api.data_cache import DataCache
+from renault_api.events import EVENT_ON_ERROR
+from renault_api.events import SessionEvent
+from renault_api.exceptions import CircuitOpenError
+from renault_api.kamereon.exceptions import NotSupportedException
+from renault_api.metrics import MetricsCollector
+from renault_api.renault_session import RenaultSession
+
+
+@pytest.mark.asyncio
+async def test_metrics(
+    websession: aiohttp.ClientSession, mocked_responses: aiointercept
+) -> None:
+    """Test request metrics are collected and rendered."""
+    session = get_logged_in_session(websession)
+    collector = MetricsCollector()
+    collector.attach(session)
+    data_cache = DataCache()
+    collector.track_data_cache(data_cache)
+
+    fixtures.inject_get_person(mocked_responses)
+    await session.get_person()
+    mocked_responses.get(
+        f"{fixtures.KAMEREON_BASE_URL}/persons/{TEST_PERSON_ID}"
+        f"?{fixtures.DEFAULT_QUERY_STRING}",
+        status=501,
+        body=fixtures.get_file_content(
+            f"{fixtures.KAMEREON_FIXTURE_PATH}/error/not_supported.json"
+        ),
+    )
+    with pytest.raises(NotSupportedException):
+        await session.get_person()
+
+    data_cache["key"] = {}
+    data_cache.get("key")
+    data_cache.get("missing")
+
+    output = collector.render()
+    assert (
+        'renault_api_request_duration_seconds_count{method="GET",endpoint="person"} 2'
+        in output
+    )
+    assert (
+        'renault_api_requests_total{method="GET",endpoint="person",outcome="success"} 1'
+    ) in output
+    assert 'renault_api_errors_total{endpoint="person",code="err.tech.501"} 1' in output
+    assert "renault_api_data_cache_hit_ratio 0.5\n" in output
+
+
+@pytest.mark.asyncio
+async def test_metrics_circuit_open(
+    websession: aiohttp.ClientSession, mocked_responses: aiointercept
+) -> None:
+    """Test requests failed fast by an open circuit are not counted as requests."""
+    session = RenaultSession(
+        websession=websession,
+        country=TEST_COUNTRY,
+        locale=TEST_LOCALE,
+        locale_details=TEST_LOCALE_DETAILS,
+        credential_store=get_logged_in_credential_store(),
+        circuit_breaker=CircuitBreaker(failure_threshold=1),
+    )
+    collector = MetricsCollector()
+    collector.attach(session)
+    events: list[SessionEvent] = []
+    session.add_listener(EVENT_ON_ERROR, events.append)
+    mocked_responses.get(
+        f"{fixtures.KAMEREON_BASE_URL}/persons/{TEST_PERSON_ID}"
+        f"?{fixtures.DEFAULT_QUERY_STRING}",
+        status=502,
+        body=fixtures.get_file_content(
+            f"{fixtures.KAMEREON_FIXTURE_PATH}/error/bad_gateway.html"
+        ),
+        content_type="text/html",
+    )
+    with pytest.raises(aiohttp.ClientResponseError):
+        await session.get_person()
+    for _ in range(2):
+        with pytest.raises(CircuitOpenError):
+            await session.get_person()
+
+    assert [event.duration is None for event in events] == [False, True, True]
+    output = collector.render()
+    assert (
+        'renault_api_request_duration_seconds_count{method="GET",endpoint="person"} 1'
+        in output
+    )
+    assert 'outcome="CircuitOpenError"' not in output
+    assert (
+        'renault_api_circuit_rejections_total{method="GET",endpoint="person"} 2'
+        in output
+    )
+
+
+@pytest.mark.asyncio
+async def test_metrics_server(unused_tcp_port: int) -> None:
+    """Test metrics are served over HTTP."""
+    collector = MetricsCollector()
+    runner = await collector.start_server(port=unused_tcp_port)
+    try:
+        async with (
+            aiohttp.ClientSession() as websession,
+            websession.get(f"http://127.0.0.1:{unused_tcp_port}/metrics") as response,
+        ):
+            assert response.status == 200
+            assert response.headers["Content-Type"].startswith("text/plain")
+            assert "renault_api_data_cache_hit_ratio 0" in await response.text()
+    finally:
+        await runner.cleanup()
@@ -0,0 +1,239 @@
+"""Test cases for the adaptive polling scheduler."""
+
+from typing import Any
+from typing import cast
+
+import aiohttp
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+from aiointercept import aiointercept
+
+from tests import fixtures
+from tests.const import TEST_ACCOUNT_ID
+from tests.const import TEST_VIN
+from tests.fixtures import DEFAULT_QUERY_STRING
+from tests.fixtures import KAMEREON_BASE_URL
+from tests.fixtures import KCA_ADAPTER_PATH_V1
+from tests.test_renault_session import get_logged_in_session
+
+from renault_api.exceptions import InvalidInputError
+from renault_api.kamereon import models
+from renault_api.kamereon import schemas
+from renault_api.kamereon.exceptions import QuotaLimitException
+from renault_api.polling import CHARGE_END_MARGIN
+from renault_api.polling import STATE_CHARGING
+from renault_api.polling import STATE_IDLE
+from renault_api.polling import STATE_PLUGGED
+from renault_api.polling import STATE_PRECONDITIONING
+from renault_api.polling import PollingScheduler
+from renault_api.polling import plan_polling_budget
+from renault_api.renault_vehicle import RenaultVehicle
+
+
+def _get_battery_status(**attributes: Any) -> models.KamereonVehicleBatteryStatusData:
+    """Get battery status data with the attributes."""
+    return cast(
+        models.KamereonVehicleBatteryStatusData,
+        schemas.KamereonVehicleBatteryStatusDataSchema.load(attributes),
+    )
+
+
+def _get_hvac_status(hvac_status: str) -> models.KamereonVehicleHvacStatusData:
+    """Get hvac status data with the hvac status."""
+    return cast(
+        models.KamereonVehicleHvacStatusData,
+        schemas.KamereonVehicleHvacStatusDataSchema.load({"hvacStatus": hvac_status}),
+    )
+
+
+def test_intervals() -> None:
+    """Test the poll intervals follow the vehicle state."""
+    scheduler = PollingScheduler(intervals={STATE_IDLE: 3000})
+    assert scheduler.get_states(TEST_VIN) == {STATE_IDLE}
+    assert scheduler.get_interval(TEST_VIN, "battery-status") == 3000
+
+    scheduler.update_battery_status(
+        TEST_VIN, _get_battery_status(plugStatus=1, chargingStatus=1.0)
+    )
+    assert scheduler.get_states(TEST_VIN) == {STATE_CHARGING, STATE_PLUGGED}
+    assert scheduler.get_interval(TEST_VIN, "battery-status") == 300
+    assert scheduler.get_interval(TEST_VIN, "location") == 3000
+
+    scheduler.update_hvac_status(TEST_VIN, _get_hvac_status("on"))
+    assert scheduler.get_interval(TEST_VIN, "battery-status") == 120
+    assert scheduler.get_interval(TEST_VIN, "hvac-status") == 120
+
+    scheduler.update_hvac_status(TEST_VIN, _get_hvac_status("off"))
+    scheduler.update_battery_status(
+        TEST_VIN, _get_battery_status(plugStatus=1, chargingStatus=0.2)
+    )
+    assert scheduler.get_states(TEST_VIN) == {STATE_PLUGGED}
+    assert scheduler.get_interval(TEST_VIN, "battery-status") == 900
+    assert scheduler.get_interval(TEST_VIN, "hvac-status") == 3000
+
+
+def test_next_poll() -> None:
+    """Test the next poll is aligned to the expected charge end."""
+    scheduler = PollingScheduler()
+    assert scheduler.get_due(TEST_VIN, ["battery-status", "location"], now=0) == [
+        "battery-status",
+        "location",
+    ]
+
+    scheduler.set_polled(TEST_VIN, "battery-status", now=1000)
+    scheduler.set_polled(TEST_VIN, "location", now=1000)
+    scheduler.update_battery_status(
+        TEST_VIN,
+        _get_battery_status(plugStatus=1, chargingStatus=1.0, chargingRemainingTime=2),
+        now=1000,
+    )
+    assert scheduler.get_next_poll(TEST_VIN, "battery-status") == (
+        1000 + 120 + CHARGE_END_MARGIN
+    )
+    assert scheduler.get_next_poll(TEST_VIN, "location") == 1000 + 3600
+    assert scheduler.get_due(TEST_VIN, ["battery-status", "location"], now=1200) == [
+        "battery-status"
+    ]
+
+
+@pytest.mark.asyncio
+async def test_poll(
+    websession: aiohttp.ClientSession, mocked_responses: aiointercept
+) -> None:
+    """Test poll gets the due endpoints, and updates the vehicle state."""
+    vehicle = RenaultVehicle(
+        account_id=TEST_ACCOUNT_ID,
+        vin=TEST_VIN,
+        session=get_logged_in_session(websession),
+    )
+    scheduler = PollingScheduler()
+    fixtures.inject_get_vehicle_details(mocked_responses, "zoe_40.1.json")
+    fixtures.inject_get_battery_status(
+        mocked_responses, "vehicle_data/battery-status.2.json"
+    )
+    fixtures.inject_get_hvac_status(mocked_responses, "zoe")
+
+    results = await scheduler.poll(vehicle, ["battery-status", "hvac-status"])
+    assert list(results) == ["battery-status", "hvac-status"]
+    assert STATE_CHARGING in scheduler.get_states(TEST_VIN)
+    assert STATE_PRECONDITIONING not in scheduler.get_states(TEST_VIN)
+
+    # Nothing is due yet
+    assert await scheduler.poll(vehicle, ["battery-status", "hvac-status"]) == {}
+
+    # Endpoints are checked before anything is polled
+    with pytest.raises(InvalidInputError, match="No getter for `unknown`"):
+        await scheduler.poll(vehicle, ["cockpit", "unknown"])
+    assert scheduler.get_next_poll(TEST_VIN, "cockpit") == float("-inf")
+
+    # Quota errors are raised, for the caller to back off
+    mocked_responses.get(
+        f"{KAMEREON_BASE_URL}/{KCA_ADAPTER_PATH_V1}/cockpit?{DEFAULT_QUERY_STRING}",
+        status=429,
+        body=fixtures.get_file_content(
+            f"{fixtures.KAMEREON_FIXTURE_PATH}/error/quota_limit.json"
+        ),
+    )
+    with pytest.raises(QuotaLimitException):
+        await scheduler.poll(vehicle, ["cockpit"])
+
+
+class _FakeClock:
+    """Fake monotonic clock, advanced by the sleeps."""
+
+    def __init__(self) -> None:
+        """Initialise the clock."""
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def monotonic(self) -> float:
+        """Get the current time."""
+        return self.now
+
+    async def sleep(self, delay: float) -> None:
+        """Advance the clock, without waiting."""
+        self.sleeps.append(delay)
+        assert len(self.sleeps) < 10, "Polling did not stop"
+        self.now += delay
+
+
+@pytest.mark.asyncio
+async def test_run(
+    websession: aiohttp.ClientSession,
+    mocked_responses: aiointercept,
+    monkeypatch: MonkeyPatch,
+) -> None:
+    """Test run polls as endpoints become due, until the budget is exhausted."""
+    clock = _FakeClock()
+    monkeypatch.setattr("renault_api.polling.time", clock)
+    monkeypatch.setattr("renault_api.polling.asyncio", clock)
+    vehicle = RenaultVehicle(
+        account_id=TEST_ACCOUNT_ID,
+        vin=TEST_VIN,
+        session=get_logged_in_session(websession),
+    )
+    scheduler = PollingScheduler(intervals={STATE_IDLE: 100})
+    # Budget allows a single battery-status poll
+    scheduler.set_min_interval(TEST_VIN, "battery-status", float("inf"))
+    fixtures.inject_get_vehicle_details(mocked_responses, "zoe_40.1.json")
+    fixtures.inject_get_battery_status(mocked_responses)
+    for _ in range(2):
+        fixtures.inject_get_cockpit(mocked_responses, "zoe")
+    polls: list[tuple[float, str]] = []
+
+    def _callback(vehicle: RenaultVehicle, endpoint: str, data: Any) -> None:
+        polls.append((clock.now, endpoint))
+        if len(polls) == 3:
+            # Budget is now exhausted for cockpit too
+            scheduler.set_min_interval(vehicle.vin, endpoint, float("inf"))
+
+    await scheduler.run([vehicle], ["cockpit", "battery-status"], _callback)
+    assert polls == [(0, "cockpit"), (0, "battery-status"), (100, "cockpit")]
+    assert clock.sleeps == [100]
+
+    # Nothing to poll
+    await scheduler.run([], ["cockpit"], _callback)
+    assert len(polls) == 3
+
+
+def test_plan_polling_budget(websession: aiohttp.ClientSession) -> None:
+    """Test the daily budget is shared by priority, within the endpoint needs."""
+    session = get_logged_in_session(websession)
+    vehicles = [
+        RenaultVehicle(account_id=TEST_ACCOUNT_ID, vin=vin, session=session)
+        for vin in (TEST_VIN, "VF1AAAAA555777001")
+    ]
+    scheduler = PollingScheduler()
+    allocations = plan_polling_budget(
+        scheduler,
+        vehicles,
+        ["battery-status", "location", "cockpit"],
+        1000,
+        priorities={"cockpit": 0},
+    )
+    # 800 requests after the reserve, location is capped at one per hour
+    assert {
+        (allocation.endpoint, round(allocation.daily_requests))
+        for allocation in allocations
+    } == {("battery-status", 376), ("location", 24), ("cockpit", 0)}
+    assert scheduler.get_interval(TEST_VIN, "battery-status") == 3600
+
+    # The budget floor applies to preconditioning and the expected charge end
+    scheduler.set_polled(TEST_VIN, "battery-status", now=0)
+    scheduler.update_battery_status(
+        TEST_VIN,
+        _get_battery_status(plugStatus=1, chargingStatus=1.0, chargingRemainingTime=1),
+        now=0,
+    )
+    scheduler.update_hvac_status(TEST_VIN, _get_hvac_status("on"))
+    assert scheduler.get_interval(TEST_VIN, "battery-status") == pytest.approx(
+        86400 / 376
+    )
+    assert scheduler.get_next_poll(TEST_VIN, "battery-status") == pytest.approx(
+        86400 / 376
+    )
+    scheduler.set_polled(TEST_VIN, "cockpit", now=0)
+    assert scheduler.get_next_poll(TEST_VIN, "cockpit") == float("inf")
+
+    with pytest.raises(ValueError, match="reserve"):
+        plan_polling_budget(scheduler, vehicles, ["location"], 1000, reserve=1)
@@ -1,8 +1,11 @@
 """Test cases for the Renault client API keys."""
 
+import asyncio
+
 import aiohttp
 import pytest
 from aiointercept import aiointercept
+from yarl import URL
 
 from tests import fixtures
 from tests.const import TEST_ACCOUNT_ID
@@ -12,6 +15,7 @@ from tests.const import TEST_VIN
 from tests.test_credential_store import get_logged_in_credential_store
 from tests.test_renault_session import get_logged_in_session
 
+from renault_api.data_cache import DataCache
 from renault_api.renault_account import RenaultAccount
 
 
@@ -59,7 +63,64 @@ async def test_get_api_vehicles(
 
 
 @pytest.mark.asyncio
-async def test_get_api_vehicle(account: RenaultAccount) -> None:
-    """Test get_api_vehicle."""
+async def test_get_api_vehicle(
+    account: RenaultAccount, mocked_responses: aiointercept
+) -> None:
+    """Test get_api_vehicle loads the vehicle registry on first use."""
+    fixtures.inject_get_vehicles(mocked_responses, "zoe_40.1.json")
     vehicle = await account.get_api_vehicle(TEST_VIN)
     assert vehicle._vin == TEST_VIN
+    assert vehicle._vehicle_details is not None
+    assert await account.get_api_vehicles() == [vehicle]
+
+    # Vins missing from the registry get a standalone proxy
+    other_vehicle = await account.get_api_vehicle("VF1UNKNOWN")
+    assert other_vehicle.vin == "VF1UNKNOWN"
+    assert other_vehicle._vehicle_details is None
+
+
+@pytest.mark.asyncio
+async def test_get_api_vehicle_from_registry(
+    account: RenaultAccount, mocked_responses: aiointercept
+) -> None:
+    """Test get_api_vehicle is served from the vehicle registry."""
+    fixtures.inject_get_vehicles(mocked_responses, "zoe_40.1.json")
+    vehicles = await account.get_api_vehicles()
+
+    # Registry is reused, without further calls to the servers
+    mocked_responses.clear()
+    assert await account.get_api_vehicles() == vehicles
+    vehicle = await account.get_api_vehicle(vehicles[0].vin)
+    assert vehicle is vehicles[0]
+    assert vehicle._vehicle_details is not None
+
+    # Registry is refreshed when forced, keeping existing proxies
+    previous_details = vehicle._vehicle_details
+    fixtures.inject_get_vehicles(mocked_responses, "zoe_40.1.json")
+    assert await account.get_api_vehicles(force_refresh=True) == vehicles
+    # but not their outdated details
+    assert vehicle._vehicle_details is not previous_details
+    assert vehicle._vehicle_details == previous_details
+
+
+@pytest.mark.asyncio
+async def test_get_api_vehicles_data_cache(
+    websession: aiohttp.ClientSession, mocked_responses: aiointercept
+) -> None:
+    """Test each registry refresh fetches the vehicles, despite the data cache."""
+    data_cache = DataCache()
+    account = RenaultAccount(
+        account_id=TEST_ACCOUNT_ID,
+        session=get_logged_in_session(websession),
+        data_cache=data_cache,
+        vehicles_ttl=0,
+    )
+    url = fixtures.inject_get_vehicles(mocked_responses, "zoe_40.1.json")
+    await account.get_api_vehicles()
+
+    # Registry expires twice, refreshing the cached vehicles each time
+    for _ in range(2):
+        fixtures.inject_get_vehicles(mocked_responses, "zoe_40.1.json")
+        await account.get_api_vehicles()
+        await asyncio.gather(*data_cache._refresh_tasks)
+    assert len(mocked_responses.requests[("GET", URL(url))]) == 3
@@ -1,5 +1,8 @@
 """Test cases for the Renault client API keys."""
 
+import asyncio
+from pathlib import Path
+
 import aiohttp
 import pytest
 from aiointercept import aiointercept
@@ -11,6 +14,7 @@ from tests.const import TEST_LOCALE_DETAILS
 from tests.test_credential_store import get_logged_in_credential_store
 from tests.test_renault_session import get_logged_in_session
 
+from renault_api.data_cache import FileDataCache
 from renault_api.renault_client import RenaultClient
 
 
@@ -62,3 +66,35 @@ async def test_get_api_account(client: RenaultClient) -> None:
     """Test get_api_account."""
     account = await client.get_api_account(TEST_ACCOUNT_ID)
     assert account._account_id == TEST_ACCOUNT_ID
+
+
+@pytest.mark.asyncio
+async def test_get_api_accounts_warm_start(
+    websession: aiohttp.ClientSession, mocked_responses: aiointercept, tmp_path: Path
+) -> None:
+    """Test get_api_accounts is served from the data cache on warm start."""
+    cache_location = str(tmp_path / "renault-api-cache.json")
+    data_cache = FileDataCache(cache_location)
+    fixtures.inject_get_person(mocked_responses)
+    client = RenaultClient(
+        session=get_logged_in_session(websession), data_cache=data_cache
+    )
+    assert len(await client.get_api_accounts()) == 2
+    assert len(mocked_responses.requests) == 1
+
+    # Warm start: served from cache, then refreshed once in the background
+    data_cache = FileDataCache(cache_location)
+    client = RenaultClient(
+        session=get_logged_in_session(websession), data_cache=data_cache
+    )
+    fixtures.inject_get_person(mocked_responses)
+    accounts = await client.get_api_accounts()
+    assert len(accounts) == 2
+    assert accounts[0]._data_cache is data_cache
+    await asyncio.gather(*data_cache._refresh_tasks)
+    assert len(mocked_responses.requests) == 1
+    assert len(next(iter(mocked_responses.requests.values()))) == 2
+
+    # No further refresh within the same process
+    await client.get_api_accounts()
+    assert not data_cache._refresh_tasks
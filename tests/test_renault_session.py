@@ -17,10 +17,16 @@ from tests.const import TEST_USERNAME
 from tests.test_credential_store import get_logged_in_credential_store
 
 from renault_api.credential import JWTCredential
+from renault_api.events import EVENT_AFTER_RESPONSE
+from renault_api.events import EVENT_AUTH_REFRESH
+from renault_api.events import EVENT_BEFORE_REQUEST
+from renault_api.events import EVENT_ON_ERROR
+from renault_api.events import SessionEvent
 from renault_api.exceptions import NotAuthenticatedException
 from renault_api.exceptions import RenaultException
 from renault_api.gigya import GIGYA_JWT
 from renault_api.gigya import GIGYA_LOGIN_TOKEN
+from renault_api.kamereon.exceptions import NotSupportedException
 from renault_api.renault_session import RenaultSession
 
 
@@ -251,3 +257,85 @@ async def test_expired_login_token(
         assert await session._get_jwt()
 
     assert len(mocked_responses.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_request_events(
+    websession: aiohttp.ClientSession, mocked_responses: aiointercept
+) -> None:
+    """Test events are dispatched around requests."""
+    session = get_logged_in_session(websession)
+    events: list[SessionEvent] = []
+    for event_type in (EVENT_BEFORE_REQUEST, EVENT_AFTER_RESPONSE, EVENT_ON_ERROR):
+        session.add_listener(event_type, events.append)
+
+    fixtures.inject_get_person(mocked_responses)
+    await session.get_person()
+    assert [(event.event_type, event.outcome) for event in events] == [
+        (EVENT_BEFORE_REQUEST, "pending"),
+        (EVENT_AFTER_RESPONSE, "success"),
+    ]
+    assert events[1].method == "GET"
+    assert events[1].endpoint == "person"
+    assert events[1].duration is not None
+
+    events.clear()
+    mocked_responses.get(
+        f"{fixtures.KAMEREON_BASE_URL}/persons/{TEST_PERSON_ID}"
+        f"?{fixtures.DEFAULT_QUERY_STRING}",
+        status=501,
+        body=fixtures.get_file_content(
+            f"{fixtures.KAMEREON_FIXTURE_PATH}/error/not_supported.json"
+        ),
+    )
+    with pytest.raises(NotSupportedException):
+        await session.get_person()
+    assert [(event.event_type, event.outcome) for event in events] == [
+        (EVENT_BEFORE_REQUEST, "pending"),
+        (EVENT_ON_ERROR, "NotSupportedException"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_remove_listener(
+    websession: aiohttp.ClientSession, mocked_responses: aiointercept
+) -> None:
+    """Test listeners can be removed, and failing listeners are ignored."""
+    session = get_logged_in_session(websession)
+    events: list[SessionEvent] = []
+
+    def failing_listener(event: SessionEvent) -> None:
+        raise ValueError("Listener failure")
+
+    session.add_listener(EVENT_AFTER_RESPONSE, failing_listener)
+    remove_listener = session.add_listener(EVENT_AFTER_RESPONSE, events.append)
+
+    fixtures.inject_get_person(mocked_responses)
+    await session.get_person()
+    assert len(events) == 1
+
+    remove_listener()
+    fixtures.inject_get_person(mocked_responses)
+    await session.get_person()
+    assert len(events) == 1
+
+    with pytest.raises(ValueError, match="Unknown event type"):
+        session.add_listener("unknown", events.append)
+
+
+@pytest.mark.asyncio
+async def test_auth_refresh_event(
+    session: RenaultSession, mocked_responses: aiointercept
+) -> None:
+    """Test auth_refresh event is dispatched when the JWT is renewed."""
+    events: list[SessionEvent] = []
+    session.add_listener(EVENT_AUTH_REFRESH, events.append)
+
+    session.set_login_token(TEST_LOGIN_TOKEN)
+    fixtures.inject_gigya_jwt(mocked_responses)
+    assert await session._get_jwt()
+    assert await session._get_jwt()
+
+    assert len(events) == 1
+    assert events[0].endpoint == "accounts.getJWT"
+    assert events[0].outcome == "success"
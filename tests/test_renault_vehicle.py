@@ -23,7 +23,13 @@ from tests.fixtures import KCM_ADAPTER_PATH
 from tests.test_credential_store import get_logged_in_credential_store
 from tests.test_renault_session import get_logged_in_session
 
+from renault_api import effects
+from renault_api.data_cache import DataCache
+from renault_api.exceptions import EffectTimeoutError
 from renault_api.exceptions import EndpointNotAvailableError
+from renault_api.exceptions import InvalidInputError
+from renault_api.kamereon.exceptions import ForbiddenException
+from renault_api.kamereon.exceptions import NotSupportedException
 from renault_api.kamereon.helpers import DAYS_OF_WEEK
 from renault_api.kamereon.models import ChargeSchedule
 from renault_api.kamereon.models import HvacSchedule
@@ -532,6 +538,60 @@ async def test_set_charge_start_r5(
     assert request.kwargs["json"] == snapshot
 
 
+@pytest.mark.asyncio
+async def test_set_charge_start_r5_settings_cache(
+    vehicle: RenaultVehicle, mocked_responses: aiointercept
+) -> None:
+    """Test set_charge_start reuses the ev/settings read for kcm-settings mode."""
+    fixtures.inject_get_vehicle_details(mocked_responses, "renault_5.1.json")
+    get_url = fixtures.inject_get_ev_settings(mocked_responses, "single.active")
+    url = fixtures.inject_set_kcm_ev_settings_charge(mocked_responses, "start")
+    fixtures.inject_set_kcm_ev_settings_charge(mocked_responses, "start")
+
+    assert await vehicle.set_charge_start()
+    assert await vehicle.set_charge_start()
+    assert len(mocked_responses.requests[("GET", URL(get_url))]) == 1
+    requests = mocked_responses.requests[("POST", URL(url))]
+    assert len(requests) == 2
+    # Settings were refreshed from the first POST response
+    json: Any = requests[1].kwargs["json"]
+    assert json["chargeModeRq"] == "ALWAYS"
+    assert json["chargeTimeStart"] == "00:00"
+    # Programs are deactivated, not deleted
+    first_json: Any = requests[0].kwargs["json"]
+    assert json["programs"] == first_json["programs"]
+    assert len(json["programs"]) == 1
+    assert json["programs"][0]["programActivationStatus"] is False
+
+    # Settings expire after a short while
+    vehicle._kcm_settings = (0.0, {})
+    fixtures.inject_get_ev_settings(mocked_responses, "single.active")
+    fixtures.inject_set_kcm_ev_settings_charge(mocked_responses, "start")
+    assert await vehicle.set_charge_start()
+    assert len(mocked_responses.requests[("GET", URL(get_url))]) == 2
+
+
+@pytest.mark.asyncio
+async def test_set_charge_start_r5_settings_forbidden(
+    vehicle: RenaultVehicle, mocked_responses: aiointercept
+) -> None:
+    """Test a failed ev/settings read does not mark the action unavailable."""
+    fixtures.inject_get_vehicle_details(mocked_responses, "renault_5.1.json")
+    mocked_responses.get(
+        f"{fixtures.KAMEREON_BASE_URL}/{KCM_ADAPTER_PATH}"
+        f"/ev/settings?{DEFAULT_QUERY_STRING}",
+        status=403,
+        body=fixtures.get_file_content(
+            f"{fixtures.KAMEREON_FIXTURE_PATH}/error/forbidden.json"
+        ),
+    )
+
+    with pytest.raises(ForbiddenException):
+        await vehicle.set_charge_start()
+    assert await vehicle.supports_endpoint("actions/charge-start")
+    assert not await vehicle.supports_endpoint("ev-settings")
+
+
 @pytest.mark.asyncio
 async def test_set_hvac_schedules(
     vehicle: RenaultVehicle, mocked_responses: aiointercept, snapshot: SnapshotAssertion
@@ -658,3 +718,299 @@ async def test_get_full_endpoint_unknown(
     fixtures.inject_get_vehicle_details(mocked_responses, "zoe_40.1.json")
     with pytest.raises(EndpointNotAvailableError):
         await vehicle.get_full_endpoint("random")
+
+
+@pytest.mark.asyncio
+async def test_endpoint_resolution_is_cached(
+    vehicle: RenaultVehicle, mocked_responses: aiointercept
+) -> None:
+    """Test endpoints are only resolved once per vehicle."""
+    fixtures.inject_get_vehicle_details(mocked_responses, "zoe_40.1.json")
+    fixtures.inject_get_battery_status(mocked_responses)
+    fixtures.inject_get_battery_status(mocked_responses)
+    assert await vehicle.get_battery_status()
+
+    assert vehicle._resolved_urls == {
+        "/kca/car-adapter/v2/cars/{vin}/battery-status": (
+            f"/commerce/v1/accounts/{TEST_ACCOUNT_ID}"
+            f"/kamereon/kca/car-adapter/v2/cars/{TEST_VIN}/battery-status"
+        )
+    }
+    assert await vehicle.get_battery_status()
+    assert list(vehicle._endpoint_definitions) == ["battery-status"]
+
+
+@pytest.mark.asyncio
+async def test_get_details_from_data_cache(
+    websession: aiohttp.ClientSession, mocked_responses: aiointercept
+) -> None:
+    """Test get_details/get_car_adapter/get_contracts use the data cache."""
+    data_cache = DataCache()
+    fixtures.inject_get_vehicle_details(mocked_responses, "zoe_40.1.json")
+    fixtures.inject_get_car_adapter(mocked_responses, "zoe_40.1.json")
+    fixtures.inject_get_vehicle_contracts(mocked_responses, "fr_FR.1.json")
+    vehicle = RenaultVehicle(
+        account_id=TEST_ACCOUNT_ID,
+        vin=TEST_VIN,
+        session=get_logged_in_session(websession),
+        data_cache=data_cache,
+    )
+    details = await vehicle.get_details()
+    car_adapter = await vehicle.get_car_adapter()
+    contracts = await vehicle.get_contracts()
+
+    # A new vehicle proxy doesn't need to call the servers
+    mocked_responses.clear()
+    vehicle = RenaultVehicle(
+        account_id=TEST_ACCOUNT_ID,
+        vin=TEST_VIN,
+        session=get_logged_in_session(websession),
+        data_cache=data_cache,
+    )
+    assert (await vehicle.get_details()).raw_data == details.raw_data
+    assert (await vehicle.get_car_adapter()) == car_adapter
+    assert (await vehicle.get_contracts()) == contracts
+
+
+def _inject_hvac_status(mocked_responses: aiointercept, status: str) -> str:
+    """Inject hvac-status with the specified hvacStatus."""
+    body = fixtures.get_file_content(
+        f"{fixtures.KAMEREON_FIXTURE_PATH}/vehicle_data/hvac-status.zoe.json"
+    ).replace('"hvacStatus": "off"', f'"hvacStatus": "{status}"')
+    return fixtures.inject_data(
+        mocked_responses,
+        f"{KCA_ADAPTER_PATH_V1}/hvac-status?{DEFAULT_QUERY_STRING}",
+        body=body,
+    )
+
+
+@pytest.mark.asyncio
+async def test_await_effect(
+    vehicle: RenaultVehicle, mocked_responses: aiointercept
+) -> None:
+    """Test await_effect polls until the expected state appears."""
+    fixtures.inject_get_vehicle_details(mocked_responses, "zoe_40.1.json")
+    url = _inject_hvac_status(mocked_responses, "off")
+    _inject_hvac_status(mocked_responses, "off")
+    _inject_hvac_status(mocked_responses, "on")
+    _inject_hvac_status(mocked_responses, "on")
+
+    data = await vehicle.await_effect(
+        effects.hvac_status("on"), timeout=1, interval=0.01, backoff=1.5
+    )
+    assert data.hvacStatus == "on"
+    # Polling stops as soon as the state appears
+    assert len(mocked_responses.requests[("GET", URL(url))]) == 3
+
+
+@pytest.mark.asyncio
+async def test_await_effect_timeout(
+    vehicle: RenaultVehicle, mocked_responses: aiointercept
+) -> None:
+    """Test await_effect gives up once the deadline passes."""
+    fixtures.inject_get_vehicle_details(mocked_responses, "zoe_40.1.json")
+    for _ in range(10):
+        url = _inject_hvac_status(mocked_responses, "off")
+
+    with pytest.raises(EffectTimeoutError, match="hvacStatus=on") as excinfo:
+        await vehicle.await_effect(
+            effects.hvac_status("on"), timeout=0.05, interval=0.02, max_interval=0.02
+        )
+    assert excinfo.value.last_data.hvacStatus == "off"
+    # Last poll is made at the deadline
+    assert 2 <= len(mocked_responses.requests[("GET", URL(url))]) <= 3
+
+    with pytest.raises(InvalidInputError, match="No status getter"):
+        await vehicle.await_effect(
+            effects.Effect("unknown", lambda data: True, "unknown"), timeout=0.01
+        )
+
+
+@pytest.mark.asyncio
+async def test_apply_charge_schedules(
+    vehicle: RenaultVehicle, mocked_responses: aiointercept
+) -> None:
+    """Test apply_charge_schedules only sends changed schedules."""
+    fixtures.inject_get_vehicle_details(mocked_responses, "zoe_40.1.json")
+    fixtures.inject_get_charging_settings(mocked_responses, "multi")
+    settings = await vehicle.get_charging_settings()
+    assert settings.schedules
+
+    # Same schedules, in any order: nothing is sent
+    schedules = list(reversed(settings.schedules))
+    assert await vehicle.apply_charge_schedules(schedules, settings) is None
+
+    # Compared with the cached schedules, without any request
+    assert await vehicle.apply_charge_schedules(schedules) is None
+    assert sum(len(requests) for requests in mocked_responses.requests.values()) == 2
+
+    # Updated schedules (in place) are sent
+    url = fixtures.inject_set_charge_schedule(mocked_responses, "schedules")
+    settings.update({"id": 1, "monday": {"startTime": "T02:00Z", "duration": 200}})
+    assert await vehicle.apply_charge_schedules(settings.schedules, settings)
+    request = mocked_responses.requests[("POST", URL(url))][0]
+    json: Any = request.kwargs["json"]
+    assert json["data"]["attributes"]["schedules"][0]["monday"] == {
+        "startTime": "T02:00Z",
+        "duration": 200,
+    }
+    # The cached schedules follow the update
+    assert await vehicle.apply_charge_schedules(settings.schedules) is None
+    assert len(mocked_responses.requests[("POST", URL(url))]) == 1
+
+    # Expired schedules are requested again
+    vehicle._schedules.clear()
+    settings_url = fixtures.inject_get_charging_settings(mocked_responses, "multi")
+    url = fixtures.inject_set_charge_schedule(mocked_responses, "schedules")
+    assert await vehicle.apply_charge_schedules(settings.schedules)
+    assert len(mocked_responses.requests[("GET", URL(settings_url))]) == 2
+
+
+@pytest.mark.asyncio
+async def test_apply_hvac_schedules(
+    vehicle: RenaultVehicle, mocked_responses: aiointercept
+) -> None:
+    """Test apply_hvac_schedules only sends changed schedules."""
+    fixtures.inject_get_vehicle_details(mocked_responses, "zoe_50.1.json")
+    fixtures.inject_get_hvac_settings(mocked_responses)
+    settings = await vehicle.get_hvac_settings()
+    assert settings.schedules
+    assert await vehicle.apply_hvac_schedules(settings.schedules, settings) is None
+
+    # Compared with the cached schedules, without any request
+    assert await vehicle.apply_hvac_schedules(settings.schedules) is None
+    assert sum(len(requests) for requests in mocked_responses.requests.values()) == 2
+
+    url = fixtures.inject_set_hvac_schedules(mocked_responses)
+    assert await vehicle.apply_hvac_schedules(settings.schedules[1:], settings)
+    assert mocked_responses.requests[("POST", URL(url))]
+    assert await vehicle.apply_hvac_schedules(settings.schedules[1:]) is None
+
+    with pytest.raises(TypeError):
+        await vehicle.apply_hvac_schedules(["schedule"])  # type: ignore[list-item]
+
+
+@pytest.mark.asyncio
+async def test_unavailable_endpoint(
+    websession: aiohttp.ClientSession, mocked_responses: aiointercept
+) -> None:
+    """Test endpoints learned to be unavailable are not requested again."""
+    data_cache = DataCache()
+    vehicle = RenaultVehicle(
+        account_id=TEST_ACCOUNT_ID,
+        vin=TEST_VIN,
+        session=get_logged_in_session(websession),
+        data_cache=data_cache,
+    )
+    fixtures.inject_get_vehicle_details(mocked_responses, "zoe_40.1.json")
+    url = fixtures.inject_get_hvac_status(mocked_responses, "zoe")
+    mocked_responses.clear()
+    fixtures.inject_get_vehicle_details(mocked_responses, "zoe_40.1.json")
+    for _ in range(2):
+        mocked_responses.get(
+            url,
+            status=501,
+            body=fixtures.get_file_content(
+                f"{fixtures.KAMEREON_FIXTURE_PATH}/error/not_supported.json"
+            ),
+        )
+
+    with pytest.raises(NotSupportedException):
+        await vehicle.get_hvac_status()
+    with pytest.raises(EndpointNotAvailableError, match="hvac-status"):
+        await vehicle.get_hvac_status()
+    assert not await vehicle.supports_endpoint("hvac-status")
+    assert len(mocked_responses.requests[("GET", URL(url))]) == 1
+
+    # Shared with other proxies through the data cache
+    other_vehicle = RenaultVehicle(
+        account_id=TEST_ACCOUNT_ID,
+        vin=TEST_VIN,
+        session=get_logged_in_session(websession),
+        data_cache=data_cache,
+        vehicle_details=await vehicle.get_details(),
+    )
+    with pytest.raises(EndpointNotAvailableError):
+        await other_vehicle.get_hvac_status()
+
+    # Requested again after expiry, or reset
+    vehicle._unavailable_endpoints = {"hvac-status": 0.0}
+    with pytest.raises(NotSupportedException):
+        await vehicle.get_hvac_status()
+    other_vehicle.reset_unavailable_endpoints()
+    assert await other_vehicle.supports_endpoint("hvac-status")
+    assert len(mocked_responses.requests[("GET", URL(url))]) == 2
+
+
+@pytest.mark.asyncio
+async def test_probe_endpoints(
+    websession: aiohttp.ClientSession, mocked_responses: aiointercept
+) -> None:
+    """Test probe_endpoints records the working definition of each endpoint."""
+    data_cache = DataCache()
+    vehicle = RenaultVehicle(
+        account_id=TEST_ACCOUNT_ID,
+        vin=TEST_VIN,
+        session=get_logged_in_session(websession),
+        data_cache=data_cache,
+    )
+    fixtures.inject_get_vehicle_details(mocked_responses, "zoe_40.1.json")
+    fixtures.inject_get_battery_status(mocked_responses)
+    for endpoint, status, filename in [
+        ("charge-schedule", 403, "forbidden.json"),
+        ("hvac-status", 501, "not_supported.json"),
+        ("location", 500, "invalid_upstream.json"),
+    ]:
+        mocked_responses.get(
+            f"{fixtures.KAMEREON_BASE_URL}/{KCA_ADAPTER_PATH_V1}"
+            f"/{endpoint}?{DEFAULT_QUERY_STRING}",
+            status=status,
+            body=fixtures.get_file_content(
+                f"{fixtures.KAMEREON_FIXTURE_PATH}/error/{filename}"
+            ),
+        )
+    fixtures.inject_get_ev_settings(mocked_responses, "single.active")
+    other_vehicle = RenaultVehicle(
+        account_id=TEST_ACCOUNT_ID,
+        vin="VF1AAAAA555777123",
+        session=get_logged_in_session(websession),
+        data_cache=data_cache,
+        vehicle_details=await vehicle.get_details(),
+    )
+    assert await other_vehicle.supports_endpoint("charge-schedule")
+
+    capabilities = await vehicle.probe_endpoints(
+        ["battery-status", "charge-schedule", "hvac-status", "location"],
+        concurrency=2,
+    )
+    assert {
+        endpoint: definition.mode if definition else None
+        for endpoint, definition in capabilities.items()
+    } == {
+        "battery-status": "default",
+        "charge-schedule": "kcm-settings",
+        "hvac-status": None,
+    }
+
+    # Only the working definitions are shared with the other vehicles of the
+    # same model, including the ones already loaded
+    definition = await other_vehicle.get_endpoint_definition("charge-schedule")
+    assert definition.mode == "kcm-settings"
+    assert await other_vehicle.supports_endpoint("hvac-status")
+
+    # The unavailable endpoints are only remembered for the probed vehicle
+    same_vehicle = RenaultVehicle(
+        account_id=TEST_ACCOUNT_ID,
+        vin=TEST_VIN,
+        session=get_logged_in_session(websession),
+        data_cache=data_cache,
+        vehicle_details=await vehicle.get_details(),
+    )
+    with pytest.raises(EndpointNotAvailableError, match="hvac-status"):
+        await same_vehicle.get_hvac_status()
+    assert not await same_vehicle.supports_endpoint("hvac-status")
+    same_vehicle._unavailable_endpoints = {"hvac-status": 0.0}
+    assert await same_vehicle.supports_endpoint("hvac-status")
+
+    with pytest.raises(InvalidInputError, match="actions/charge-start"):
+        await vehicle.probe_endpoints(["actions/charge-start"])
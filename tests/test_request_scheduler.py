@@ -0,0 +1,171 @@
+"""Test cases for the request scheduler priority lanes."""
+
+import asyncio
+from datetime import datetime
+
+import aiohttp
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+from aiointercept import aiointercept
+
+from tests import fixtures
+from tests.const import TEST_ACCOUNT_ID
+from tests.const import TEST_COUNTRY
+from tests.const import TEST_LOCALE
+from tests.const import TEST_LOCALE_DETAILS
+from tests.const import TEST_VIN
+from tests.fixtures import DEFAULT_QUERY_STRING
+from tests.fixtures import KCA_ADAPTER_PATH_V1
+from tests.fixtures import KCA_ADAPTER_PATH_V2
+from tests.test_credential_store import get_logged_in_credential_store
+
+from renault_api.events import EVENT_BEFORE_REQUEST
+from renault_api.renault_session import RenaultSession
+from renault_api.renault_vehicle import RenaultVehicle
+from renault_api.request_scheduler import PRIORITY_BACKFILL
+from renault_api.request_scheduler import PRIORITY_BACKGROUND
+from renault_api.request_scheduler import PRIORITY_INTERACTIVE_ACTION
+from renault_api.request_scheduler import PRIORITY_INTERACTIVE_READ
+from renault_api.request_scheduler import RequestScheduler
+from renault_api.request_scheduler import get_request_priority
+from renault_api.request_scheduler import request_priority
+
+
+def test_get_request_priority() -> None:
+    """Test requests are interactive unless set otherwise."""
+    assert get_request_priority("POST") == PRIORITY_INTERACTIVE_ACTION
+    assert get_request_priority("GET") == PRIORITY_INTERACTIVE_READ
+    with request_priority(PRIORITY_BACKFILL):
+        assert get_request_priority("GET") == PRIORITY_BACKFILL
+    assert get_request_priority("GET") == PRIORITY_INTERACTIVE_READ
+
+
+@pytest.mark.asyncio
+async def test_request_scheduler() -> None:
+    """Test the free slots go to the highest priority first."""
+    scheduler = RequestScheduler(max_concurrency=1)
+    served: list[str] = []
+
+    async def _request(name: str, priority: int) -> None:
+        async with scheduler.slot(priority):
+            served.append(name)
+            await asyncio.sleep(0.01)
+
+    first = asyncio.ensure_future(_request("first", PRIORITY_BACKGROUND))
+    await asyncio.sleep(0)
+    cancelled = asyncio.ensure_future(_request("cancelled", PRIORITY_INTERACTIVE_READ))
+    others = [
+        asyncio.ensure_future(_request(name, priority))
+        for name, priority in [
+            ("backfill", PRIORITY_BACKFILL),
+            ("background", PRIORITY_BACKGROUND),
+            ("read", PRIORITY_INTERACTIVE_READ),
+            ("action", PRIORITY_INTERACTIVE_ACTION),
+        ]
+    ]
+    await asyncio.sleep(0)
+    assert scheduler.waiting == 5
+    cancelled.cancel()
+    await asyncio.gather(first, *others)
+
+    assert served == ["first", "action", "read", "background", "backfill"]
+    assert (scheduler.in_flight, scheduler.waiting) == (0, 0)
+
+    with pytest.raises(ValueError, match="must be positive"):
+        RequestScheduler(0)
+
+
+@pytest.mark.asyncio
+async def test_session_request_scheduler(
+    websession: aiohttp.ClientSession, mocked_responses: aiointercept
+) -> None:
+    """Test the interactive action jumps the queue of background polls."""
+    session = RenaultSession(
+        websession=websession,
+        country=TEST_COUNTRY,
+        locale=TEST_LOCALE,
+        locale_details=TEST_LOCALE_DETAILS,
+        credential_store=get_logged_in_credential_store(),
+        request_scheduler=RequestScheduler(max_concurrency=1),
+    )
+    vehicle = RenaultVehicle(account_id=TEST_ACCOUNT_ID, vin=TEST_VIN, session=session)
+    started: list[str] = []
+    session.add_listener(
+        EVENT_BEFORE_REQUEST, lambda event: started.append(event.method)
+    )
+    for _ in range(3):
+        fixtures.inject_get_battery_status(mocked_responses)
+    fixtures.inject_action(
+        mocked_responses,
+        f"{KCA_ADAPTER_PATH_V1}/actions/charging-start?{DEFAULT_QUERY_STRING}",
+        "vehicle_action/charging-start.start.json",
+    )
+
+    async def _poll() -> None:
+        with request_priority(PRIORITY_BACKGROUND):
+            await vehicle.http_get(f"/commerce/v1/{KCA_ADAPTER_PATH_V2}/battery-status")
+
+    polls = [asyncio.ensure_future(_poll()) for _ in range(3)]
+    await asyncio.sleep(0)
+    await vehicle.http_post(
+        f"/commerce/v1/{KCA_ADAPTER_PATH_V1}/actions/charging-start",
+        {"data": {"type": "ChargingStart", "attributes": {"action": "start"}}},
+    )
+    await asyncio.gather(*polls)
+
+    assert started == ["GET", "POST", "GET", "GET"]
+    assert session.request_scheduler is not None
+    assert session.request_scheduler.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_session_request_scheduler_backfill(
+    websession: aiohttp.ClientSession,
+    mocked_responses: aiointercept,
+    monkeypatch: MonkeyPatch,
+) -> None:
+    """Test history requests wait as backfill, resolving the JWT once served."""
+    scheduler = RequestScheduler(max_concurrency=1)
+    session = RenaultSession(
+        websession=websession,
+        country=TEST_COUNTRY,
+        locale=TEST_LOCALE,
+        locale_details=TEST_LOCALE_DETAILS,
+        credential_store=get_logged_in_credential_store(),
+        request_scheduler=scheduler,
+    )
+    vehicle = RenaultVehicle(account_id=TEST_ACCOUNT_ID, vin=TEST_VIN, session=session)
+    get_jwt = session._get_jwt
+    jwt_requests: list[int] = []
+
+    async def _get_jwt() -> str:
+        jwt_requests.append(scheduler.in_flight)
+        return await get_jwt()
+
+    monkeypatch.setattr(session, "_get_jwt", _get_jwt)
+    started: list[str] = []
+    session.add_listener(
+        EVENT_BEFORE_REQUEST, lambda event: started.append(event.endpoint)
+    )
+    fixtures.inject_get_charges(mocked_responses, "20201001", "20201115")
+
+    await scheduler.acquire(PRIORITY_INTERACTIVE_ACTION)
+    task = asyncio.ensure_future(
+        vehicle.get_charges(start=datetime(2020, 10, 1), end=datetime(2020, 11, 15))
+    )
+    with request_priority(PRIORITY_BACKGROUND):
+        poll = asyncio.ensure_future(
+            vehicle.http_get(f"/commerce/v1/{KCA_ADAPTER_PATH_V2}/battery-status")
+        )
+    fixtures.inject_get_battery_status(mocked_responses)
+    for _ in range(5):
+        await asyncio.sleep(0)
+    assert scheduler.waiting == 2
+    assert not jwt_requests
+
+    scheduler.release()
+    await asyncio.gather(task, poll)
+    # The background poll is served before the backfill, and each request
+    # only resolves the JWT once it holds the slot.
+    assert started[1] == "charges"
+    assert jwt_requests == [1, 1]
@@ -0,0 +1,127 @@
+"""Test cases for the OpenTelemetry tracing."""
+
+from collections.abc import Iterator
+
+import aiohttp
+import pytest
+from aiointercept import aiointercept
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from tests import fixtures
+from tests.const import TEST_ACCOUNT_ID
+from tests.const import TEST_COUNTRY
+from tests.const import TEST_LOCALE_DETAILS
+from tests.const import TEST_LOGIN_TOKEN
+from tests.const import TEST_PERSON_ID
+from tests.const import TEST_VIN
+from tests.test_renault_session import get_logged_in_session
+
+from renault_api.credential import Credential
+from renault_api.credential_store import CredentialStore
+from renault_api.gigya import GIGYA_JWT
+from renault_api.gigya import GIGYA_LOGIN_TOKEN
+from renault_api.gigya import GIGYA_PERSON_ID
+from renault_api.renault_session import CREDENTIAL_SPAN
+from renault_api.renault_session import RenaultSession
+from renault_api.renault_vehicle import RenaultVehicle
+
+_EXPORTER = InMemorySpanExporter()
+
+
+@pytest.fixture
+def span_exporter() -> Iterator[InMemorySpanExporter]:
+    """Fixture for collecting the finished spans."""
+    if not isinstance(trace.get_tracer_provider(), TracerProvider):
+        provider = TracerProvider()
+        provider.add_span_processor(SimpleSpanProcessor(_EXPORTER))
+        trace.set_tracer_provider(provider)
+    _EXPORTER.clear()
+    yield _EXPORTER
+    _EXPORTER.clear()
+
+
+@pytest.mark.asyncio
+async def test_vehicle_spans(
+    websession: aiohttp.ClientSession,
+    mocked_responses: aiointercept,
+    span_exporter: InMemorySpanExporter,
+) -> None:
+    """Test spans cover the full call chain."""
+    vehicle = RenaultVehicle(
+        account_id=TEST_ACCOUNT_ID,
+        vin=TEST_VIN,
+        session=get_logged_in_session(websession),
+    )
+    fixtures.inject_get_vehicle_details(mocked_responses, "zoe_40.1.json")
+    fixtures.inject_get_battery_status(mocked_responses)
+    assert await vehicle.get_battery_status()
+
+    spans = {span.name: span for span in span_exporter.get_finished_spans()}
+    # Internal helpers and cached credentials stay out of the traces
+    assert set(spans) == {
+        "RenaultVehicle.get_battery_status",
+        "RenaultVehicle.get_details",
+        "kamereon.request",
+    }
+
+    root = spans["RenaultVehicle.get_battery_status"]
+    assert root.parent is None
+    assert spans["RenaultVehicle.get_details"].parent is not None
+    assert spans["RenaultVehicle.get_details"].parent.span_id == root.context.span_id
+    kamereon_spans = [
+        span
+        for span in span_exporter.get_finished_spans()
+        if span.name == "kamereon.request"
+    ]
+    assert len(kamereon_spans) == 2
+    assert kamereon_spans[-1].attributes is not None
+    assert kamereon_spans[-1].attributes["http.request.method"] == "GET"
+    assert kamereon_spans[-1].attributes["http.response.status_code"] == 200
+    # The identifiers are templated out of the url
+    assert kamereon_spans[-1].attributes["url.template"] == (
+        "/commerce/v1/accounts/{accountId}/kamereon/kca/car-adapter/v2"
+        "/cars/{vin}/battery-status"
+    )
+    assert "url.full" not in kamereon_spans[-1].attributes
+
+
+@pytest.mark.asyncio
+async def test_credential_spans(
+    websession: aiohttp.ClientSession,
+    mocked_responses: aiointercept,
+    span_exporter: InMemorySpanExporter,
+) -> None:
+    """Test credentials resolved from Gigya get their own span."""
+    credential_store = CredentialStore()
+    credential_store[GIGYA_LOGIN_TOKEN] = Credential(TEST_LOGIN_TOKEN)
+    session = RenaultSession(
+        websession=websession,
+        country=TEST_COUNTRY,
+        locale_details=TEST_LOCALE_DETAILS,
+        credential_store=credential_store,
+    )
+    fixtures.inject_gigya_account_info(mocked_responses)
+    fixtures.inject_gigya_jwt(mocked_responses)
+    fixtures.inject_get_person(mocked_responses)
+    assert await session.get_person()
+    assert await session.get_person_id() == TEST_PERSON_ID
+
+    credential_spans = [
+        span
+        for span in span_exporter.get_finished_spans()
+        if span.name == CREDENTIAL_SPAN
+    ]
+    assert [
+        (span.attributes or {})["renault_api.credential"] for span in credential_spans
+    ] == [GIGYA_PERSON_ID, GIGYA_JWT]
+    gigya_spans = [
+        span
+        for span in span_exporter.get_finished_spans()
+        if span.name == "gigya.request"
+    ]
+    assert [span.parent.span_id for span in gigya_spans if span.parent] == [
+        span.context.span_id for span in credential_spans
+    ]
@@ -0,0 +1,175 @@
+"""Test cases for the record and replay transport."""
+
+import gzip
+import time
+from pathlib import Path
+
+import aiohttp
+import pytest
+from aiointercept import aiointercept
+
+from tests import fixtures
+from tests.const import TEST_ACCOUNT_ID
+from tests.const import TEST_COUNTRY
+from tests.const import TEST_LOCALE_DETAILS
+from tests.const import TEST_LOGIN_TOKEN
+from tests.const import TEST_PASSWORD
+from tests.const import TEST_PERSON_ID
+from tests.const import TEST_USERNAME
+from tests.const import TEST_VIN
+
+from renault_api.const import LOCALE_BASE_URL
+from renault_api.helpers import get_api_keys
+from renault_api.renault_session import RenaultSession
+from renault_api.renault_vehicle import RenaultVehicle
+from renault_api.transport import SCRUBBED
+from renault_api.transport import ReplayError
+from renault_api.transport import TrafficArchive
+from renault_api.transport import TrafficEntry
+from renault_api.transport import recording_websession
+from renault_api.transport import replay_websession
+
+
+def _get_vehicle(websession: aiohttp.ClientSession) -> RenaultVehicle:
+    """Get a vehicle, using a fresh session."""
+    session = RenaultSession(
+        websession=websession,
+        country=TEST_COUNTRY,
+        locale_details=TEST_LOCALE_DETAILS,
+    )
+    return RenaultVehicle(account_id=TEST_ACCOUNT_ID, vin=TEST_VIN, session=session)
+
+
+async def _record(
+    websession: aiohttp.ClientSession, mocked_responses: aiointercept
+) -> TrafficArchive:
+    """Record a login, and a battery status request."""
+    fixtures.inject_gigya_all(mocked_responses)
+    fixtures.inject_get_vehicle_details(mocked_responses, "zoe_40.1.json")
+    fixtures.inject_get_battery_status(mocked_responses)
+    archive = TrafficArchive()
+    vehicle = _get_vehicle(recording_websession(websession, archive))
+    await vehicle.session.login(TEST_USERNAME, TEST_PASSWORD)
+    assert await vehicle.session._get_login_token() == TEST_LOGIN_TOKEN
+    assert (await vehicle.get_battery_status()).batteryLevel == 50
+    return archive
+
+
+@pytest.mark.asyncio
+async def test_record_and_replay(
+    websession: aiohttp.ClientSession, mocked_responses: aiointercept, tmp_path: Path
+) -> None:
+    """Test recording traffic, and replaying it from file."""
+    archive = await _record(websession, mocked_responses)
+    assert [entry.url.rsplit("/", 1)[-1] for entry in archive.entries] == [
+        "accounts.login",
+        "accounts.getJWT",
+        "details",
+        "battery-status",
+    ]
+
+    location = str(tmp_path / "traffic.jsonl.gz")
+    archive.save(location)
+    with gzip.open(location, "rt") as file:
+        content = file.read()
+    assert TEST_LOGIN_TOKEN not in content
+    assert TEST_PASSWORD not in content
+    assert SCRUBBED in content
+
+    vehicle = _get_vehicle(replay_websession(TrafficArchive.load(location)))
+    await vehicle.session.login(TEST_USERNAME, TEST_PASSWORD)
+    assert (await vehicle.get_battery_status()).batteryLevel == 50
+    # Only the recorded traffic was sent
+    assert len(mocked_responses.requests) == 4
+
+    # Archive is exhausted
+    with pytest.raises(ReplayError, match="No recorded response for GET"):
+        await vehicle.get_battery_status()
+
+
+@pytest.mark.asyncio
+async def test_replay_options(
+    websession: aiohttp.ClientSession, mocked_responses: aiointercept
+) -> None:
+    """Test replaying with original timings, and cycling the archive."""
+    archive = await _record(websession, mocked_responses)
+    for entry in archive.entries:
+        entry.offset = entry.duration = 0
+    archive.entries[-1].offset = 0.1
+    archive.entries[-1].duration = 0.02
+
+    vehicle = _get_vehicle(replay_websession(archive, realtime=True, cycle=True))
+    start = time.monotonic()
+    await vehicle.session.login(TEST_USERNAME, TEST_PASSWORD)
+    assert (await vehicle.get_battery_status()).batteryLevel == 50
+    # Served at its recorded offset from the start of the replay
+    assert time.monotonic() - start >= 0.12
+
+    # The second cycle starts with the request
+    start = time.monotonic()
+    assert (await vehicle.get_battery_status()).batteryLevel == 50
+    assert 0.02 <= time.monotonic() - start < 0.1
+
+
+@pytest.mark.asyncio
+async def test_record_scrubs_identifiers(
+    websession: aiohttp.ClientSession, mocked_responses: aiointercept
+) -> None:
+    """Test the account identifiers are scrubbed, including from the URLs."""
+    fixtures.inject_gigya_all(mocked_responses)
+    fixtures.inject_get_person(mocked_responses)
+    archive = TrafficArchive()
+    vehicle = _get_vehicle(recording_websession(websession, archive))
+    await vehicle.session.login(TEST_USERNAME, TEST_PASSWORD)
+    assert (await vehicle.session.get_person()).accounts
+    assert all(TEST_PERSON_ID not in entry.url for entry in archive.entries)
+    assert all(TEST_PERSON_ID not in entry.body for entry in archive.entries)
+    assert all('"UID": "UID"' not in entry.body for entry in archive.entries)
+
+    # The replay requests the person with the scrubbed person id
+    vehicle = _get_vehicle(replay_websession(archive))
+    await vehicle.session.login(TEST_USERNAME, TEST_PASSWORD)
+    assert await vehicle.session.get_person_id() == SCRUBBED
+    assert (await vehicle.session.get_person()).accounts
+
+
+@pytest.mark.asyncio
+async def test_record_and_replay_get(
+    websession: aiohttp.ClientSession, mocked_responses: aiointercept
+) -> None:
+    """Test the transports serve the locale configuration to get_api_keys."""
+    url = f"{LOCALE_BASE_URL}/configuration/android/config_fake.json"
+    with open("tests/fixtures/config_sample.txt") as f:
+        mocked_responses.get(url, status=200, body=f.read())
+    archive = TrafficArchive()
+    api_keys = await get_api_keys(
+        "fake", websession=recording_websession(websession, archive)
+    )
+    assert await get_api_keys("fake", websession=replay_websession(archive)) == (
+        api_keys
+    )
+
+
+@pytest.mark.asyncio
+async def test_replay_cycles_per_request() -> None:
+    """Test each request starts its new cycles from its own first response."""
+    archive = TrafficArchive(
+        [
+            TrafficEntry("GET", url, None, None, 200, "application/json", "{}", 0, 0)
+            for url in ["https://example.com/a", "https://example.com/b"]
+        ]
+    )
+    archive.entries[1].offset = 0.1
+    websession = replay_websession(archive, realtime=True, cycle=True)
+
+    async def _get(url: str) -> float:
+        start = time.monotonic()
+        async with websession.get(url) as response:
+            assert await response.json() == {}
+        return time.monotonic() - start
+
+    assert await _get("https://example.com/a") < 0.05
+    assert await _get("https://example.com/b") >= 0.08
+    # A new cycle of `a` does not set the start of the next cycle of `b`
+    assert await _get("https://example.com/a") < 0.05
+    assert await _get("https://example.com/b") < 0.05